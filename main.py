@@ -5,10 +5,14 @@ from src.command import CommandValidator
 from src.config import Config
 from src.containers import Globals, Environments, Items, Objects, Services, Resolvers, Effects
 from src.core import Engine
+from src.instrumentation import TurnInstrumentation
+from src.profiler import SamplingProfiler
+from src.tracing import tracer
 from src.utils import overlap
 
 if overlap(["-d", "--debug"], sys.argv[1:]):
     logging.basicConfig(level=logging.DEBUG)
+    tracer.echo = True
 
 player = Globals.player()
 player.environment = Environments.prologue_cockpit()
@@ -33,4 +37,21 @@ engine = Engine(
     config=Config,
 )
 
+instrumentation = TurnInstrumentation(Engine)
+if overlap(["-t", "--timings"], sys.argv[1:]):
+    instrumentation.enable()
+
+# `kill -USR2 <pid>` starts and stops profiling, where there is SIGUSR2.
+profiler = SamplingProfiler()
+profiler.install_signal_handler()
+if overlap(["-p", "--profile"], sys.argv[1:]):
+    profiler.start()
+
 engine.start()
+
+if instrumentation.enabled:
+    print(instrumentation.format_report())
+if profiler.running:
+    profiler.stop()
+    profiler.write_collapsed("profile.collapsed")
+    print(profiler.report())
@@ -0,0 +1,249 @@
+from typing import TYPE_CHECKING, Any, Iterator, Union
+
+from src.enums import PlayerAction
+from src.utils import enum_get, subclass_in_list
+
+if TYPE_CHECKING:
+    from src.command import CommandUsage
+    from src.config import Config
+    from src.object.base import Item, Object
+    from src.player import Player
+
+_VALUES = ""
+
+
+class Trie:
+    """
+    A prefix tree mapping words to the values they refer to. Each node is a dict of
+    characters to child nodes; the values of a word are kept under an empty key.
+    """
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, word: str, value: Any) -> None:
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node.setdefault(_VALUES, []).append(value)
+
+    def remove(self, word: str, value: Any) -> None:
+        path = [self.root]
+        for char in word:
+            if char not in path[-1]:
+                return
+            path.append(path[-1][char])
+
+        values = path[-1].get(_VALUES, [])
+        if value in values:
+            values.remove(value)
+        if not values:
+            path[-1].pop(_VALUES, None)
+
+        for char, node in zip(reversed(word), reversed(path[:-1])):
+            if node[char]:
+                break
+            del node[char]
+
+    def get(self, word: str) -> list:
+        """Returns the values of the word."""
+        node = self.root
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get(_VALUES, [])
+
+    def complete(self, prefix: str) -> Iterator[tuple[str, list]]:
+        """Yields (word, values) for every word starting with the prefix, shortest
+        first."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+
+        queue = [(prefix, node)]
+        while queue:
+            next_queue = []
+            for word, node in queue:
+                if _VALUES in node:
+                    yield word, node[_VALUES]
+                next_queue.extend(
+                    (word + char, child) for char, child in node.items() if char
+                )
+            queue = sorted(next_queue)
+
+
+class Autocomplete:
+    """
+    Tab-completion of partial command lines. Actions are completed from the
+    configured usages; objects and preposition objects from what is in the
+    player's room and inventory, filtered by what the usage accepts.
+
+    The scope trie is updated incrementally: every call indexes the items and
+    objects that came into scope and removes those that left.
+
+    Attributes:
+    -----------
+    limit : int
+        The most completions returned.
+    """
+
+    def __init__(self, player: "Player", config: type["Config"], limit: int = 10):
+        self._player = player
+        self._config = config
+        self.limit = limit
+        self._scope = Trie()
+        self._indexed: dict[int, tuple[Any, list[str]]] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Reindexes actions and scope. Call after the content has been reloaded."""
+        self._actions = Trie()
+        for action, usages in self._config.action_usage_mapping.items():
+            if usages:
+                self._actions.insert(str(action).casefold(), action)
+        self._scope = Trie()
+        self._indexed = {}
+        self._index(self._player, ["self", "player"])
+
+    def complete(self, line: str) -> list[str]:
+        """Returns the completed lines for a partial command line."""
+        words = line.casefold().split()
+        trailing_space = line[-1:].isspace()
+
+        if not words or (len(words) == 1 and not trailing_space):
+            prefix = words[0] if words else ""
+            return self._limit(word for word, _ in self._actions.complete(prefix))
+
+        action = enum_get(words[0], PlayerAction)
+        usages = self._config.action_usage_mapping.get(action) or []
+        if not usages:
+            return []
+
+        self._update_scope()
+        rest = words[1:]
+        partial = "" if trailing_space else rest.pop()
+        head = f"{words[0]} "
+
+        prepositions = {
+            str(usage.preposition).casefold() for usage in usages if usage.preposition
+        }
+        split = next((i for i, word in enumerate(rest) if word in prepositions), None)
+        if split is not None:
+            object_str = " ".join(rest[:split])
+            preposition = rest[split]
+            prefix = " ".join(rest[split + 1:] + [partial]).lstrip()
+            usages = [
+                usage
+                for usage in usages
+                if str(usage.preposition).casefold() == preposition
+            ]
+            head += f"{object_str} {preposition} "
+            return self._limit(
+                head + word
+                for word in self._complete_objects(
+                    prefix, action, usages, "preposition_object_types"
+                )
+            )
+
+        prefix = " ".join(rest + [partial]).lstrip()
+        completions = [
+            head + word
+            for word in self._complete_objects(prefix, action, usages, "object_types")
+        ]
+        completions += self._complete_prepositions(head, rest, partial, action, usages)
+        return self._limit(completions)
+
+    def _complete_objects(
+        self,
+        prefix: str,
+        action: PlayerAction,
+        usages: list["CommandUsage"],
+        types_attr: str,
+    ) -> Iterator[str]:
+        types = [t for usage in usages for t in getattr(usage, types_attr) or []]
+        if not types:
+            return
+        # Only the object itself has to offer the action.
+        offers_action = types_attr == "object_types"
+        for word, instances in self._scope.complete(prefix):
+            for instance in instances:
+                if subclass_in_list(instance, types) and (
+                    not offers_action or action in instance.interactions
+                ):
+                    yield word
+                    break
+
+    def _complete_prepositions(
+        self,
+        head: str,
+        rest: list[str],
+        partial: str,
+        action: PlayerAction,
+        usages: list["CommandUsage"],
+    ) -> list[str]:
+        """Completes the preposition once a whole object has been typed."""
+        object_str = " ".join(rest)
+        instances = self._scope.get(object_str)
+        return [
+            f"{head}{object_str} {preposition}"
+            for preposition in self._prepositions(instances, action, usages)
+            if object_str and preposition.startswith(partial)
+        ]
+
+    def _prepositions(
+        self,
+        instances: list,
+        action: PlayerAction,
+        usages: list["CommandUsage"],
+    ) -> list[str]:
+        prepositions = []
+        for usage in usages:
+            if not usage.preposition or not usage.object_types:
+                continue
+            if any(self._accepts(i, action, usage.object_types) for i in instances):
+                preposition = str(usage.preposition).casefold()
+                if preposition not in prepositions:
+                    prepositions.append(preposition)
+        return prepositions
+
+    @staticmethod
+    def _accepts(
+        instance: Union["Item", "Object", "Player"],
+        action: PlayerAction,
+        types: list[type],
+    ) -> bool:
+        return subclass_in_list(instance, types) and action in instance.interactions
+
+    def _update_scope(self) -> None:
+        in_scope = {id(self._player): self._player}
+        for instance in self._player.inventory:
+            in_scope[id(instance)] = instance
+        if self._player.environment:
+            for instance in self._player.environment.objects_and_items:
+                in_scope[id(instance)] = instance
+
+        for key in [key for key in self._indexed if key not in in_scope]:
+            instance, words = self._indexed.pop(key)
+            for word in words:
+                self._scope.remove(word, instance)
+        for key, instance in in_scope.items():
+            if key not in self._indexed:
+                self._index(instance, instance.references)
+
+    def _index(self, instance: Any, references: list[str]) -> None:
+        words = sorted({reference.casefold() for reference in references})
+        for word in words:
+            self._scope.insert(word, instance)
+        self._indexed[id(instance)] = (instance, words)
+
+    def _limit(self, completions) -> list[str]:
+        result = []
+        for completion in completions:
+            if completion not in result:
+                result.append(completion)
+            if len(result) >= self.limit:
+                break
+        return result
@@ -0,0 +1,317 @@
+"""Drives many synthetic players against the game and reports throughput, turn
+latency and memory per session as the amount of sessions ramps up.
+
+The target is anything with `execute(session_id, line) -> str` and
+`complete(session_id, partial_line) -> list[str]`, such as a SessionManager.
+Players take turns one after another, so every turn swaps the player's session
+into the world like a busy server would.
+
+Usage: python -m src.bench.load_generator [--levels 1,10,100,1000,10000,50000]
+    [--turns N] [--mix walk=8,script=2,replay=0] [--journal FILE] [--rooms N]
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+from tempfile import TemporaryDirectory
+from typing import Any, Optional
+
+from src.bench.playthroughs import WINNING_PLAYTHROUGH, new_game
+from src.command import CommandValidator
+from src.config import Config
+from src.containers import (
+    Effects,
+    Environments,
+    Globals,
+    Items,
+    Objects,
+    Resolvers,
+    Services,
+)
+from src.content import ROOMS, load_world
+from src.content_pack import ContentPack, share_content
+from src.core import Engine
+from src.enums import PlayerAction
+from src.instrumentation import LatencyHistogram
+from src.session import DiskSessionStore, SessionManager
+from src.state import WorldState
+from src.worldgen import generate_world
+
+ACTION_WEIGHTS = {
+    PlayerAction.ENTER: 4,
+    PlayerAction.INSPECT: 3,
+    PlayerAction.PICKUP: 2,
+    PlayerAction.EQUIP: 1,
+    PlayerAction.UNEQUIP: 1,
+    PlayerAction.FILL: 1,
+    PlayerAction.EMPTY: 1,
+    PlayerAction.TURN: 1,
+    PlayerAction.HIT: 1,
+    PlayerAction.USE: 1,
+    PlayerAction.PRESS: 1,
+    PlayerAction.OPEN: 1,
+    PlayerAction.CLOSE: 1,
+    PlayerAction.REPAIR: 1,
+}
+
+
+class SyntheticPlayer:
+    """
+    Sends the lines of a single session.
+
+    Attributes:
+    -----------
+    session_id : str
+        The session the lines are sent to.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+
+    def next_line(self, target: Any) -> str:
+        raise NotImplementedError
+
+
+class ScriptedPlayer(SyntheticPlayer):
+    """Plays the given lines in order, starting over after the last one."""
+
+    def __init__(self, session_id: str, lines: list[str]):
+        super().__init__(session_id)
+        self.lines = lines
+        self._turn = 0
+
+    def next_line(self, target: Any) -> str:
+        line = self.lines[self._turn % len(self.lines)]
+        self._turn += 1
+        return line
+
+
+class RandomWalkPlayer(SyntheticPlayer):
+    """
+    Picks a weighted random action and completes it with what is in scope, using
+    the target's tab-completion.
+
+    Attributes:
+    -----------
+    weights : dict[PlayerAction, float]
+        How likely each action is picked.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        rng: random.Random,
+        weights: Optional[dict[PlayerAction, float]] = None,
+    ):
+        super().__init__(session_id)
+        self.weights = weights or ACTION_WEIGHTS
+        self._rng = rng
+        self._actions = list(self.weights)
+        self._action_weights = list(self.weights.values())
+
+    def next_line(self, target: Any) -> str:
+        action = self._rng.choices(self._actions, self._action_weights)[0]
+        line = str(action).lower()
+        # At most the object, the preposition and the preposition object.
+        for _ in range(3):
+            completions = target.complete(self.session_id, f"{line} ")
+            if not completions:
+                break
+            line = self._rng.choice(completions)
+        return line
+
+
+def read_journal(path: str) -> list[str]:
+    """Returns the lines of a journal of recorded input, one command per line."""
+    with open(path) as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def create_target(
+    directory: str,
+    max_sessions: int,
+    rooms: Optional[int] = None,
+    pack: Optional[str] = None,
+) -> SessionManager:
+    """Returns a session manager running a new game per session, on the shipped
+    world or on a generated one with the given amount of rooms. The content is
+    read from the content pack at the given path, if any, and a compiled pack
+    brings its own world."""
+    content = ContentPack(pack) if pack is not None else None
+    world = None
+    if content is not None and ROOMS in content.tables:
+        world = load_world(content)
+    elif rooms is not None:
+        world = generate_world(rooms, pack=content)
+    if world is not None:
+        world_state = world.create_world_state()
+        return SessionManager(
+            engine=world.create_engine(),
+            world_state=world_state,
+            store=DiskSessionStore(directory),
+            initial_snapshot=world_state.capture(),
+            max_sessions=max_sessions,
+        )
+
+    player = Globals.player()
+    world_state = WorldState(player, Effects, Items, Objects, Environments)
+    new_game(player)
+    if content is not None:
+        containers = {"items": Items, "objects": Objects, "environments": Environments}
+        share_content(content, containers, Resolvers)
+    engine = Engine(
+        player=player,
+        items_c=Items,
+        objects_c=Objects,
+        services_c=Services,
+        resolvers_c=Resolvers,
+        command_validator=CommandValidator(
+            player=player,
+            command_object_r=Resolvers.command_object(),
+            config=Config,
+        ),
+        config=Config,
+    )
+    return SessionManager(
+        engine=engine,
+        world_state=world_state,
+        store=DiskSessionStore(directory),
+        initial_snapshot=world_state.capture(),
+        max_sessions=max_sessions,
+    )
+
+
+def create_players(
+    amount: int,
+    mix: dict[str, float],
+    rng: random.Random,
+    journal: Optional[list[str]] = None,
+    prefix: str = "player",
+) -> list[SyntheticPlayer]:
+    kinds = [kind for kind, weight in mix.items() if weight > 0]
+    weights = [mix[kind] for kind in kinds]
+    players = []
+    for i in range(amount):
+        session_id = f"{prefix}-{i}"
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "script":
+            players.append(ScriptedPlayer(session_id, WINNING_PLAYTHROUGH))
+        elif kind == "replay":
+            if not journal:
+                raise ValueError("Replaying players need a journal")
+            players.append(ScriptedPlayer(session_id, journal))
+        elif kind == "walk":
+            players.append(RandomWalkPlayer(session_id, rng))
+        else:
+            raise ValueError(f"Unknown kind of player: {kind}")
+    return players
+
+
+def run_level(target: Any, players: list[SyntheticPlayer], turns: int) -> dict:
+    """Lets every player take the given amount of turns, round-robin."""
+    histogram = LatencyHistogram()
+    errors = 0
+    perf_counter = time.perf_counter
+    started = perf_counter()
+    for _ in range(turns):
+        for player in players:
+            line = player.next_line(target)
+            turn_started = perf_counter()
+            try:
+                target.execute(player.session_id, line)
+            except Exception:
+                # The engine logs the trace of failed turns.
+                errors += 1
+            histogram.record(perf_counter() - turn_started)
+    elapsed = perf_counter() - started
+    return {
+        "sessions": len(players),
+        "turns": histogram.count,
+        "errors": errors,
+        "turns_per_sec": histogram.count / elapsed,
+        "p50": histogram.percentile(0.50),
+        "p99": histogram.percentile(0.99),
+        "p999": histogram.percentile(0.999),
+    }
+
+
+def run(
+    levels: list[int],
+    turns: int,
+    mix: dict[str, float],
+    journal: Optional[list[str]] = None,
+    seed: int = 0,
+    rooms: Optional[int] = None,
+) -> list[dict]:
+    rng = random.Random(seed)
+    results = []
+    with TemporaryDirectory() as directory:
+        target = create_target(directory, max(levels), rooms)
+        baseline_rss = _rss()
+        for level, sessions in enumerate(levels):
+            players = create_players(sessions, mix, rng, journal, f"level{level}")
+            result = run_level(target, players, turns)
+            resident = max(len(target), 1)
+            result["bytes_per_session"] = (_rss() - baseline_rss) / resident
+            results.append(result)
+            # Only the sessions of the current level stay resident.
+            for player in players:
+                target.close(player.session_id)
+    return results
+
+
+def _rss() -> int:
+    """Returns the resident memory of the process in bytes."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # The peak, in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        kind, weight = part.split("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--levels", default="1,10,100,1000,10000,50000")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per session.")
+    parser.add_argument("--mix", default="walk=8,script=2,replay=0")
+    parser.add_argument("--journal", help="Lines replayed by the replaying players.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rooms", type=int, help="Play on a generated world of this many rooms."
+    )
+    args = parser.parse_args()
+
+    journal = read_journal(args.journal) if args.journal else None
+    levels = [int(level) for level in args.levels.split(",")]
+    print(
+        f"{'sessions':>9}{'turns':>9}{'errors':>8}{'turns/s':>10}"
+        f"{'p50 ms':>9}{'p99 ms':>9}{'p999 ms':>9}{'KiB/session':>13}"
+    )
+    mix = _parse_mix(args.mix)
+    for result in run(levels, args.turns, mix, journal, args.seed, args.rooms):
+        print(
+            f"{result['sessions']:>9}{result['turns']:>9}{result['errors']:>8}"
+            f"{result['turns_per_sec']:>10.0f}"
+            f"{result['p50'] * 1e3:>9.2f}"
+            f"{result['p99'] * 1e3:>9.2f}"
+            f"{result['p999'] * 1e3:>9.2f}"
+            f"{result['bytes_per_session'] / 1024:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Parse-error rate and parse throughput with and without the configured lexicon
+of synonyms and stop words, on a corpus of lines players typically type.
+
+A line is a parse error when it is rejected for an unknown action or object before
+any resolver is consulted. Throughput counts rejecting and building the command of
+every line.
+
+Usage: python -m src.bench.parser_bench [--repeat N]
+"""
+import argparse
+import timeit
+
+from src.command import Command, Lexicon
+from src.config import Config
+from src.containers import Items, Objects
+from src.vocabulary import Vocabulary
+
+CORPUS = [
+    "inspect",
+    "look",
+    "look around",
+    "look at the control panel",
+    "examine the red button",
+    "press the red button",
+    "push button",
+    "hit the glass case",
+    "smash glass case",
+    "break the glass",
+    "take the fire axe",
+    "grab axe",
+    "pick up the axe",
+    "pickup fire axe",
+    "equip the axe",
+    "wear axe",
+    "hit hallway door",
+    "go into the hallway",
+    "enter hallway",
+    "go to armory",
+    "walk into the armory",
+    "take space suit",
+    "put on the space suit",
+    "equip space suit",
+    "get the repair kit",
+    "take fuel can",
+    "go to the bathroom",
+    "use the urinal",
+    "take off the fire axe",
+    "unequip axe",
+    "fill the engine with the fuel can",
+    "refuel engine with fuel",
+    "pour the fuel can into the engine",
+    "strike the engine",
+    "hit engine",
+    "go into cockpit",
+    "turn the wheel",
+    "rotate wheel",
+    "open the heavy door",
+    "fix the hull with the repair kit",
+    "repair hull with kit",
+    "shut the heavy door",
+    "close heavy door",
+    "spin the wheel",
+    "operate the control panel",
+    "use control panel",
+    "help",
+    "dance",
+    "inspect unicorn",
+    "eat the fuel can",
+]
+
+
+class LiteralConfig(Config):
+    """The configuration with neither synonyms nor stop words."""
+
+    lexicon = Lexicon({}, [])
+
+
+def run(repeat: int) -> dict:
+    results = {}
+    for name, config in [("literal", LiteralConfig), ("lexicon", Config)]:
+        vocabulary = Vocabulary(containers=[Items, Objects], config=config)
+
+        def parse():
+            for user_input in CORPUS:
+                vocabulary.reject(user_input)
+                Command(user_input, config.lexicon)
+
+        errors = sum(bool(vocabulary.reject(user_input)) for user_input in CORPUS)
+        seconds = min(timeit.repeat(parse, number=repeat, repeat=5))
+        results[name] = {
+            "error_rate": errors / len(CORPUS),
+            "lines_per_second": repeat * len(CORPUS) / seconds,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"corpus: {len(CORPUS)} lines")
+    for name, result in run(args.repeat).items():
+        print(
+            f"{name}: {result['error_rate']:.0%} parse errors, "
+            f"{result['lines_per_second']:,.0f} lines/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Scripted playthroughs shared by the benchmarks and the load generator."""
+from typing import TYPE_CHECKING
+
+from src.containers import Effects, Environments
+
+if TYPE_CHECKING:
+    from src.player import Player
+
+WINNING_PLAYTHROUGH = [
+    "press red button",
+    "hit glass case",
+    "pickup fire axe",
+    "equip fire axe",
+    "hit hallway door",
+    "enter hallway",
+    "enter armory",
+    "pickup space suit",
+    "enter hallway",
+    "enter workshop",
+    "pickup repair kit",
+    "pickup fuel can",
+    "enter hallway",
+    "enter bathroom",
+    "use urinal",
+    "enter hallway",
+    "enter engine room",
+    "fill engine with fuel can",
+    "unequip fire axe",
+    "hit engine",
+    "enter hallway",
+    "enter cockpit",
+    "equip space suit",
+    "turn wheel",
+    "open heavy door",
+    "enter heavy door",
+    "repair hull with repair kit",
+    "enter heavy door",
+    "close heavy door",
+    "turn wheel",
+    "use control panel",
+]
+
+
+def new_game(player: "Player") -> None:
+    """Puts the player where a new game starts."""
+    player.environment = Environments.prologue_cockpit()
+    player.effects = [Effects.full_bladder()]
+    player.inventory = []
+    player.equipped = []
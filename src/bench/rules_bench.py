@@ -0,0 +1,214 @@
+"""Rule tables vs. the hand-coded condition chains they replaced, on the actions of
+the shipped services that have rules.
+
+Usage: python -m src.bench.rules_bench [--repeat N]
+"""
+import argparse
+import timeit
+from functools import partial
+from typing import Callable, Union
+
+from src.bench.playthroughs import new_game
+from src.command import Command
+from src.containers import Effects, Globals, Items, Objects, Services
+from src.enums import PlayerAction
+from src.outcome import GameOver
+from src.service import Service
+from src.utils import die_in_void
+
+
+def control_panel_inspect(service: Service, cmd: Command) -> str:
+    panel = Objects.control_panel()
+    if panel.state is panel.States.PROLOGUE:
+        return (
+            "A control panel with a lot of buttons. A symbol of a flame flashes on "
+            "the screen. Next to it is a red button."
+        )
+    str_ = panel.description
+    heavy_door = Objects.heavy_door()
+    heavy_door_wheel = Objects.heavy_door_wheel()
+    hidden_conditions = [
+        heavy_door.state is heavy_door.States.CLOSED,
+        heavy_door_wheel.state is heavy_door_wheel.States.CLOSED,
+        Effects.full_bladder() not in Globals.player().effects,
+    ]
+    if not all(hidden_conditions):
+        str_ += " You feel like you are forgetting something."
+    if Objects.engine().state is not Objects.engine().States.WORKING:
+        str_ += " The engine light is flashing."
+    if Objects.hull().state is not Objects.hull().States.REPAIRED:
+        str_ += " The hull light is flashing."
+    return str_
+
+
+def heavy_door_open(service: Service, cmd: Command) -> Union[str, GameOver]:
+    wheel = Objects.heavy_door_wheel()
+    if wheel.state is wheel.States.CLOSED:
+        return "The door is locked."
+    if wheel.state is wheel.States.OPEN:
+        if Effects.vacuum_resistance() not in Globals.player().effects:
+            return die_in_void(inside=True, opening_door=True)
+        door = Objects.heavy_door()
+        door.state = door.States.OPEN
+        return "You open the door."
+    return ""
+
+
+def engine_hit(service: Service, cmd: Command) -> str:
+    engine = Objects.engine()
+    if Items.fire_axe() in Globals.player().equipped:
+        engine.state = engine.States.BROKEN
+        return "You hit the engine with the axe. It breaks into pieces."
+    if engine.state is engine.States.FUELED:
+        engine.state = engine.States.WORKING
+        return "The engine start roaring."
+    return service._hit(cmd)
+
+
+def _set(**states: str) -> Callable[[], None]:
+    """Returns a function putting objects into states, and the player into a
+    known condition."""
+
+    def reset():
+        player = Globals.player()
+        player.effects = []
+        player.equipped = []
+        for key, state in states.items():
+            object_ = getattr(Objects, key)()
+            object_.state = getattr(object_.States, state)
+
+    return reset
+
+
+def _with(reset: Callable[[], None], **lists: list) -> Callable[[], None]:
+    def reset_with():
+        reset()
+        for name, values in lists.items():
+            setattr(Globals.player(), name, values)
+
+    return reset_with
+
+
+_FIXED = dict(
+    heavy_door="CLOSED", heavy_door_wheel="CLOSED", engine="WORKING", hull="REPAIRED"
+)
+
+# name: (service, action, object, hand-coded chain, puts the world in the case)
+CASES = {
+    "inspect panel, prologue": (
+        Services.control_panel_service,
+        PlayerAction.INSPECT,
+        Objects.control_panel,
+        control_panel_inspect,
+        _set(control_panel="PROLOGUE"),
+    ),
+    "inspect panel, ready": (
+        Services.control_panel_service,
+        PlayerAction.INSPECT,
+        Objects.control_panel,
+        control_panel_inspect,
+        _set(control_panel="MAIN", **_FIXED),
+    ),
+    "inspect panel, broken": (
+        Services.control_panel_service,
+        PlayerAction.INSPECT,
+        Objects.control_panel,
+        control_panel_inspect,
+        _set(
+            control_panel="MAIN",
+            heavy_door="CLOSED",
+            heavy_door_wheel="OPEN",
+            engine="EMPTY",
+            hull="DAMAGED",
+        ),
+    ),
+    "open heavy door, locked": (
+        Services.heavy_door_service,
+        PlayerAction.OPEN,
+        Objects.heavy_door,
+        heavy_door_open,
+        _set(heavy_door="CLOSED", heavy_door_wheel="CLOSED"),
+    ),
+    "open heavy door, suited": (
+        Services.heavy_door_service,
+        PlayerAction.OPEN,
+        Objects.heavy_door,
+        heavy_door_open,
+        _with(
+            _set(heavy_door="CLOSED", heavy_door_wheel="OPEN"),
+            effects=[Effects.vacuum_resistance()],
+        ),
+    ),
+    "hit engine, fueled": (
+        Services.engine_service,
+        PlayerAction.HIT,
+        Objects.engine,
+        engine_hit,
+        _set(engine="FUELED"),
+    ),
+    "hit engine, with axe": (
+        Services.engine_service,
+        PlayerAction.HIT,
+        Objects.engine,
+        engine_hit,
+        _with(_set(engine="WORKING"), equipped=[Items.fire_axe()]),
+    ),
+    "hit engine, nothing happens": (
+        Services.engine_service,
+        PlayerAction.HIT,
+        Objects.engine,
+        engine_hit,
+        _set(engine="EMPTY"),
+    ),
+}
+
+
+def run(repeat: int) -> dict[str, tuple[float, float]]:
+    """Returns microseconds per command of the hand-coded chain and of the rule
+    table, per case. Both answer the same."""
+    results = {}
+    for name, (service_p, action, object_p, chain, reset) in CASES.items():
+        service = service_p()
+        cmd = Command(f"{action} {object_p().name}")
+        cmd.action = action
+        cmd.object = object_p()
+
+        hand_coded = partial(chain, service)
+        rules = service._action_mapping[action]
+        outputs = []
+        for fn in [hand_coded, rules]:
+            reset()
+            outputs.append(str(fn(cmd)))
+        if outputs[0] != outputs[1]:
+            raise ValueError(f"{name}: the rules answer {outputs[1]!r}")
+
+        def timed(fn: Callable) -> float:
+            def loop():
+                reset()
+                fn(cmd)
+
+            seconds = min(timeit.repeat(loop, number=repeat, repeat=5))
+            return seconds / repeat * 1e6
+
+        overhead = timed(lambda cmd: None)
+        results[name] = (
+            timed(hand_coded) - overhead,
+            timed(rules) - overhead,
+        )
+    new_game(Globals.player())
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"{'case':<28} {'chain':>9} {'rules':>9}")
+    for name, (chain, rules) in results.items():
+        print(f"{name:<28} {chain:>6.2f} us {rules:>6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""How the subsystems of a turn scale with the size of the world, on generated
+worlds of increasing size.
+
+Usage: python -m src.bench.scaling_bench [--rooms 10,100,1000,10000] [--seed N]
+                                         [--compiled]
+"""
+import argparse
+import os
+import statistics
+from tempfile import TemporaryDirectory
+from typing import Callable
+
+from src.bench.suite import Benchmark, measure
+from src.content import compile_content, export_source, load_world
+from src.content_pack import ContentPack, write_pack
+from src.worldgen import GeneratedWorld, generate_world
+
+
+def benchmarks(world: GeneratedWorld) -> dict[str, Callable[[], object]]:
+    """The subsystems, each working on the last generated object so lookups that
+    scan their container do a full scan."""
+    engine = world.create_engine()
+    world_state = world.create_world_state()
+    room = world.player.environment
+    door = room.objects[-1]
+    last_object = list(world.objects_c.members().values())[-1]()
+    resolvers = world.resolvers_c
+
+    def turn():
+        engine.execute(f"inspect {door.name}")
+        engine.drain_output()
+
+    return {
+        "resolve.object": lambda: resolvers.objects().resolve(last_object.name),
+        "resolve.service": lambda: resolvers.services().resolve(last_object),
+        "environment.objects_and_items": lambda: room.objects_and_items,
+        "autocomplete.enter": lambda: engine.complete("enter "),
+        "state.capture": world_state.capture,
+        "turn.inspect": turn,
+    }
+
+
+def compiled_world(rooms: int, seed: int, directory: str) -> GeneratedWorld:
+    """The generated world, compiled into a content pack and loaded from it."""
+    path = os.path.join(directory, f"{rooms}.pack")
+    write_pack(path, compile_content(export_source(generate_world(rooms, seed))))
+    return load_world(ContentPack(path))
+
+
+def run(
+    sizes: list[int], seed: int = 0, samples: int = 5, compiled: bool = False
+) -> dict[str, dict]:
+    """Returns the median seconds per call of each benchmark, by world size."""
+    results: dict[str, dict] = {}
+    with TemporaryDirectory() as directory:
+        for rooms in sizes:
+            if compiled:
+                world = compiled_world(rooms, seed, directory)
+            else:
+                world = generate_world(rooms, seed)
+            for name, function in benchmarks(world).items():
+                times = measure(Benchmark(function), samples)
+                results.setdefault(name, {})[rooms] = statistics.median(times)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", default="10,100,1000,10000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--compiled", action="store_true", help="Load the worlds from content packs."
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.rooms.split(",")]
+    results = run(sizes, args.seed, compiled=args.compiled)
+    print(f"{'us/call':<32}" + "".join(f"{size:>12}" for size in sizes))
+    for name, by_size in results.items():
+        print(f"{name:<32}" + "".join(f"{by_size[s] * 1e6:>12.2f}" for s in sizes))
+
+
+if __name__ == "__main__":
+    main()
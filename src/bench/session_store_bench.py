@@ -0,0 +1,58 @@
+"""Sustained write throughput of the SQLite session store.
+
+Usage: python -m src.bench.session_store_bench [--sessions N] [--seconds S]
+"""
+import argparse
+import os
+import random
+import time
+from tempfile import TemporaryDirectory
+
+from src.containers import Globals, Effects, Items, Objects, Environments
+from src.sqlite_store import SQLiteSessionStore
+from src.state import WorldState
+
+
+def run(sessions: int, seconds: float, flush_interval: float) -> dict:
+    world_state = WorldState(Globals.player(), Effects, Items, Objects, Environments)
+    snapshot = world_state.capture()
+    session_ids = [f"player-{i}" for i in range(sessions)]
+
+    with TemporaryDirectory() as directory:
+        store = SQLiteSessionStore(
+            os.path.join(directory, "sessions.db"), flush_interval=flush_interval
+        )
+        writes = 0
+        turns = dict.fromkeys(session_ids, 0)
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            session_id = random.choice(session_ids)
+            turns[session_id] += 1
+            store.save(session_id, {"snapshot": snapshot, "turns": turns[session_id]})
+            writes += 1
+        store.close()
+        elapsed = time.perf_counter() - started
+
+    return {
+        "sessions": sessions,
+        "writes": writes,
+        "writes_per_sec": writes / elapsed,
+        "flushed_rows": store.flushed_rows,
+        "flushed_rows_per_sec": store.flushed_rows / elapsed,
+        "coalescing_ratio": writes / max(1, store.flushed_rows // 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for key, value in run(args.sessions, args.seconds, args.flush_interval).items():
+        print(f"{key}: {value:,.0f}" if isinstance(value, int) else f"{key}: {value:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""Microbenchmarks of every stage of a turn and a macrobenchmark of a scripted
+playthrough, compared against JSON baselines kept in src/bench/baselines.
+
+A benchmark regresses when its samples are significantly slower than the
+baseline's (two-sided Mann-Whitney U test) and its median slowed down by more
+than the threshold. Baselines are machine specific: save one on the machine the
+comparisons run on, and keep it otherwise idle.
+
+Usage:
+    python -m src.bench.suite run [--filter TEXT] [--output FILE]
+    python -m src.bench.suite save [--filter TEXT] [--baseline FILE]
+    python -m src.bench.suite compare [--filter TEXT] [--baseline FILE] [--current FILE]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Optional
+
+from src.bench.playthroughs import WINNING_PLAYTHROUGH, new_game
+from src.command import Command, CommandValidator
+from src.config import Config
+from src.containers import (
+    Effects,
+    Environments,
+    Globals,
+    Items,
+    Objects,
+    Resolvers,
+    Services,
+)
+from src.core import Engine
+from src.enums import PlayerAction
+from src.service import Service
+from src.state import WorldState
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "suite.json")
+
+# Inputs for the actions that need a preposition object, by action.
+PREPOSITION_SUFFIXES = {
+    PlayerAction.FILL: "with fuel can",
+    PlayerAction.EMPTY: "into engine",
+    PlayerAction.REPAIR: "with repair kit",
+}
+
+
+class Benchmark:
+    """
+    A function that is timed, and optionally a setup run before every call without
+    being timed.
+
+    Attributes:
+    -----------
+    function : Callable[[], Any]
+        The timed function.
+    setup : Optional[Callable[[], Any]]
+        Puts the world back into the state the function expects.
+    """
+
+    def __init__(
+        self, function: Callable[[], Any], setup: Optional[Callable[[], Any]] = None
+    ):
+        self.function = function
+        self.setup = setup
+
+
+class Context:
+    """The game the benchmarks run against."""
+
+    def __init__(self):
+        self.player = Globals.player()
+        self.world_state = WorldState(
+            self.player, Effects, Items, Objects, Environments
+        )
+        new_game(self.player)
+        self.new_game = self.world_state.capture()
+        self.validator = CommandValidator(
+            player=self.player,
+            command_object_r=Resolvers.command_object(),
+            config=Config,
+        )
+        self.engine = Engine(
+            player=self.player,
+            items_c=Items,
+            objects_c=Objects,
+            services_c=Services,
+            resolvers_c=Resolvers,
+            command_validator=self.validator,
+            config=Config,
+        )
+
+    def play(self, lines: list[str]) -> None:
+        for line in lines:
+            self.engine.execute(line)
+        self.engine.drain_output()
+
+    def command(self, user_input: str) -> Command:
+        command = Command(user_input, Config.lexicon)
+        return Resolvers.command_object().resolve_command(command)
+
+
+def benchmarks(context: Context) -> dict[str, Benchmark]:
+    """Builds the benchmarks. Building them sets up the world, so it is restored to
+    a new game between them."""
+    found = {}
+
+    def reset():
+        context.world_state.restore(context.new_game)
+
+    found["parse.command"] = Benchmark(
+        lambda: Command("fill the engine with fuel can", Config.lexicon)
+    )
+
+    context.play(WINNING_PLAYTHROUGH[:22])
+    valid = Command("turn wheel", Config.lexicon)
+    found["validate.command"] = Benchmark(lambda: context.validator.validate(valid))
+    reset()
+
+    found["resolve.object"] = Benchmark(
+        lambda: Resolvers.objects().resolve("heavy door wheel")
+    )
+    found["resolve.item"] = Benchmark(lambda: Resolvers.items().resolve("fuel can"))
+    wheel = Objects.heavy_door_wheel()
+    found["resolve.service"] = Benchmark(lambda: Resolvers.services().resolve(wheel))
+
+    for name, benchmark in _interactions(context).items():
+        found[name] = benchmark
+        reset()
+
+    hallway = Environments.hallway()
+    found["environment.shown_objects_and_items_str"] = Benchmark(
+        lambda: hallway.shown_objects_and_items_str
+    )
+
+    suit = Items.space_suit()
+
+    def equip_unequip():
+        context.player.equip(suit)
+        context.player.unequip(suit)
+
+    found["player.equip_unequip"] = Benchmark(equip_unequip, reset)
+
+    def playthrough():
+        reset()
+        context.play(WINNING_PLAYTHROUGH)
+
+    found["playthrough.win"] = Benchmark(playthrough)
+    return found
+
+
+def _interactions(context: Context) -> dict[str, Benchmark]:
+    """A benchmark per service and action, each starting from the object's room
+    with all other items in the inventory."""
+    instances = {
+        **{key: provider() for key, provider in Objects.members().items()},
+        **{key: provider() for key, provider in Items.members().items()},
+    }
+    rooms = [provider() for provider in Environments.members().values()]
+
+    found = {}
+    for key, provider in Services.members().items():
+        service = provider()
+        # The default paths are benchmarked once, on the generic service.
+        actions = [
+            action
+            for action, method in service._action_mapping.items()
+            if key == "generic_service"
+            or action in service.rule_tables
+            or method.__func__ is not getattr(Service, method.__name__)
+        ]
+        target = next(
+            (i for i in instances.values() if type(i) is service.object_type),
+            Items.fire_axe() if key == "item_service" else None,
+        )
+        room = next(
+            (r for r in rooms if target in r.objects_and_items), Environments.cockpit()
+        )
+        for action in actions:
+            context.world_state.restore(context.new_game)
+            context.player.environment = room
+            context.player.inventory = [
+                provider()
+                for provider in Items.members().values()
+                if provider() not in room.items
+            ]
+            reference = target.references[0] if target else ""
+            suffix = PREPOSITION_SUFFIXES.get(action, "")
+            command = context.command(f"{action} {reference} {suffix}")
+            command.object = target
+            snapshot = context.world_state.capture()
+
+            def interact(service=service, command=command):
+                service.interact(command)
+
+            def setup(snapshot=snapshot):
+                context.world_state.restore(snapshot)
+
+            try:
+                setup()
+                interact()
+            except Exception:
+                # Paths the game can't reach, e.g. picking up an item that is
+                # already in the inventory.
+                continue
+            found[f"interact.{key}.{str(action).lower()}"] = Benchmark(interact, setup)
+    return found
+
+
+def measure(
+    benchmark: Benchmark, samples: int = 15, min_time: float = 0.01
+) -> list[float]:
+    """Returns seconds per call. Each sample averages as many calls as fit in
+    min_time, including their setup."""
+    perf_counter = time.perf_counter
+    function, setup = benchmark.function, benchmark.setup
+
+    def timed(number: int) -> tuple[float, float]:
+        """Returns the seconds spent in the function and in total."""
+        started = perf_counter()
+        if setup is None:
+            for _ in range(number):
+                function()
+            elapsed = perf_counter() - started
+            return elapsed, elapsed
+        spent = 0.0
+        for _ in range(number):
+            setup()
+            call_started = perf_counter()
+            function()
+            spent += perf_counter() - call_started
+        return spent, perf_counter() - started
+
+    number = 1
+    while timed(number)[1] < min_time:
+        number *= 2
+    return [timed(number)[0] / number for _ in range(samples)]
+
+
+def run(filter_: Optional[str] = None, samples: int = 15) -> dict:
+    context = Context()
+    results = {}
+    for name, benchmark in benchmarks(context).items():
+        if filter_ and filter_ not in name:
+            continue
+        context.world_state.restore(context.new_game)
+        times = measure(benchmark, samples)
+        results[name] = {"median": statistics.median(times), "samples": times}
+    context.world_state.restore(context.new_game)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+
+
+def mann_whitney_u(a: list[float], b: list[float]) -> float:
+    """Returns the two-sided p-value of the Mann-Whitney U test, with the normal
+    approximation and a correction for ties."""
+    n1, n2 = len(a), len(b)
+    values = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(values)
+    ties = 0.0
+    i = 0
+    while i < len(values):
+        j = i
+        while j + 1 < len(values) and values[j + 1][0] == values[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, values) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+def compare(
+    baseline: dict, current: dict, alpha: float = 0.01, threshold: float = 0.05
+) -> list[dict]:
+    """Returns a row per benchmark with the change of the median and whether it is
+    a regression, an improvement, unchanged, new or missing."""
+    rows = []
+    base_results = baseline["benchmarks"]
+    current_results = current["benchmarks"]
+    for name in sorted(set(base_results) | set(current_results)):
+        if name not in current_results:
+            rows.append({"name": name, "status": "missing"})
+            continue
+        if name not in base_results:
+            rows.append({"name": name, "status": "new"})
+            continue
+        base, now = base_results[name], current_results[name]
+        change = now["median"] / base["median"] - 1
+        p_value = mann_whitney_u(base["samples"], now["samples"])
+        status = "unchanged"
+        if p_value < alpha and abs(change) > threshold:
+            status = "regression" if change > 0 else "improvement"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "baseline": base["median"],
+                "current": now["median"],
+                "change": change,
+                "p_value": p_value,
+            }
+        )
+    return rows
+
+
+def format_rows(rows: list[dict]) -> str:
+    lines = [f"{'benchmark':<58}{'baseline':>12}{'current':>12}{'change':>9}  status"]
+    for row in rows:
+        if "change" not in row:
+            lines.append(f"{row['name']:<58}{'':>33}  {row['status']}")
+            continue
+        lines.append(
+            f"{row['name']:<58}"
+            f"{_format_seconds(row['baseline']):>12}"
+            f"{_format_seconds(row['current']):>12}"
+            f"{row['change']:>+9.1%}  {row['status']}"
+        )
+    return "\n".join(lines)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def _load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _dump(results: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(results, file, indent=1)
+        file.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=["run", "save", "compare"])
+    parser.add_argument("--filter", help="Only run benchmarks containing this text.")
+    parser.add_argument("--samples", type=int, default=15)
+    parser.add_argument("--output", help="Write the results of `run` to this file.")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--current", help="Compare these results instead of running.")
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--threshold", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.command == "compare" and args.current:
+        current = _load(args.current)
+    else:
+        current = run(args.filter, args.samples)
+
+    if args.command == "run":
+        if args.output:
+            _dump(current, args.output)
+        for name, result in current["benchmarks"].items():
+            print(f"{name:<58}{_format_seconds(result['median']):>12}")
+    elif args.command == "save":
+        _dump(current, args.baseline)
+        print(f"Saved {len(current['benchmarks'])} benchmarks to {args.baseline}")
+    else:
+        baseline = _load(args.baseline)
+        if args.filter:
+            baseline["benchmarks"] = {
+                k: v for k, v in baseline["benchmarks"].items() if args.filter in k
+            }
+        rows = compare(baseline, current, args.alpha, args.threshold)
+        print(format_rows(rows))
+        if any(row["status"] == "regression" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Raising vs. result-typed command validation on an invalid-heavy input mix.
+
+Usage: python -m src.bench.validation_bench [--repeat N]
+"""
+import argparse
+import timeit
+
+from src.command import Command, CommandValidator
+from src.config import Config
+from src.containers import Globals, Environments, Resolvers
+
+INPUT_MIX = [
+    "inspect",
+    "inspect control panel",
+    "turn wheel",
+    "dance",
+    "xyzzy",
+    "open sesame",
+    "inspect unicorn",
+    "hit the glass case",
+    "fill",
+    "fill engine",
+    "use panel on",
+    "equip control panel",
+    "pickup heavy door",
+    "repair hull with spoon",
+    "asdf qwer",
+]
+
+
+def run(repeat: int) -> dict:
+    player = Globals.player()
+    player.environment = Environments.cockpit()
+    validator = CommandValidator(
+        player=player,
+        command_object_r=Resolvers.command_object(),
+        config=Config,
+    )
+    commands = [Command(user_input) for user_input in INPUT_MIX]
+    invalid = sum(not validator.check(command).ok for command in commands)
+
+    def raising():
+        for command in commands:
+            try:
+                validator.validate(command)
+            except Exception as e:
+                str(e)
+
+    def result_typed():
+        for command in commands:
+            result = validator.check(command)
+            if not result.ok:
+                result.message
+
+    results = {"invalid": invalid}
+    for name, fn in [("raising", raising), ("result", result_typed)]:
+        seconds = min(timeit.repeat(fn, number=repeat, repeat=5))
+        results[name] = seconds / (repeat * len(commands)) * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    print(f"inputs: {len(INPUT_MIX)} ({results.pop('invalid')} invalid)")
+    for name, micros in results.items():
+        print(f"{name}: {micros:.2f} us/command")
+
+
+if __name__ == "__main__":
+    main()
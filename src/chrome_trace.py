@@ -0,0 +1,206 @@
+import json
+import os
+import threading
+import time
+from functools import partial, wraps
+from typing import IO, Any, Callable, Iterable, Optional
+
+from src.command import CommandValidator
+from src.core import Engine
+from src.hooks import Hook, add_hook, remove_hook
+from src.object.base import Interactable
+from src.player import Player
+from src.resolvers import CommandObjectResolver, ObjectResolver, ServiceResolver
+from src.tracing import tracer
+
+# (owner, method, category, span name, args of the span from the call's arguments)
+SPANS: list[tuple[type, str, str, str, Optional[Callable[..., dict]]]] = [
+    (
+        Engine,
+        "execute",
+        "turn",
+        "turn",
+        lambda cls, user_input: {"input": user_input},
+    ),
+    (Engine, "_parse", "parse", "tokenize", None),
+    (Engine, "_validate", "validate", "validate", None),
+    (CommandValidator, "_check_action", "validate", "validate action", None),
+    (CommandValidator, "_check_object", "validate", "validate object", None),
+    (CommandValidator, "_check_preposition", "validate", "validate preposition", None),
+    (
+        CommandValidator,
+        "_check_preposition_object",
+        "validate",
+        "validate preposition object",
+        None,
+    ),
+    (CommandValidator, "_check_usage", "validate", "validate usage", None),
+    (Engine, "_resolve", "resolve", "resolve command", None),
+    (
+        CommandObjectResolver,
+        "_resolve_with_resolvers",
+        "resolve",
+        "resolve object",
+        lambda self, object_: {"object": object_},
+    ),
+    (ObjectResolver, "resolve", "resolve", "resolve by container", None),
+    (Engine, "_get_service", "dispatch", "service lookup", None),
+    (ServiceResolver, "resolve", "dispatch", "resolve service", None),
+    (
+        Engine,
+        "_interact",
+        "dispatch",
+        "interact",
+        lambda cls, service, command: {"service": type(service).__name__},
+    ),
+    (Player, "equip", "state", "equip", None),
+    (Player, "unequip", "state", "unequip", None),
+    (Player, "add_effects", "state", "add effects", None),
+    (Player, "remove_effects", "state", "remove effects", None),
+]
+
+# Attributes whose assignment is recorded as an instant event.
+MUTATIONS = [(Interactable, "state"), (Player, "environment")]
+
+
+class ChromeTraceRecorder:
+    """
+    Records turns as Chrome trace events (chrome://tracing, Perfetto), with
+    nested spans for parsing, the validation steps, resolvers, service dispatch
+    and player changes, and an instant event per state change.
+
+    Events are written to the file as they happen, so a long capture doesn't
+    build up in memory. Like TurnInstrumentation, the traced methods are only
+    hooked while the recorder is enabled, see `src.hooks`.
+
+    Attributes:
+    -----------
+    file : IO[str]
+        Where the JSON array of events is written.
+    session_ids : Optional[set[str]]
+        The sessions that are recorded, as set on the tracer. All sessions are
+        recorded when None.
+    events : int
+        The amount of events written.
+    """
+
+    def __init__(self, file: IO[str], session_ids: Optional[Iterable[str]] = None):
+        self.file = file
+        self.session_ids = set(session_ids) if session_ids is not None else None
+        self.events = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._hooks: list[tuple[type, str, Hook]] = []
+        self.file.write("[\n")
+
+    @classmethod
+    def open(
+        cls, path: str, session_ids: Optional[Iterable[str]] = None
+    ) -> "ChromeTraceRecorder":
+        return cls(open(path, "w"), session_ids)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._hooks)
+
+    def enable(self) -> "ChromeTraceRecorder":
+        if self.enabled:
+            return self
+        for owner, name, category, span, args in SPANS:
+            hook = partial(self._span, category=category, name=span, args=args)
+            self._hooks.append((owner, name, hook))
+        for owner, attribute in MUTATIONS:
+            hook = partial(self._mutation, attribute=attribute)
+            self._hooks.append((owner, "__setattr__", hook))
+        for owner, name, hook in self._hooks:
+            add_hook(owner, name, hook)
+        return self
+
+    def disable(self) -> None:
+        for owner, name, hook in reversed(self._hooks):
+            remove_hook(owner, name, hook)
+        self._hooks = []
+
+    def close(self) -> None:
+        """Stops recording and ends the JSON array."""
+        self.disable()
+        with self._lock:
+            self.file.write("\n]\n")
+            self.file.close()
+
+    def _recording(self) -> bool:
+        return self.session_ids is None or tracer.session_id in self.session_ids
+
+    def _write(self, event: dict) -> None:
+        event["pid"] = self._pid
+        event["tid"] = threading.get_ident()
+        event.setdefault("args", {})["session"] = tracer.session_id
+        line = json.dumps(event, separators=(",", ":"), default=str)
+        with self._lock:
+            if self.events:
+                self.file.write(",\n")
+            self.file.write(line)
+            self.events += 1
+
+    def _span(
+        self,
+        function: Callable,
+        category: str,
+        name: str,
+        args: Optional[Callable[..., dict]],
+    ) -> Callable:
+        @wraps(function)
+        def span(*call_args, **call_kwargs):
+            if not self._recording():
+                return function(*call_args, **call_kwargs)
+            started = time.perf_counter_ns()
+            try:
+                return function(*call_args, **call_kwargs)
+            finally:
+                ended = time.perf_counter_ns()
+                event = {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": started / 1000,
+                    "dur": (ended - started) / 1000,
+                }
+                if args:
+                    event["args"] = args(*call_args, **call_kwargs)
+                self._write(event)
+
+        return span
+
+    def _mutation(self, setattr_: Callable, attribute: str) -> Callable:
+        def __setattr__(instance, name, value):
+            setattr_(instance, name, value)
+            if name == attribute and self._recording():
+                self._write(
+                    {
+                        "name": f"{attribute} change",
+                        "cat": "state",
+                        "ph": "i",
+                        "s": "t",
+                        "ts": time.perf_counter_ns() / 1000,
+                        "args": {
+                            "object": str(instance),
+                            attribute: _name(instance, value),
+                        },
+                    }
+                )
+
+        return __setattr__
+
+    def __enter__(self) -> "ChromeTraceRecorder":
+        return self.enable()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _name(instance: Any, value: Any) -> str:
+    """Returns the name of a state in the States of the instance, or the name of
+    the value."""
+    states = vars(getattr(type(instance), "States", object))
+    name = next((name for name, state in states.items() if state is value), None)
+    return name or getattr(value, "name", str(value))
@@ -1,9 +1,9 @@
-import logging
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from src.utils import casefold_index, enum_has, subclass_in_list, enum_get, casefold_in
-from src.enums import PlayerAction, PlayerActionPreposition, UsageFormat
+from src.enums import PlayerAction, PlayerActionPreposition, UsageFormat, CommandError
 from src.object.base import Object, Item
+from src.tracing import tracer
 
 if TYPE_CHECKING:
     from src.resolvers import CommandObjectResolver
@@ -27,7 +27,9 @@ class switch_command_objects:
 
     def __enter__(self):
         self._switch_objects()
-        logging.debug(f"Switched objects: {self.cmd}")
+        tracer.event(
+            "switched objects", self.cmd.object_str, self.cmd.preposition_object_str
+        )
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._switch_objects()
@@ -78,8 +80,10 @@ class Command:
     preposition: Optional[PlayerActionPreposition] = None
     preposition_object: Union["Object", "Item"] = None
 
-    def __init__(self, command: str) -> None:
+    def __init__(self, command: str, lexicon: Optional["Lexicon"] = None) -> None:
         self.dissected_cmd = self._dissect_cmd(command)
+        if lexicon:
+            self.dissected_cmd = lexicon.normalize(self.dissected_cmd)
         self.action_str = self._extract_action(self.dissected_cmd)
         self.preposition_str = self._extract_preposition(self.dissected_cmd)
         self.object_str = self._extract_object(self.dissected_cmd)
@@ -130,6 +134,129 @@ class Command:
         return " ".join(dissected_cmd[preposition_index + 1 :]) or None
 
 
+class Lexicon:
+    """
+    Normalizes dissected commands in a single pass: a leading synonym phrase is
+    replaced by the action it stands for and stop words are dropped, so "look at
+    the panel" is parsed as "INSPECT PANEL".
+
+    Attributes:
+    -----------
+    synonyms : dict[tuple[str, ...], str]
+        The uppercased words of each synonym phrase, mapped to its action.
+    stop_words : frozenset[str]
+        The uppercased words that are ignored.
+    """
+
+    def __init__(self, synonyms: dict[str, PlayerAction], stop_words: list[str]):
+        self.synonyms = {
+            tuple(phrase.upper().split()): str(action)
+            for phrase, action in synonyms.items()
+        }
+        self.stop_words = frozenset(word.upper() for word in stop_words)
+        self._lengths = sorted({len(phrase) for phrase in self.synonyms}, reverse=True)
+
+    def normalize(self, dissected_cmd: list[str]) -> list[str]:
+        start, action_str = self._match_synonym(dissected_cmd)
+        normalized = [action_str] if action_str else []
+        normalized += [
+            word for word in dissected_cmd[start:] if word not in self.stop_words
+        ]
+        # Nothing but stop words: the first word is reported as the action.
+        return normalized or dissected_cmd[:1]
+
+    def _match_synonym(self, dissected_cmd: list[str]) -> tuple[int, Optional[str]]:
+        """Returns the length and action of the longest leading synonym phrase."""
+        for length in self._lengths:
+            action_str = self.synonyms.get(tuple(dissected_cmd[:length]))
+            if action_str:
+                return length, action_str
+        return 0, None
+
+
+class CommandChain:
+    """
+    A line of user input holding one or more commands, separated by semicolons or
+    conjunctions: "pickup fuel can and use it", "enter hallway; inspect".
+    Pronouns refer back to the object of the previous command.
+
+    Attributes:
+    -----------
+    commands : list[str]
+        The separate commands.
+    previous_object_str : Optional[str]
+        The object of the previous command.
+    """
+
+    separator = ";"
+    conjunctions = ["AND", "THEN"]
+    pronouns = ["IT", "THEM"]
+
+    def __init__(self, user_input: str, max_commands: Optional[int] = None):
+        self.commands = self._split(user_input)[:max_commands]
+        self.previous_object_str = None
+
+    def __iter__(self):
+        return iter(self.commands)
+
+    def __len__(self):
+        return len(self.commands)
+
+    def _split(self, user_input: str) -> list[str]:
+        commands = []
+        for part in user_input.split(self.separator):
+            words = []
+            for word in part.split():
+                if word.upper() in self.conjunctions:
+                    commands.append(" ".join(words))
+                    words = []
+                else:
+                    words.append(word)
+            commands.append(" ".join(words))
+        return [command for command in commands if command]
+
+    def resolve_pronouns(self, command: str) -> str:
+        """Replaces pronouns with the object of the previous command."""
+        if not self.previous_object_str:
+            return command
+        return " ".join(
+            self.previous_object_str if word.upper() in self.pronouns else word
+            for word in command.split()
+        )
+
+
+class ValidationResult:
+    """
+    The outcome of validating a command.
+
+    Attributes:
+    -----------
+    command : Optional[Command]
+        The validated command. None when the input was rejected before parsing.
+    error : Optional[CommandError]
+        What is wrong with the command, if anything.
+    message : Optional[str]
+        The message shown to the player when the command is invalid.
+    """
+
+    def __init__(
+        self,
+        command: Optional[Command],
+        error: Optional[CommandError] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        self.command = command
+        self.error = error
+        self.message = message
+
+    def __repr__(self):
+        return f"<ValidationResult {self.error or 'OK'}>"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class CommandValidator:
     cmd: Command
 
@@ -142,29 +269,75 @@ class CommandValidator:
         self._player = player
         self._command_object_r = command_object_r
         self._config = config
+        # The objects resolved for the command being checked, by their string.
+        # Every step of a check reads them, and resolving them is the expensive
+        # part of the check.
+        self._resolved: dict[Optional[str], Any] = {}
+        self._resolved_for: Optional[Command] = None
+        self._checked_usage: Optional[CommandUsage] = None
 
     def validate(self, cmd: Command) -> None:
+        """Raises a ValueError if the command is invalid."""
+        result = self.check(cmd)
+        if not result.ok:
+            raise ValueError(result.message)
+
+    def check(self, cmd: Command) -> "ValidationResult":
+        """Validates the command without raising. Invalid input is the common case,
+        so the error is returned rather than raised."""
         self.cmd = cmd
-        self._validate_action()
-        logging.debug(f"Validated action: {self.cmd.action_str}")
-        self._validate_object()
-        logging.debug(f"Validated object: {self.cmd.object_str}")
-        self._validate_preposition()
-        logging.debug(f"Validated preposition: {self.cmd.preposition_str}")
-        self._validate_preposition_object()
-        logging.debug(
-            f"Validated preposition object: {self.cmd.preposition_object_str}"
-        )
-        self._validate_usage()
-        logging.debug(f"Validated usage: {self._usage}")
+        # The world may have changed since the command was last checked.
+        self._resolved_for = None
+        if error := self._check_action():
+            return error
+        tracer.event("validated action", cmd.action_str)
+        if error := self._check_object():
+            return error
+        tracer.event("validated object", cmd.object_str)
+        if error := self._check_preposition():
+            return error
+        tracer.event("validated preposition", cmd.preposition_str)
+        if error := self._check_preposition_object():
+            return error
+        tracer.event("validated preposition object", cmd.preposition_object_str)
+        if error := self._check_usage():
+            return error
+        tracer.event("validated usage", self._checked_usage)
+        return ValidationResult(cmd)
 
     def _validate_action(self) -> None:
+        self._raise(self._check_action())
+
+    def _validate_object(self) -> None:
+        self._raise(self._check_object())
+
+    def _validate_preposition(self) -> None:
+        self._raise(self._check_preposition())
+
+    def _validate_preposition_object(self) -> None:
+        self._raise(self._check_preposition_object())
+
+    def _validate_usage(self) -> None:
+        self._raise(self._check_usage())
+
+    @staticmethod
+    def _raise(result: Optional["ValidationResult"]) -> None:
+        if result is not None:
+            raise ValueError(result.message)
+
+    def _error(self, error: CommandError, message: str) -> "ValidationResult":
+        return ValidationResult(self.cmd, error, message)
+
+    def _check_action(self) -> Optional["ValidationResult"]:
         if self.cmd.action_str == "":
             return
         if not enum_has(self.cmd.action_str, PlayerAction) or not self._usages:
-            raise ValueError(f"Action not recognized: {self.cmd.action_str.upper()}")
+            return self._error(
+                CommandError.ACTION_NOT_RECOGNIZED,
+                f"Action not recognized: {self.cmd.action_str.upper()}",
+            )
 
-    def _validate_object(self) -> None:
+    def _check_object(self) -> Optional["ValidationResult"]:
         if not self._object_required and not self.cmd.object_str:
             return
 
@@ -172,36 +345,47 @@ class CommandValidator:
             return
 
         if self._object_required and not self.cmd.object_str:
-            raise ValueError(f"Action requires object: {self.cmd.action_str.upper()}")
+            return self._error(
+                CommandError.OBJECT_REQUIRED,
+                f"Action requires object: {self.cmd.action_str.upper()}",
+            )
 
-        if not self._object or not self._object_available(self._object):
-            raise ValueError(f"Object not found: {self.cmd.object_str.upper()}")
+        object_ = self._object
+        if not object_ or not self._object_available(object_):
+            return self._error(
+                CommandError.OBJECT_NOT_FOUND,
+                f"Object not found: {self.cmd.object_str.upper()}",
+            )
 
-        if self.cmd.action_str not in self._object.interactions:
-            raise ValueError(
-                f"Cannot perform: {self.cmd.action_str.upper()} on {self.cmd.object_str.upper()}"
+        if self.cmd.action_str not in object_.interactions:
+            return self._error(
+                CommandError.ACTION_NOT_APPLICABLE,
+                f"Cannot perform: {self.cmd.action_str.upper()} on {self.cmd.object_str.upper()}",
             )
 
-    def _validate_preposition(self) -> None:
+    def _check_preposition(self) -> Optional["ValidationResult"]:
         if not self._preposition_required and not self.cmd.preposition_str:
             return
 
         if self._preposition_required and not self.cmd.preposition_str:
-            raise ValueError(
-                f"Action requires preposition: {self.cmd.action_str.upper()}"
+            return self._error(
+                CommandError.PREPOSITION_REQUIRED,
+                f"Action requires preposition: {self.cmd.action_str.upper()}",
             )
 
         if not enum_has(self.cmd.preposition_str, PlayerActionPreposition):
-            raise ValueError(
-                f"Preposition not recognized: {self.cmd.preposition_str.upper()}"
+            return self._error(
+                CommandError.PREPOSITION_NOT_RECOGNIZED,
+                f"Preposition not recognized: {self.cmd.preposition_str.upper()}",
             )
 
         if self.cmd.preposition_str not in self._expected_prepositions:
-            raise ValueError(
-                f"Cannot perform: {self.cmd.action_str.upper()} with {self.cmd.preposition_str.upper()}"
+            return self._error(
+                CommandError.PREPOSITION_NOT_APPLICABLE,
+                f"Cannot perform: {self.cmd.action_str.upper()} with {self.cmd.preposition_str.upper()}",
             )
 
-    def _validate_preposition_object(self) -> None:
+    def _check_preposition_object(self) -> Optional["ValidationResult"]:
         if (
             not self._preposition_object_required
             and not self.cmd.preposition_object_str
@@ -209,25 +393,32 @@ class CommandValidator:
             return
 
         if self._preposition_object_required and not self.cmd.preposition_object_str:
-            raise ValueError(
-                f"Missing object after preposition: {self.cmd.preposition_str.upper()}"
+            return self._error(
+                CommandError.PREPOSITION_OBJECT_REQUIRED,
+                f"Missing object after preposition: {self.cmd.preposition_str.upper()}",
             )
 
+        preposition_object = self._preposition_object
         object_unavailable = (
-            not self._preposition_object
-            or self._is_object(self._preposition_object)
-            and not self._object_available(self._preposition_object)
-            or self._is_item(self._preposition_object)
-            and not self._holding_object(self._preposition_object)
+            not preposition_object
+            or self._is_object(preposition_object)
+            and not self._object_available(preposition_object)
+            or self._is_item(preposition_object)
+            and not self._holding_object(preposition_object)
         )
         if object_unavailable:
-            raise ValueError(
-                f"Object not found: {self.cmd.preposition_object_str.upper()}"
+            return self._error(
+                CommandError.PREPOSITION_OBJECT_NOT_FOUND,
+                f"Object not found: {self.cmd.preposition_object_str.upper()}",
             )
 
-    def _validate_usage(self) -> None:
-        if not self._usage:
-            raise ValueError(f"Invalid usage for action {self.cmd.action_str.upper()}")
+    def _check_usage(self) -> Optional["ValidationResult"]:
+        self._checked_usage = self._usage
+        if not self._checked_usage:
+            return self._error(
+                CommandError.INVALID_USAGE,
+                f"Invalid usage for action {self.cmd.action_str.upper()}",
+            )
 
     def _is_item(self, object_: "Object") -> bool:
         return issubclass(type(object_), Item)
@@ -274,11 +465,22 @@ class CommandValidator:
 
     @property
     def _object(self):
-        return self._command_object_r.resolve(self.cmd.object_str)
+        return self._resolve(self.cmd.object_str)
 
     @property
     def _preposition_object(self):
-        return self._command_object_r.resolve(self.cmd.preposition_object_str)
+        return self._resolve(self.cmd.preposition_object_str)
+
+    def _resolve(self, object_str: Optional[str]):
+        if self._resolved_for is not self.cmd:
+            self._resolved = {}
+            self._resolved_for = self.cmd
+        try:
+            return self._resolved[object_str]
+        except KeyError:
+            resolved = self._command_object_r.resolve(object_str)
+            self._resolved[object_str] = resolved
+            return resolved
 
     @property
     def _object_amt(self) -> int:
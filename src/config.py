@@ -1,4 +1,4 @@
-from src.command import CommandUsage
+from src.command import CommandUsage, Lexicon
 from src.enums import PlayerAction, PlayerActionPreposition
 from src.object.base import Item, Object, Equipable
 from src.player import Player
@@ -120,9 +120,47 @@ action_usage_mapping = {
 }
 
 
-def _build_action_object_amt_mapping() -> dict[PlayerAction, list[int]]:
+# Phrases players use for actions, matched at the start of a command. Longer
+# phrases win, so "take off" is not read as "take".
+action_synonyms = {
+    "TAKE": PlayerAction.PICKUP,
+    "GRAB": PlayerAction.PICKUP,
+    "GET": PlayerAction.PICKUP,
+    "PICK UP": PlayerAction.PICKUP,
+    "LOOK": PlayerAction.INSPECT,
+    "LOOK AT": PlayerAction.INSPECT,
+    "EXAMINE": PlayerAction.INSPECT,
+    "CHECK": PlayerAction.INSPECT,
+    "WEAR": PlayerAction.EQUIP,
+    "PUT ON": PlayerAction.EQUIP,
+    "TAKE OFF": PlayerAction.UNEQUIP,
+    "REMOVE": PlayerAction.UNEQUIP,
+    "GO": PlayerAction.ENTER,
+    "GO INTO": PlayerAction.ENTER,
+    "GO TO": PlayerAction.ENTER,
+    "WALK INTO": PlayerAction.ENTER,
+    "REFUEL": PlayerAction.FILL,
+    "POUR": PlayerAction.EMPTY,
+    "ROTATE": PlayerAction.TURN,
+    "SPIN": PlayerAction.TURN,
+    "SMASH": PlayerAction.HIT,
+    "BREAK": PlayerAction.HIT,
+    "STRIKE": PlayerAction.HIT,
+    "OPERATE": PlayerAction.USE,
+    "PUSH": PlayerAction.PRESS,
+    "SHUT": PlayerAction.CLOSE,
+    "FIX": PlayerAction.REPAIR,
+}
+
+# Words that are dropped from every command.
+stop_words = ["THE", "A", "AN"]
+
+
+def _build_action_object_amt_mapping(
+    usage_mapping: dict = action_usage_mapping,
+) -> dict[PlayerAction, list[int]]:
     mapping = {}
-    for action, usages in action_usage_mapping.items():
+    for action, usages in usage_mapping.items():
         object_amt_combinations = []
         for usage in usages:
             object_amt = 0
@@ -133,11 +171,11 @@ def _build_action_object_amt_mapping() -> dict[PlayerAction, list[int]]:
     return mapping
 
 
-def _build_action_preposition_mapping() -> (
-    dict[PlayerAction, list[PlayerActionPreposition]]
-):
+def _build_action_preposition_mapping(
+    usage_mapping: dict = action_usage_mapping,
+) -> dict[PlayerAction, list[PlayerActionPreposition]]:
     mapping = {}
-    for action, usages in action_usage_mapping.items():
+    for action, usages in usage_mapping.items():
         mapping[action] = []
         for usage in usages:
             if usage.preposition:
@@ -147,6 +185,28 @@ def _build_action_preposition_mapping() -> (
 
 class Config:
     user_prompt: str = "> "
+    max_chained_commands: int = 16
     action_usage_mapping = action_usage_mapping
     action_object_amt_mapping = _build_action_object_amt_mapping()
     action_preposition_mapping = _build_action_preposition_mapping()
+    action_synonyms = action_synonyms
+    stop_words = stop_words
+    lexicon = Lexicon(action_synonyms, stop_words)
+
+    @classmethod
+    def with_usages(cls, usage_mapping: dict) -> type["Config"]:
+        """Returns a configuration like this one with other usages of the actions,
+        and the mappings derived from them."""
+        return type(
+            cls.__name__,
+            (cls,),
+            {
+                "action_usage_mapping": usage_mapping,
+                "action_object_amt_mapping": _build_action_object_amt_mapping(
+                    usage_mapping
+                ),
+                "action_preposition_mapping": _build_action_preposition_mapping(
+                    usage_mapping
+                ),
+            },
+        )
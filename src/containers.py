@@ -1,7 +1,10 @@
 from dependency_injector.containers import DeclarativeContainer
 from dependency_injector.providers import Singleton
 
+from src.autocomplete import Autocomplete
+from src.config import Config
 from src.effect import VacuumResistance, FullBladder
+from src.fuzzy import FuzzyIndex
 from src.resolvers import (
     ItemResolver,
     ObjectResolver,
@@ -27,6 +30,7 @@ from src.service import (
     FuelCanService, EngineService,
 )
 from src.player import Player
+from src.vocabulary import Vocabulary
 from src.object.items import SpaceSuit, FireAxe, RepairKit, FuelCan
 from src.object.objects import (
     HeavyDoorWheel,
@@ -68,7 +72,7 @@ class Globals(DeclarativeContainer):
     player = Singleton(Player)
 
 
-class Effects(DeclarativeContainer):
+class Effects(CustomContainer):
     full_bladder = Singleton(FullBladder)
     vacuum_resistance = Singleton(VacuumResistance)
 
@@ -393,9 +397,25 @@ class Resolvers(CustomContainer):
         container=Services,
         objects_r=objects,
     )
+    fuzzy_index = Singleton(
+        FuzzyIndex,
+        containers=[Items, Objects],
+    )
     command_object = Singleton(
         CommandObjectResolver,
         player=Globals.player(),
         items_r=items,
         objects_r=objects,
+        fuzzy_index=fuzzy_index,
+    )
+    autocomplete = Singleton(
+        Autocomplete,
+        player=Globals.player(),
+        config=Config,
+    )
+    vocabulary = Singleton(
+        Vocabulary,
+        containers=[Items, Objects],
+        config=Config,
+        fuzzy_index=fuzzy_index,
     )
@@ -0,0 +1,391 @@
+"""Declarative content: a ship described as data, compiled into a content pack
+with precomputed resolver indexes and dispatch tables, and loaded from the pack
+at startup. The source is JSON:
+
+    {
+        "start": "cabin",
+        "rooms": {
+            "cabin": {"name": "cabin", "exits": ["lab"], "objects": ["crate"]},
+            "lab": {"name": "lab", "exits": ["cabin"], "items": ["fuse"]}
+        },
+        "objects": {
+            "crate": {"kind": "locker", "name": "crate", "items": ["wrench"]}
+        },
+        "items": {
+            "wrench": {"kind": "supply", "name": "wrench"},
+            "fuse": {"kind": "supply", "name": "fuse", "references": ["spare fuse"]}
+        }
+    }
+
+Rooms, objects and items may have a "description", objects and items
+"references", and objects a "state". Every room has a door, found in the rooms
+with an exit to it.
+
+Usage: python -m src.content compile SOURCE PACK
+       python -m src.content generate [--rooms N] [--seed N] SOURCE
+"""
+import argparse
+import json
+import os
+import time
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from dependency_injector.providers import Singleton
+
+from src.config import Config
+from src.containers import CustomContainer
+from src.content_pack import ContentPack, export_content, write_pack
+from src.environment import Room
+from src.object.items import Supply
+from src.object.objects import Door, Locker
+from src.player import Player
+from src.worldgen import GeneratedWorld
+
+# The kinds of objects and items a source may use.
+OBJECT_KINDS = {"locker": Locker}
+ITEM_KINDS = {"supply": Supply}
+
+# The tables describing the world, next to those of export_content.
+START = "start"
+ROOMS = "rooms"
+ROOM_EXITS = "room.exits"
+ROOM_OBJECTS = "room.objects"
+ROOM_ITEMS = "room.items"
+OBJECTS = "objects"
+OBJECT_REFERENCES = "object.references"
+OBJECT_ITEMS = "object.items"
+ITEMS = "items"
+ITEM_REFERENCES = "item.references"
+STRUCTURE = [
+    START,
+    ROOMS,
+    ROOM_EXITS,
+    ROOM_OBJECTS,
+    ROOM_ITEMS,
+    OBJECTS,
+    OBJECT_REFERENCES,
+    OBJECT_ITEMS,
+    ITEMS,
+    ITEM_REFERENCES,
+]
+DESCRIPTIONS = [
+    "descriptions.items",
+    "descriptions.objects",
+    "descriptions.environments",
+]
+
+_FIELDS = {
+    "rooms": {"name", "description", "exits", "objects", "items"},
+    "objects": {"kind", "name", "description", "references", "state", "items"},
+    "items": {"kind", "name", "description", "references"},
+}
+
+
+def validate_content(source: dict) -> list[str]:
+    """Returns the problems of a source, or an empty list if it can be compiled."""
+    problems = []
+    unknown = set(source) - {"start", "rooms", "objects", "items"}
+    if unknown:
+        problems.append(f"unknown sections: {', '.join(sorted(unknown))}")
+    for section in ["rooms", "objects", "items"]:
+        if not isinstance(source.get(section, {}), dict):
+            problems.append(f"{section}: must be an object")
+    if problems:
+        return problems
+    rooms = source.get("rooms", {})
+    objects = source.get("objects", {})
+    items = source.get("items", {})
+    for section in ["rooms", "objects", "items"]:
+        for key, entry in source.get(section, {}).items():
+            where = f"{section}.{key}"
+            if not key.isidentifier() or key.startswith("_"):
+                problems.append(f"{where}: keys must be identifiers")
+            if not isinstance(entry, dict):
+                problems.append(f"{where}: must be an object")
+                continue
+            unknown = ", ".join(sorted(set(entry) - _FIELDS[section]))
+            if unknown:
+                problems.append(f"{where}: unknown fields {unknown}")
+            if not isinstance(entry.get("name"), str) or not entry["name"]:
+                problems.append(f"{where}: needs a name")
+            for field in ["kind", "description", "state"]:
+                if field in entry and not isinstance(entry[field], str):
+                    problems.append(f"{where}: {field} must be a string")
+            for field in ["exits", "objects", "items", "references"]:
+                values = entry.get(field, [])
+                if not isinstance(values, list) or not all(
+                    isinstance(value, str) for value in values
+                ):
+                    problems.append(f"{where}: {field} must be a list of strings")
+    if problems:
+        return problems
+
+    if not rooms:
+        problems.append("a world needs at least one room")
+    if source.get("start") not in rooms:
+        problems.append(f"start: unknown room {source.get('start')!r}")
+
+    kinds = {"objects": OBJECT_KINDS, "items": ITEM_KINDS}
+    for section, entries in [("objects", objects), ("items", items)]:
+        for key, entry in entries.items():
+            if entry.get("kind") not in kinds[section]:
+                problems.append(
+                    f"{section}.{key}: unknown kind {entry.get('kind')!r}, "
+                    f"expected one of {', '.join(kinds[section])}"
+                )
+            elif "state" in entry and entry["state"].upper() not in vars(
+                kinds[section][entry["kind"]].States
+            ):
+                problems.append(f"{section}.{key}: unknown state {entry['state']!r}")
+
+    placed: dict[str, str] = {}
+    for section, entries in [("rooms", rooms), ("objects", objects)]:
+        for key, entry in entries.items():
+            for field, targets in [("exits", rooms), ("objects", objects)]:
+                for target in entry.get(field, []):
+                    if target not in targets:
+                        problems.append(
+                            f"{section}.{key}: unknown {field[:-1]} {target!r}"
+                        )
+            for field in ["objects", "items"]:
+                for target in entry.get(field, []):
+                    if target in placed:
+                        problems.append(
+                            f"{section}.{key}: {target!r} is already in "
+                            f"{placed[target]}"
+                        )
+                    placed[target] = f"{section}.{key}"
+                    if field == "items" and target not in items:
+                        problems.append(f"{section}.{key}: unknown item {target!r}")
+
+    for key in rooms:
+        if _door(key) in objects:
+            problems.append(f"objects.{_door(key)}: the key of the door to {key}")
+    named = [(f"rooms.{key}", f"{room['name']} door") for key, room in rooms.items()]
+    named += [(f"objects.{key}", entry["name"]) for key, entry in objects.items()]
+    named += [(f"items.{key}", entry["name"]) for key, entry in items.items()]
+    names: dict[str, str] = {}
+    for where, name in named:
+        if name.casefold() in names:
+            taken = names[name.casefold()]
+            problems.append(f"{where}: the name {name!r} is taken by {taken}")
+        names[name.casefold()] = where
+    return problems
+
+
+def compile_content(source: dict) -> dict[str, Mapping]:
+    """Validates a source and returns the tables of its content pack: the
+    structure of the world, and the indexes and descriptions of export_content."""
+    problems = validate_content(source)
+    if problems:
+        raise ValueError("Invalid content:\n  " + "\n  ".join(problems))
+
+    rooms = source["rooms"]
+    objects = source.get("objects", {})
+    items = source.get("items", {})
+    tables: dict[str, dict] = {
+        START: {"room": [source["start"]]},
+        ROOMS: {key: [room["name"]] for key, room in rooms.items()},
+        ROOM_EXITS: {key: room.get("exits", []) for key, room in rooms.items()},
+        ROOM_OBJECTS: {key: room.get("objects", []) for key, room in rooms.items()},
+        ROOM_ITEMS: {key: room.get("items", []) for key, room in rooms.items()},
+        OBJECTS: {
+            key: [object_["kind"], object_["name"], object_.get("state", "")]
+            for key, object_ in objects.items()
+        },
+        OBJECT_REFERENCES: {
+            key: object_.get("references", []) for key, object_ in objects.items()
+        },
+        OBJECT_ITEMS: {
+            key: object_.get("items", []) for key, object_ in objects.items()
+        },
+        ITEMS: {key: [item["kind"], item["name"]] for key, item in items.items()},
+        ITEM_REFERENCES: {
+            key: item.get("references", []) for key, item in items.items()
+        },
+    }
+    for table, entries in zip(DESCRIPTIONS, [items, objects, rooms]):
+        tables[table] = {
+            key: [entry["description"]]
+            for key, entry in entries.items()
+            if "description" in entry
+        }
+
+    world = _build(tables)
+    return {**tables, **export_content(world.resolvers_c, world.containers)}
+
+
+def load_world(
+    pack: ContentPack,
+    player: Optional[Player] = None,
+    config: type[Config] = Config,
+) -> GeneratedWorld:
+    """Builds the world of a compiled content pack. Its descriptions and lookup
+    tables stay in the pack."""
+    tables = {
+        name: dict(pack.table(name).items()) for name in STRUCTURE + DESCRIPTIONS
+    }
+    return _build(tables, pack, player, config)
+
+
+def open_world(path: str, config: type[Config] = Config) -> GeneratedWorld:
+    """Builds the world of the compiled content pack at the given path."""
+    return load_world(ContentPack(path), config=config)
+
+
+def export_source(world: GeneratedWorld) -> dict:
+    """Returns the source of a world built from doors, lockers and supplies, such
+    as a generated one."""
+    keys = {
+        id(provider()): key
+        for container in world.containers.values()
+        for key, provider in container.members().items()
+    }
+    source = {"start": keys[id(world.player.environment)], "rooms": {}}
+    for key, provider in world.environments_c.members().items():
+        room = provider()
+        source["rooms"][key] = {
+            "name": room.name,
+            "description": room.description,
+            "exits": [o.destination for o in room.objects if isinstance(o, Door)],
+            "objects": [keys[id(o)] for o in room.objects if not isinstance(o, Door)],
+            "items": [keys[id(item)] for item in room.items],
+        }
+    kinds = {cls: kind for kind, cls in {**OBJECT_KINDS, **ITEM_KINDS}.items()}
+    source["objects"] = {}
+    for key, provider in world.objects_c.members().items():
+        object_ = provider()
+        if isinstance(object_, Door):
+            continue
+        states = {id(value): name for name, value in vars(object_.States).items()}
+        source["objects"][key] = {
+            "kind": kinds[type(object_)],
+            "name": object_.name,
+            "description": object_.description,
+            "references": object_._references,
+            "state": states[id(object_.state)].lower(),
+            "items": [keys[id(item)] for item in object_.items],
+        }
+    source["items"] = {
+        key: {
+            "kind": kinds[type(item)],
+            "name": item.name,
+            "description": item.description,
+            "references": item._references,
+        }
+        for key, item in ((key, p()) for key, p in world.items_c.members().items())
+    }
+    return source
+
+
+def _build(
+    tables: Mapping[str, Mapping],
+    pack: Optional[ContentPack] = None,
+    player: Optional[Player] = None,
+    config: type[Config] = Config,
+) -> GeneratedWorld:
+    item_descriptions, object_descriptions, room_descriptions = (
+        tables[name] for name in DESCRIPTIONS
+    )
+    items = {}
+    for key in tables[ITEMS]:
+        kind, name = tables[ITEMS][key]
+        items[key] = Singleton(
+            ITEM_KINDS[kind],
+            name=name,
+            description=_text(item_descriptions, key),
+            references=list(tables[ITEM_REFERENCES][key]) or None,
+        )
+    items_c = _container("ContentItems", items)
+
+    objects = {}
+    for key in tables[ROOMS]:
+        (name,) = tables[ROOMS][key]
+        objects[_door(key)] = Singleton(Door, room_name=name, destination=key)
+    for key in tables[OBJECTS]:
+        kind, name, state = tables[OBJECTS][key]
+        cls = OBJECT_KINDS[kind]
+        objects[key] = Singleton(
+            cls,
+            name=name,
+            items=[getattr(items_c, item)() for item in tables[OBJECT_ITEMS][key]],
+            description=_text(object_descriptions, key),
+            references=list(tables[OBJECT_REFERENCES][key]) or None,
+            state=getattr(cls.States, state.upper()) if state else None,
+        )
+    objects_c = _container("ContentObjects", objects)
+
+    environments = {}
+    for key in tables[ROOMS]:
+        (name,) = tables[ROOMS][key]
+        keys = [_door(exit_) for exit_ in tables[ROOM_EXITS][key]]
+        keys += tables[ROOM_OBJECTS][key]
+        environments[key] = Singleton(
+            Room,
+            name=name,
+            objects=[getattr(objects_c, object_)() for object_ in keys],
+            items=[getattr(items_c, item)() for item in tables[ROOM_ITEMS][key]],
+            description=_text(room_descriptions, key),
+        )
+    environments_c = _container("ContentEnvironments", environments)
+
+    player = player or Player()
+    player.environment = getattr(environments_c, tables[START]["room"][0])()
+    return GeneratedWorld(player, items_c, objects_c, environments_c, pack, config)
+
+
+def _door(room: str) -> str:
+    return f"{room}_door"
+
+
+def _text(table: Mapping, key: str) -> Optional[str]:
+    values = table.get(key)
+    return values[0] if values else None
+
+
+def _container(name: str, providers: dict[str, Any]) -> type[CustomContainer]:
+    return type(CustomContainer)(name, (CustomContainer,), providers)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_ = commands.add_parser("compile", help="Compile a source into a pack.")
+    compile_.add_argument("source")
+    compile_.add_argument("pack")
+    generate = commands.add_parser("generate", help="Write a generated source.")
+    generate.add_argument("source")
+    generate.add_argument("--rooms", type=int, default=1000)
+    generate.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.command == "generate":
+        from src.worldgen import generate_world
+
+        source = export_source(generate_world(args.rooms, args.seed))
+        with open(args.source, "w") as file:
+            json.dump(source, file, indent=1)
+        print(f"wrote {len(source['rooms'])} rooms to {args.source}")
+        return
+
+    with open(args.source) as file:
+        source = json.load(file)
+    try:
+        tables = compile_content(source)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    write_pack(args.pack, tables)
+    print(
+        f"compiled {len(tables[ROOMS])} rooms, {len(tables[OBJECTS])} objects and "
+        f"{len(tables[ITEMS])} items into {args.pack} "
+        f"({os.path.getsize(args.pack) / 1024:.0f} KiB) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
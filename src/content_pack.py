@@ -0,0 +1,389 @@
+"""Content packs: the immutable text and lookup tables of a world in a single
+read-only file. Every worker process maps the same file, so the tables are kept
+once by the page cache instead of once per process, and only the state of the
+sessions is private.
+
+Usage: python -m src.content_pack [--workers 1,32] [--rooms N] [--sessions N]
+"""
+import argparse
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from collections.abc import Mapping
+from functools import partial
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    from src.containers import CustomContainer
+
+MAGIC = b"TGCP"
+VERSION = 1
+
+# The tables of the resolvers.
+NOUNS = "nouns"
+TRIGRAMS = "trigrams"
+WORDS = "words"
+
+# The instance attributes naming the table and the key of its shared content.
+CONTENT_TABLE = "_content_table"
+CONTENT_KEY = "_content_key"
+
+# magic, version, amount of tables
+_HEADER = struct.Struct("<4sII")
+# name offset, name length, entries offset, amount of entries
+_TABLE = struct.Struct("<IIII")
+# key offset, key length, values offset, amount of values
+_ENTRY = struct.Struct("<IIII")
+# value offset, value length
+_VALUE = struct.Struct("<II")
+
+
+class PackTable(Mapping):
+    """
+    A table of a content pack: a read-only mapping of strings to lists of strings.
+    Nothing is kept in memory; the keys are binary searched in the mapped file
+    and the values are decoded on every lookup.
+    """
+
+    def __init__(self, buffer: mmap.mmap, offset: int, size: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._size):
+            key_offset, key_length, _, _ = self._entry(index)
+            yield self._buffer[key_offset : key_offset + key_length].decode()
+
+    def __contains__(self, key: object):
+        return isinstance(key, str) and self._find(key.encode()) is not None
+
+    def __getitem__(self, key: str) -> list[str]:
+        index = self._find(key.encode())
+        if index is None:
+            raise KeyError(key)
+        return [bytes(view).decode() for view in self._views(index)]
+
+    def items(self) -> Iterator[tuple[str, list[str]]]:
+        """Yields the keys and their values in key order, reading the table
+        sequentially instead of searching every key."""
+        for index in range(self._size):
+            key_offset, key_length, _, _ = self._entry(index)
+            key = self._buffer[key_offset : key_offset + key_length].decode()
+            yield key, [bytes(view).decode() for view in self._views(index)]
+
+    def text(self, key: str) -> Optional[str]:
+        """Returns the first value of the key, or None for unknown keys."""
+        view = self.view(key)
+        return None if view is None else str(view, "utf-8")
+
+    def view(self, key: str) -> Optional[memoryview]:
+        """Returns the first value of the key without copying it out of the pack,
+        or None for unknown keys."""
+        index = self._find(key.encode())
+        if index is None:
+            return None
+        return next(self._views(index), None)
+
+    def _entry(self, index: int) -> tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._buffer, self._offset + index * _ENTRY.size)
+
+    def _find(self, key: bytes) -> Optional[int]:
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, _, _ = self._entry(middle)
+            probe = self._buffer[key_offset : key_offset + key_length]
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _views(self, index: int) -> Iterator[memoryview]:
+        _, _, values_offset, values = self._entry(index)
+        buffer = memoryview(self._buffer)
+        for value in range(values):
+            offset, length = _VALUE.unpack_from(
+                self._buffer, values_offset + value * _VALUE.size
+            )
+            yield buffer[offset : offset + length]
+
+
+class ContentPack:
+    """
+    A content pack mapped read-only into memory. The operating system keeps a
+    single copy of the file for all processes mapping it.
+
+    Attributes:
+    -----------
+    path : str
+        The file of the pack.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, tables = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a content pack: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported content pack version: {version}")
+        self._tables: dict[str, PackTable] = {}
+        for index in range(tables):
+            name_offset, name_length, offset, size = _TABLE.unpack_from(
+                self._buffer, _HEADER.size + index * _TABLE.size
+            )
+            name = self._buffer[name_offset : name_offset + name_length].decode()
+            self._tables[name] = PackTable(self._buffer, offset, size)
+
+    def __repr__(self):
+        return f"<ContentPack {self.path} tables={len(self._tables)}>"
+
+    @property
+    def tables(self) -> list[str]:
+        return list(self._tables)
+
+    def table(self, name: str) -> PackTable:
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise ValueError(f"The content pack has no table {name!r}") from None
+
+    def close(self) -> None:
+        self._tables = {}
+        self._buffer.close()
+
+    def __enter__(self) -> "ContentPack":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PackedText:
+    """
+    An attribute of shared instances read from their content pack table on
+    every access, so the instances don't keep the text themselves. Instances
+    that aren't shared keep their own value, or use the class's.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the attribute.
+    default : Any
+        The value of the class, before it was replaced by this descriptor.
+    """
+
+    def __init__(self, name: str, default: Any = None):
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self.default
+        values = instance.__dict__
+        if self.name in values:
+            return values[self.name]
+        table = values.get(CONTENT_TABLE)
+        if table is None:
+            return self.default
+        return table.text(values[CONTENT_KEY])
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+
+def write_pack(path: str, tables: dict[str, Mapping]) -> None:
+    """Writes the tables, mapping strings to lists of strings, as a content pack.
+    Equal strings are only stored once. The pack is replaced atomically."""
+    heap = bytearray()
+    strings: dict[bytes, int] = {}
+    entries = sum(len(table) for table in tables.values())
+    values = sum(len(value) for table in tables.values() for value in table.values())
+    heap_offset = (
+        _HEADER.size
+        + len(tables) * _TABLE.size
+        + entries * _ENTRY.size
+        + values * _VALUE.size
+    )
+
+    def string(value: str) -> tuple[int, int]:
+        encoded = value.encode()
+        if encoded not in strings:
+            strings[encoded] = heap_offset + len(heap)
+            heap.extend(encoded)
+        return strings[encoded], len(encoded)
+
+    directory = bytearray()
+    index = bytearray()
+    value_index = bytearray()
+    entries_offset = _HEADER.size + len(tables) * _TABLE.size
+    values_offset = entries_offset + entries * _ENTRY.size
+    for name, table in tables.items():
+        directory += _TABLE.pack(
+            *string(name), entries_offset + len(index), len(table)
+        )
+        for key in sorted(table, key=str.encode):
+            table_values = table[key]
+            index += _ENTRY.pack(
+                *string(key), values_offset + len(value_index), len(table_values)
+            )
+            for value in table_values:
+                value_index += _VALUE.pack(*string(value))
+
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(tables)))
+        file.write(directory)
+        file.write(index)
+        file.write(value_index)
+        file.write(heap)
+    os.replace(f"{path}.tmp", path)
+
+
+def export_content(
+    resolvers_c: type["CustomContainer"],
+    containers: dict[str, type["CustomContainer"]],
+) -> dict[str, Mapping]:
+    """Returns the tables of a world: the indexes of its resolvers, the lookup
+    tables of its vocabulary and fuzzy index, and per container the descriptions
+    of its instances."""
+    tables = {
+        **resolvers_c.items().export(),
+        **resolvers_c.objects().export(),
+        **resolvers_c.services().export(),
+        **resolvers_c.vocabulary().export(),
+        **resolvers_c.fuzzy_index().export(),
+    }
+    for name, container in containers.items():
+        descriptions = {}
+        for key, provider in container.members().items():
+            instance = provider()
+            if isinstance(getattr(type(instance), "description", None), property):
+                continue
+            if isinstance(instance.description, str):
+                descriptions[key] = [instance.description]
+        tables[f"descriptions.{name}"] = descriptions
+    return tables
+
+
+def share_content(
+    pack: ContentPack,
+    containers: dict[str, type["CustomContainer"]],
+    resolvers_c: Optional[type["CustomContainer"]] = None,
+) -> int:
+    """Makes the instances of the containers read their descriptions from the
+    pack, and drops their own copies. Instances whose description differs from
+    the pack's keep theirs. The vocabulary and fuzzy index of the resolvers, if
+    given, are rebuilt on the pack. Returns the amount of shared descriptions."""
+    if resolvers_c is not None:
+        for resolver in (resolvers_c.fuzzy_index(), resolvers_c.vocabulary()):
+            resolver.pack = pack
+            resolver.rebuild()
+    shared = 0
+    for name, container in containers.items():
+        table = pack.table(f"descriptions.{name}")
+        members = container.members()
+        for key, (description,) in table.items():
+            if key not in members:
+                continue
+            instance = members[key]()
+            cls = type(instance)
+            if isinstance(getattr(cls, "description", None), property):
+                continue
+            if instance.description != description:
+                continue
+            if not isinstance(cls.__dict__.get("description"), PackedText):
+                # Set on the class of every instance, as subclasses of a class
+                # with the descriptor may define their own description.
+                cls.description = PackedText(
+                    "description", getattr(cls, "description", None)
+                )
+            instance.__dict__.pop("description", None)
+            setattr(instance, CONTENT_TABLE, table)
+            setattr(instance, CONTENT_KEY, key)
+            shared += 1
+    return shared
+
+
+def proportional_set_size(pid: int) -> int:
+    """Returns the memory of a process in bytes, counting the pages it shares
+    with other processes in proportion. Falls back to the resident set size."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            for line in file:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    with open(f"/proc/{pid}/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure_memory(
+    workers: int, rooms: int, sessions: int, pack: Optional[str] = None
+) -> int:
+    """Returns the total memory of the workers of a session host running a
+    generated world, with or without a content pack, after every session played
+    a turn and looked up a typo."""
+    from src.bench.load_generator import create_target
+    from src.session_host import SessionHost
+
+    factory = partial(create_target, max_sessions=sessions, rooms=rooms, pack=pack)
+    with SessionHost(factory, workers) as host:
+        session_ids = [f"player-{i}" for i in range(sessions)]
+        for line in ["inspect", "inspect lokcer 1"]:
+            futures = [host.submit(session_id, line) for session_id in session_ids]
+            for future in futures:
+                future.result()
+        return sum(proportional_set_size(pid) for pid in host.pids)
+
+
+def _write_world_pack(path: str, rooms: int) -> None:
+    from src.worldgen import generate_world
+
+    world = generate_world(rooms)
+    write_pack(path, export_content(world.resolvers_c, world.containers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,32")
+    parser.add_argument("--rooms", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=64)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        path = os.path.join(directory, "world.pack")
+        # Built in a child process, so the workers don't inherit the world.
+        process = multiprocessing.Process(
+            target=_write_world_pack, args=(path, args.rooms)
+        )
+        process.start()
+        process.join()
+        print(
+            f"pack: {os.path.getsize(path) / 2**20:.1f} MiB "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        for workers in sorted({int(n) for n in args.workers.split(",")}):
+            private = measure_memory(workers, args.rooms, args.sessions)
+            shared = measure_memory(workers, args.rooms, args.sessions, path)
+            print(
+                f"{workers:>3} workers: {private / 2**20:>8.1f} MiB without pack, "
+                f"{shared / 2**20:>8.1f} MiB with pack, "
+                f"{(private - shared) / 2**20:>8.1f} MiB saved"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,11 @@ import logging
 from typing import TYPE_CHECKING, Union, Optional
 
 from src.enums import PlayerAction
-from src.command import Command
+from src.command import Command, CommandChain
 from src.environment import Environment
+from src.metrics import engine_metrics
+from src.outcome import GameOver
+from src.tracing import tracer
 from src.utils import subclass_in_list
 from src.object.base import Item
 
@@ -25,6 +28,7 @@ class Engine:
     resolvers_c: type["Resolvers"]
     command_validator: "CommandValidator"
     config: type["Config"]
+    _output: list[str]
 
     def __new__(
         cls,
@@ -43,6 +47,7 @@ class Engine:
         cls.resolvers_c = resolvers_c
         cls.config = config
         cls.command_validator = command_validator
+        cls._output = []
         return super().__new__(cls)
 
     @classmethod
@@ -52,15 +57,36 @@ class Engine:
 
     @classmethod
     def _execute_command(cls) -> Optional[bool]:
-        try:
-            command = cls._get_command()
-        except Exception as e:
-            cls._print(e)
-            return
+        finished = cls.execute(cls._ask_input())
+        cls._flush()
+        return finished
 
-        if not command:
-            return
+    @classmethod
+    def execute(cls, user_input: str) -> Optional[bool]:
+        """Executes a line of user input, which may chain several commands. Stops at
+        the first invalid command. Returns True when the game is finished. Output
+        is buffered until it is drained."""
+        engine_metrics.turns.inc()
+        chain = CommandChain(user_input, cls.config.max_chained_commands)
+        for part in chain:
+            try:
+                command = cls._get_command(chain.resolve_pronouns(part))
+                if not command:
+                    return
+
+                chain.previous_object_str = (
+                    command.object_str or chain.previous_object_str
+                )
+                finished = cls._execute(command)
+            except Exception:
+                logging.exception("Turn failed. Trace:\n%s", tracer.dump())
+                raise
+            if finished:
+                return True
 
+    @classmethod
+    def _execute(cls, command: "Command") -> Optional[bool]:
+        engine_metrics.commands.inc(str(command.action))
         if command.action is PlayerAction.QUIT:
             return True
 
@@ -68,11 +94,61 @@ class Engine:
             return cls._print_help()
 
         service = cls._get_service(command)
-        logging.debug(f"Service: {type(service)}")
+        tracer.event("service", type(service).__name__)
+        engine_metrics.service_dispatches.inc(type(service).__name__)
 
-        response = service.interact(command)
+        response = cls._interact(service, command)
+        if isinstance(response, GameOver):
+            return cls._game_over(response)
         cls._print(response)
 
+    @classmethod
+    def _game_over(cls, game_over: GameOver) -> bool:
+        tracer.event("game over", game_over.outcome)
+        engine_metrics.game_overs.inc(str(game_over.outcome))
+        cls._print(game_over.text)
+        return True
+
+    @classmethod
+    def try_command(
+        cls, user_input: Union[str, "Command"]
+    ) -> Optional[Union[str, GameOver]]:
+        """Executes a single command and returns the service's response instead of
+        printing it. Returns None when the command is invalid. Takes a line of
+        user input, or a command from `prepare_command`, which is only validated.
+        Used by tools that explore the game, see src.solver."""
+        if isinstance(user_input, str):
+            command = cls._get_command(user_input)
+        else:
+            command = user_input if cls._validate(user_input) else None
+        if not command:
+            return
+        return cls._interact(cls._get_service(command), command)
+
+    @classmethod
+    def prepare_command(cls, user_input: str) -> Optional["Command"]:
+        """Parses and resolves a line of user input, so the command can be tried in
+        many states. Names that aren't exact are resolved among the objects in
+        scope, so the command holds for the scope it was prepared in. Returns
+        None when the input is rejected. Services may change the command, so try
+        a copy."""
+        command = cls._parse(user_input)
+        if not command:
+            return
+        return cls._resolve(command)
+
+    @classmethod
+    def complete(cls, partial_input: str) -> list[str]:
+        """Returns the possible completions of a partial line of user input."""
+        return cls.resolvers_c.autocomplete().complete(partial_input)
+
+    @classmethod
+    def drain_output(cls) -> str:
+        """Returns the buffered output and clears the buffer."""
+        output = "\n".join(cls._output)
+        cls._output.clear()
+        return output
+
     @classmethod
     def _get_service(cls, command: "Command") -> Optional["Service"]:
         service = cls.resolvers_c.services().resolve(command.object)
@@ -83,28 +159,70 @@ class Engine:
         return cls.services_c.generic_service()
 
     @classmethod
-    def _get_command(cls) -> Optional["Command"]:
-        user_input = cls._ask_input()
+    def _get_command(cls, user_input: str) -> Optional["Command"]:
         if not user_input:
             return
 
-        command = Command(user_input)
-        cls.command_validator.validate(command)
+        command = cls._parse(user_input)
+        if not command or not cls._validate(command):
+            return
 
-        command = cls.resolvers_c.command_object().resolve_command(command)
-        logging.debug(f"Command: {vars(command)}")
+        command = cls._resolve(command)
+        tracer.event(
+            "command",
+            command.action,
+            command.object,
+            command.preposition,
+            command.preposition_object,
+        )
 
         return command
 
+    # The stages of a turn are separate methods so they can be timed, see
+    # src.instrumentation.
+
+    @classmethod
+    def _parse(cls, user_input: str) -> Optional["Command"]:
+        rejected = cls.resolvers_c.vocabulary().reject(user_input)
+        if rejected:
+            engine_metrics.validation_failures.inc(str(rejected.error))
+            cls._print(rejected.message)
+            return
+
+        return Command(user_input, cls.config.lexicon)
+
+    @classmethod
+    def _validate(cls, command: "Command") -> bool:
+        result = cls.command_validator.check(command)
+        if not result.ok:
+            engine_metrics.validation_failures.inc(str(result.error))
+            cls._print(result.message)
+        return result.ok
+
+    @classmethod
+    def _resolve(cls, command: "Command") -> "Command":
+        return cls.resolvers_c.command_object().resolve_command(command)
+
+    @classmethod
+    def _interact(
+        cls, service: "Service", command: "Command"
+    ) -> Union[str, GameOver]:
+        return service.interact(command)
+
     @classmethod
     def _print(cls, msg: Union[str, Exception]) -> None:
         if isinstance(msg, Exception):
             msg = str(msg)
-        print(msg)
+        cls._output.append(msg)
+
+    @classmethod
+    def _flush(cls) -> None:
+        if cls._output:
+            print(cls.drain_output())
 
     @classmethod
     def _print_help(cls) -> None:
-        print("Help text")
+        cls._print("Help text")
 
     @classmethod
     def _inspect(cls, command: "Command") -> None:
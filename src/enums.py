@@ -56,3 +56,21 @@ class UsageFormat(CustomEnum):
     OBJECT = enum.auto()
     PREPOSITION = enum.auto()
     PREPOSITION_OBJECT = enum.auto()
+
+
+class GameOutcome(CustomEnum):
+    WIN = enum.auto()
+    DEATH = enum.auto()
+
+
+class CommandError(CustomEnum):
+    ACTION_NOT_RECOGNIZED = enum.auto()
+    OBJECT_REQUIRED = enum.auto()
+    OBJECT_NOT_FOUND = enum.auto()
+    ACTION_NOT_APPLICABLE = enum.auto()
+    PREPOSITION_REQUIRED = enum.auto()
+    PREPOSITION_NOT_RECOGNIZED = enum.auto()
+    PREPOSITION_NOT_APPLICABLE = enum.auto()
+    PREPOSITION_OBJECT_REQUIRED = enum.auto()
+    PREPOSITION_OBJECT_NOT_FOUND = enum.auto()
+    INVALID_USAGE = enum.auto()
@@ -1,13 +1,15 @@
 from typing import TYPE_CHECKING
 
+from src.events import Publisher
 
 if TYPE_CHECKING:
     from src.object.base import Item, Object
 
 
-class Environment:
+class Environment(Publisher):
     """
     An environment is a place in the game universe that contains objects and items.
+    Publishes the changes of its contents.
 
     Attributes:
     -----------
@@ -22,6 +24,8 @@ class Environment:
     objects: list["Object"]
     items: list["Item"]
 
+    _published = ("objects", "items")
+
     def __init__(self, objects: list[type["Object"]], items: list[type["Item"]] = None):
         self.objects = objects or []
         self.items = items or []
@@ -110,3 +114,18 @@ class Canteen(Environment):
 class Outside(Environment):
     name = "outside"
     description = "You are floating around the ship."
+
+
+class Room(Environment):
+    """A room of a generated world, named when it is generated."""
+
+    def __init__(
+        self,
+        name: str,
+        objects: list[type["Object"]],
+        items: list[type["Item"]] = None,
+        description: str = None,
+    ):
+        super().__init__(objects, items)
+        self.name = name
+        self.description = description or f"You are in the {name}."
@@ -0,0 +1,159 @@
+"""Change events of the world. Objects, the player and environments publish an
+event whenever one of their published attributes is assigned or, for lists,
+changed in place. Subscribers use them to keep facts derived from the world up to
+date instead of recomputing them on every query.
+"""
+from typing import Any, Callable, Iterable, Optional
+
+# Called with the subject that changed and the name of the changed attribute.
+Subscriber = Callable[[Any, str], None]
+
+
+class EventBus:
+    """
+    Delivers change events to the subscribers of their subject and to those of
+    every subject. The subscribers of a subject are kept on the subject, so they
+    live as long as it does and subjects nobody listens to don't publish, see
+    `Publisher`.
+    """
+
+    def __init__(self):
+        self._listeners: tuple[Subscriber, ...] = ()
+
+    def subscribe(self, callback: Subscriber, subject: Optional[Any] = None) -> None:
+        """Subscribes to the changes of a subject, or of all subjects."""
+        if subject is None:
+            self._listeners += (callback,)
+            return
+        subscribers = subject._subscribers + (callback,)
+        object.__setattr__(subject, "_subscribers", subscribers)
+        for name in subject._published:
+            value = subject.__dict__.get(name)
+            if isinstance(value, list) and not _publishes(value, subject, name):
+                object.__setattr__(subject, name, PublishedList(value, subject, name))
+
+    def unsubscribe(self, callback: Subscriber, subject: Optional[Any] = None) -> None:
+        if subject is None:
+            self._listeners = tuple(c for c in self._listeners if c != callback)
+            return
+        subscribers = tuple(c for c in subject._subscribers if c != callback)
+        object.__setattr__(subject, "_subscribers", subscribers)
+
+    def publish(self, subject: Any, name: str) -> None:
+        for callback in subject._subscribers:
+            callback(subject, name)
+        for callback in self._listeners:
+            callback(subject, name)
+
+
+events = EventBus()
+
+
+class Publisher:
+    """
+    Publishes a change event whenever one of its published attributes is
+    assigned, unless it is assigned the value it already holds, as `+=` does
+    after changing a list in place. Reading the attributes costs nothing extra,
+    and nothing is published while nobody subscribes to the publisher or to
+    every subject.
+
+    Lists held by the attributes of a subscribed publisher are copied into a
+    `PublishedList`, so changing the attribute in place publishes too. The
+    attribute is then the copy: changes to the list it was given don't reach
+    it. Listeners of every subject only see the in-place changes of publishers
+    with subscribers of their own.
+
+    Attributes:
+    -----------
+    _published : tuple[str, ...]
+        The names of the published attributes.
+    _subscribers : tuple[Subscriber, ...]
+        The subscribers to the changes of this subject, see `EventBus`.
+    """
+
+    _published: tuple[str, ...] = ()
+    _subscribers: tuple[Subscriber, ...] = ()
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in self._published or not (
+            self._subscribers or events._listeners
+        ):
+            object.__setattr__(self, name, value)
+            return
+        if self.__dict__.get(name, self) is value:
+            # Unchanged, or a list changed in place and assigned back by `+=`.
+            return
+        if isinstance(value, list) and self._subscribers:
+            value = PublishedList(value, self, name)
+        object.__setattr__(self, name, value)
+        events.publish(self, name)
+
+
+def _publishes(value: list, subject: Publisher, name: str) -> bool:
+    return (
+        isinstance(value, PublishedList)
+        and value._subject is subject
+        and value._name == name
+    )
+
+
+class PublishedList(list):
+    """A list attribute of a publisher, publishing its changes. Copies are plain
+    lists."""
+
+    def __init__(self, iterable: Iterable, subject: Publisher, name: str):
+        super().__init__(iterable)
+        self._subject = subject
+        self._name = name
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def _publish(self) -> None:
+        events.publish(self._subject, self._name)
+
+    def append(self, value: Any) -> None:
+        super().append(value)
+        self._publish()
+
+    def extend(self, iterable: Iterable) -> None:
+        super().extend(iterable)
+        self._publish()
+
+    def insert(self, index: int, value: Any) -> None:
+        super().insert(index, value)
+        self._publish()
+
+    def remove(self, value: Any) -> None:
+        super().remove(value)
+        self._publish()
+
+    def pop(self, index: int = -1) -> Any:
+        value = super().pop(index)
+        self._publish()
+        return value
+
+    def clear(self) -> None:
+        super().clear()
+        self._publish()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._publish()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._publish()
+
+    def __iadd__(self, iterable: Iterable) -> "PublishedList":
+        super().__iadd__(iterable)
+        self._publish()
+        return self
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._publish()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._publish()
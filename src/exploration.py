@@ -0,0 +1,333 @@
+"""Explores every reachable state of the game on all cores and reports dead ends,
+unreachable objects and whether the game can be won. Meant as a content gate
+before a release: exits with 1 when the game can't be won. An exploration cut
+short by --max-states can't tell, and doesn't fail.
+
+Usage: python -m src.exploration [--workers N] [--max-states N] [--rooms N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Optional
+
+from src.enums import GameOutcome
+from src.outcome import GameOver
+from src.solver import Solver, digest, encode
+
+if TYPE_CHECKING:
+    from src.core import Engine
+    from src.state import WorldState
+
+# The most states a worker expands per task.
+BATCH_SIZE = 256
+
+_solver: Optional[Solver] = None
+
+
+class ExplorationReport:
+    """
+    What the exploration found.
+
+    Attributes:
+    -----------
+    states : int
+        The amount of distinct states reached.
+    complete : bool
+        Whether every reachable state was explored. The other findings only
+        cover the explored states otherwise.
+    winnable : Optional[bool]
+        Whether a win can be reached from the start, or None when no win was
+        found and the exploration is incomplete.
+    shortest_win : Optional[list[str]]
+        The commands of a shortest win.
+    dead_ends : Optional[int]
+        The states from which the game can no longer be won, or None when the
+        exploration is incomplete.
+    points_of_no_return : list[tuple[list[str], str]]
+        Per command leading into a dead end from a winnable state, the commands
+        reaching that winnable state the fastest, and the command. Empty when
+        the exploration is incomplete.
+    deaths : Counter[str]
+        The commands ending the game in a death, with how many states they did so
+        from.
+    unreachable : list[str]
+        The objects and items that are never in the player's scope, as
+        "container.key".
+    seconds : float
+        How long the exploration took.
+    """
+
+    def __init__(self):
+        self.states = 0
+        self.complete = False
+        self.winnable: Optional[bool] = None
+        self.shortest_win: Optional[list[str]] = None
+        self.dead_ends: Optional[int] = None
+        self.points_of_no_return: list[tuple[list[str], str]] = []
+        self.deaths: Counter[str] = Counter()
+        self.unreachable: list[str] = []
+        self.seconds = 0.0
+
+    def format(self) -> str:
+        winnable = "unknown" if self.winnable is None else self.winnable
+        dead_ends = "unknown" if self.dead_ends is None else self.dead_ends
+        lines = [
+            f"states: {self.states}{'' if self.complete else ' (incomplete)'}",
+            f"winnable: {winnable}"
+            + (f" in {len(self.shortest_win)} commands" if self.shortest_win else ""),
+            f"dead ends: {dead_ends}",
+        ]
+        for path, command in self.points_of_no_return:
+            lines.append(f"  no return: {command!r} after {len(path)} commands")
+        for command, count in self.deaths.most_common():
+            lines.append(f"  death: {command!r} from {count} states")
+        lines.append(f"unreachable: {', '.join(self.unreachable) or 'none'}")
+        lines.append(f"{self.seconds:.1f}s")
+        return "\n".join(lines)
+
+
+class Explorer:
+    """
+    Breadth-first exploration of the reachable states, level by level. The
+    frontier of a level is expanded by the process pool in batches, and the new
+    states a batch discovers are sent back to the coordinator, which keeps the
+    visited set and builds the next frontier.
+
+    The coordinator keeps one parent pointer per state and the edges between
+    states, so it can tell which states can still reach a win afterwards.
+
+    Attributes:
+    -----------
+    world : Callable[[], tuple[Engine, WorldState]]
+        Builds the world in every worker, at its start state. Must be picklable.
+    workers : int
+        The amount of worker processes.
+    max_states : Optional[int]
+        Stops the exploration after reaching this amount of states.
+    """
+
+    def __init__(
+        self,
+        world: Callable[[], tuple["Engine", "WorldState"]],
+        workers: Optional[int] = None,
+        max_states: Optional[int] = None,
+    ):
+        self.world = world
+        self.workers = workers or os.cpu_count() or 1
+        self.max_states = max_states
+
+    def explore(self) -> ExplorationReport:
+        started = time.perf_counter()
+        report = ExplorationReport()
+        engine, world_state = self.world()
+        start = encode(world_state.capture())
+        start_digest = digest(start)
+        keys = {
+            f"{name}.{key}"
+            for name, container in (
+                ("objects", engine.objects_c),
+                ("items", engine.items_c),
+            )
+            for key in container.members()
+        }
+
+        visited = {start_digest}
+        parents: dict[bytes, Optional[tuple[bytes, str]]] = {start_digest: None}
+        children: dict[bytes, set[bytes]] = {}
+        wins: dict[bytes, str] = {}
+        in_scope: set[str] = set()
+        frontier: list[tuple[str, bytes]] = [(start, start_digest)]
+        limited = False
+
+        with ProcessPoolExecutor(
+            self.workers, initializer=_initialize, initargs=(self.world,)
+        ) as executor:
+            while frontier and not limited:
+                # Small levels are spread over every worker too.
+                size = min(BATCH_SIZE, -(-len(frontier) // self.workers))
+                batches = [
+                    frontier[i : i + size] for i in range(0, len(frontier), size)
+                ]
+                frontier = []
+                for result in executor.map(_expand_batch, batches):
+                    edges, new_states, scope = result
+                    in_scope |= scope
+                    for parent, command, child, outcome in edges:
+                        if outcome == str(GameOutcome.WIN):
+                            wins.setdefault(parent, command)
+                            continue
+                        if outcome is not None:
+                            report.deaths[command] += 1
+                            continue
+                        children.setdefault(parent, set()).add(child)
+                        if child in visited:
+                            continue
+                        if self.max_states and len(parents) >= self.max_states:
+                            limited = True
+                            continue
+                        visited.add(child)
+                        parents[child] = (parent, command)
+                        frontier.append((new_states[child], child))
+
+        report.states = len(parents)
+        report.complete = not limited
+        report.unreachable = sorted(keys - in_scope)
+        self._report_wins(report, start_digest, parents, children, wins)
+        report.seconds = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    def _report_wins(
+        report: ExplorationReport,
+        start: bytes,
+        parents: dict[bytes, Optional[tuple[bytes, str]]],
+        children: dict[bytes, set[bytes]],
+        wins: dict[bytes, str],
+    ) -> None:
+        """Finds the states that can reach a win by walking the edges backwards
+        from the states a win is one command away from. When the exploration is
+        incomplete, the states that can't are unknown: the unexplored states may
+        lead to a win."""
+        incoming: dict[bytes, list[bytes]] = {}
+        for parent, targets in children.items():
+            for child in targets:
+                incoming.setdefault(child, []).append(parent)
+        winnable = set(wins)
+        queue = deque(wins)
+        while queue:
+            for parent in incoming.get(queue.popleft(), []):
+                if parent not in winnable:
+                    winnable.add(parent)
+                    queue.append(parent)
+
+        if wins:
+            # Breadth-first, so the win found from the closest state is shortest.
+            closest = min(wins, key=lambda state: len(_path(parents, state)))
+            report.shortest_win = _path(parents, closest) + [wins[closest]]
+        if start in winnable:
+            report.winnable = True
+        elif report.complete:
+            report.winnable = False
+        if not report.complete:
+            return
+        report.dead_ends = len(parents) - len(winnable)
+
+        fatal: dict[str, tuple[list[str], str]] = {}
+        for child, parent_command in parents.items():
+            if parent_command is None or child in winnable:
+                continue
+            parent, command = parent_command
+            if parent in winnable and command not in fatal:
+                fatal[command] = (_path(parents, parent), command)
+        report.points_of_no_return = sorted(
+            fatal.values(), key=lambda item: (len(item[0]), item[1])
+        )
+
+
+def shipped_world() -> tuple["Engine", "WorldState"]:
+    """The shipped ship at the start of a new game."""
+    from src.bench.playthroughs import new_game
+    from src.command import CommandValidator
+    from src.config import Config
+    from src.containers import (
+        Effects,
+        Environments,
+        Globals,
+        Items,
+        Objects,
+        Resolvers,
+        Services,
+    )
+    from src.core import Engine
+    from src.state import WorldState
+
+    player = Globals.player()
+    new_game(player)
+    engine = Engine(
+        player=player,
+        items_c=Items,
+        objects_c=Objects,
+        services_c=Services,
+        resolvers_c=Resolvers,
+        command_validator=CommandValidator(
+            player=player,
+            command_object_r=Resolvers.command_object(),
+            config=Config,
+        ),
+        config=Config,
+    )
+    return engine, WorldState(player, Effects, Items, Objects, Environments)
+
+
+def generated_world(rooms: int, seed: int = 0) -> tuple["Engine", "WorldState"]:
+    """A generated ship, see src.worldgen."""
+    from src.worldgen import generate_world
+
+    world = generate_world(rooms, seed)
+    return world.create_engine(), world.create_world_state()
+
+
+def _initialize(world: Callable[[], tuple["Engine", "WorldState"]]) -> None:
+    global _solver
+    _solver = Solver(*world())
+
+
+def _expand_batch(batch: list[tuple[str, bytes]]) -> tuple:
+    """Expands the states of a batch. Returns the edges as (parent, command, child,
+    outcome), the serialized new states by digest, and the objects and items
+    that were in scope."""
+    edges = []
+    new_states = {}
+    scope = set()
+    for serialized, state_digest in batch:
+        snapshot = json.loads(serialized)
+        environment = snapshot["environments"][snapshot["player"]["environment"]]
+        scope.update(f"objects.{key}" for key in environment["objects"])
+        scope.update(f"items.{key}" for key in environment["items"])
+        scope.update(f"items.{key}" for key in snapshot["player"]["inventory"])
+        for command, result in _solver.expand(serialized, state_digest):
+            if isinstance(result, GameOver):
+                edges.append((state_digest, command, None, str(result.outcome)))
+                continue
+            child, child_digest = result
+            if child_digest == state_digest:
+                continue
+            new_states.setdefault(child_digest, child)
+            edges.append((state_digest, command, child_digest, None))
+    return edges, new_states, scope
+
+
+def _path(parents: dict[bytes, Optional[tuple[bytes, str]]], state: bytes) -> list:
+    commands = []
+    while parents[state] is not None:
+        state, command = parents[state]
+        commands.append(command)
+    return commands[::-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--max-states", type=int)
+    parser.add_argument("--rooms", type=int, help="Explore a generated world.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    world = shipped_world
+    if args.rooms is not None:
+        world = partial(generated_world, args.rooms, args.seed)
+    report = Explorer(world, args.workers, max_states=args.max_states).explore()
+    print(report.format())
+    if args.rooms is None and report.winnable is False:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
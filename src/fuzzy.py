@@ -0,0 +1,234 @@
+import time
+from typing import TYPE_CHECKING, Any, Collection, Iterator, Mapping, Optional
+
+from src.content_pack import TRIGRAMS, WORDS
+
+if TYPE_CHECKING:
+    from src.containers import CustomContainer
+    from src.content_pack import ContentPack
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Returns the optimal string alignment distance between two strings: the
+    Levenshtein distance with adjacent transpositions counting as one edit.
+    Only the diagonal band that can stay within max_distance is computed, and
+    max_distance + 1 is returned as soon as the distance is certain to be larger."""
+    if a == b:
+        return 0
+    too_far = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return too_far
+
+    before = None
+    previous = [j if j <= max_distance else too_far for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= max_distance else too_far
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            char_b = b[j - 1]
+            distance = previous[j - 1] + (char_a != char_b)
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if current[j - 1] + 1 < distance:
+                distance = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                if before[j - 2] + 1 < distance:
+                    distance = before[j - 2] + 1
+            current[j] = distance if distance < too_far else too_far
+            if distance < row_min:
+                row_min = distance
+        if row_min > max_distance and min(previous) > max_distance:
+            return too_far
+        before, previous = previous, current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """
+    An inverted index of the trigrams of words. An edit changes at most four
+    trigrams of a word, an adjacent transposition being the worst case, so only
+    words sharing enough trigrams with the query are compared with it. An index
+    built on existing tables, such as those of a content pack, is read-only.
+
+    Attributes:
+    -----------
+    size : int
+        The amount of indexed words.
+    postings : Mapping[str, list[str]]
+        The words per trigram.
+    values : Mapping[str, list]
+        The values per word.
+    """
+
+    def __init__(
+        self,
+        postings: Optional[Mapping[str, list[str]]] = None,
+        values: Optional[Mapping[str, list]] = None,
+    ):
+        self.postings = {} if postings is None else postings
+        self.values = {} if values is None else values
+        self.size = len(self.values)
+
+    @staticmethod
+    def trigrams(word: str) -> set[str]:
+        padded = f"  {word} "
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, word: str, value: Any) -> None:
+        if word in self.values:
+            self.values[word].append(value)
+            return
+        self.values[word] = [value]
+        self.size += 1
+        for trigram in self.trigrams(word):
+            self.postings.setdefault(trigram, []).append(word)
+
+    def search(
+        self,
+        word: str,
+        max_distance: int,
+        max_candidates: int = 256,
+        deadline: Optional[float] = None,
+    ) -> list[tuple[int, str, list]]:
+        """Returns (distance, word, values) for the words within max_distance. Stops
+        early after comparing max_candidates words or passing the deadline."""
+        trigrams = self.trigrams(word)
+        required = len(trigrams) - 4 * max_distance
+
+        shared: dict[str, int] = {}
+        for trigram in trigrams:
+            for candidate in self.postings.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        candidates = sorted(
+            (
+                candidate
+                for candidate, count in shared.items()
+                if count >= required and abs(len(candidate) - len(word)) <= max_distance
+            ),
+            # Among candidates sharing as many trigrams, closer lengths first, so
+            # the cut to max_candidates doesn't depend on the order of postings.
+            key=lambda candidate: (
+                -shared[candidate],
+                abs(len(candidate) - len(word)),
+                candidate,
+            ),
+        )
+
+        found = []
+        for compared, candidate in enumerate(candidates[:max_candidates]):
+            if deadline is not None and compared % 8 == 0:
+                if time.perf_counter() > deadline:
+                    break
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found.append((distance, candidate, self.values[candidate]))
+        return found
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant lookup of items and objects by their keys, names and references.
+
+    Attributes:
+    -----------
+    max_candidates : int
+        The most words a single lookup may compare.
+    time_budget : float
+        The most seconds a single lookup may take.
+    pack : Optional[ContentPack]
+        When given, the index is read from the pack instead of built, and the
+        words found are resolved to instances per lookup.
+    """
+
+    def __init__(
+        self,
+        containers: list[type["CustomContainer"]],
+        max_candidates: int = 64,
+        time_budget: float = 0.001,
+        pack: Optional["ContentPack"] = None,
+    ):
+        self._containers = containers
+        self.max_candidates = max_candidates
+        self.time_budget = time_budget
+        self.pack = pack
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Reindexes all references. Call after the content has been reloaded."""
+        if self.pack:
+            self._index = TrigramIndex(
+                self.pack.table(TRIGRAMS), self.pack.table(WORDS)
+            )
+            return
+        index = TrigramIndex()
+        for word, _, _, instance in self._words():
+            index.add(word, instance)
+        self._index = index
+
+    def export(self) -> dict[str, Mapping]:
+        """Returns the tables of the index for a content pack: the words per
+        trigram, and the instances per word as "<container index>:<key>"."""
+        index = TrigramIndex()
+        for word, container, key, _ in self._words():
+            index.add(word, f"{container}:{key}")
+        return {TRIGRAMS: index.postings, WORDS: index.values}
+
+    def _words(self) -> Iterator[tuple[str, int, str, Any]]:
+        for container_index, container in enumerate(self._containers):
+            for key, provider in container.members().items():
+                instance = provider()
+                words = {key.casefold()}
+                words.update(reference.casefold() for reference in instance.references)
+                for word in words:
+                    yield word, container_index, key, instance
+
+    @staticmethod
+    def max_distance(phrase: str) -> int:
+        if len(phrase) < 4:
+            return 0
+        if len(phrase) < 7:
+            return 1
+        return 2
+
+    def has_candidates(self, phrase: str) -> bool:
+        """Whether anything in the game is close enough to the phrase."""
+        return bool(self._search(phrase.casefold()))
+
+    def lookup(self, phrase: str, scope: Collection) -> Optional[Any]:
+        """Returns the closest match among the instances in scope. Returns None
+        when nothing is close enough or the closest matches are ambiguous."""
+        distances = {}
+        for distance, _, values in self._search(phrase.casefold()):
+            for value in values:
+                if value in scope and distance < distances.get(id(value), (distance + 1,))[0]:
+                    distances[id(value)] = (distance, value)
+        if not distances:
+            return None
+
+        ranked = sorted(distances.values(), key=lambda match: match[0])
+        if len(ranked) > 1 and ranked[0][0] == ranked[1][0]:
+            return None
+        return ranked[0][1]
+
+    def _search(self, phrase: str) -> list[tuple[int, str, list]]:
+        max_distance = self.max_distance(phrase)
+        if not max_distance:
+            return []
+        found = self._index.search(
+            phrase,
+            max_distance,
+            max_candidates=self.max_candidates,
+            deadline=time.perf_counter() + self.time_budget,
+        )
+        if self.pack:
+            return [
+                (distance, word, [self._instance(value) for value in values])
+                for distance, word, values in found
+            ]
+        return found
+
+    def _instance(self, value: str) -> Any:
+        container, key = value.split(":", 1)
+        return getattr(self._containers[int(container)], key)()
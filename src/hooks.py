@@ -0,0 +1,55 @@
+"""Wrapping of methods by several features at once, such as the turn
+instrumentation and the Chrome trace recorder. Every feature adds its wrapper to
+the hooks of a method and removes it when it is done, in any order: the method
+is rebuilt from its original and the remaining wrappers, and the original is
+put back once none is left, so methods nobody hooks cost nothing.
+"""
+from typing import Any, Callable
+
+# Takes a function and returns the function wrapping it.
+Hook = Callable[[Callable], Callable]
+
+# (owner, name): (the original in the owner's namespace, or None when inherited,
+# the hooks in the order they were added)
+_hooks: dict[tuple[type, str], tuple[Any, list[Hook]]] = {}
+
+
+def add_hook(owner: type, name: str, hook: Hook) -> None:
+    """Wraps a method of a class, or one it inherits, with a hook. Hooks added
+    later wrap those added before."""
+    key = (owner, name)
+    if key not in _hooks:
+        _hooks[key] = (owner.__dict__.get(name), [])
+    _hooks[key][1].append(hook)
+    _install(owner, name)
+
+
+def remove_hook(owner: type, name: str, hook: Hook) -> None:
+    """Unwraps a method from a hook added to it. Does nothing for hooks that
+    aren't added."""
+    key = (owner, name)
+    if key not in _hooks or hook not in _hooks[key][1]:
+        return
+    original, hooks = _hooks[key]
+    hooks.remove(hook)
+    if hooks:
+        _install(owner, name)
+        return
+    del _hooks[key]
+    if original is None:
+        delattr(owner, name)
+    else:
+        setattr(owner, name, original)
+
+
+def _install(owner: type, name: str) -> None:
+    original, hooks = _hooks[owner, name]
+    if original is None:
+        original = next(
+            base.__dict__[name] for base in owner.__mro__[1:] if name in base.__dict__
+        )
+    is_classmethod = isinstance(original, classmethod)
+    function = original.__func__ if is_classmethod else original
+    for hook in hooks:
+        function = hook(function)
+    setattr(owner, name, classmethod(function) if is_classmethod else function)
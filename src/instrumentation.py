@@ -0,0 +1,174 @@
+import math
+import time
+from functools import wraps
+from functools import partial
+from typing import TYPE_CHECKING, Callable
+
+from src.hooks import Hook, add_hook, remove_hook
+
+if TYPE_CHECKING:
+    from src.core import Engine
+
+# The engine methods timed per stage of a turn.
+STAGES = {
+    "turn": "execute",
+    "parse": "_parse",
+    "validate": "_validate",
+    "resolve": "_resolve",
+    "service_lookup": "_get_service",
+    "interaction": "_interact",
+    "output": "drain_output",
+}
+
+
+class LatencyHistogram:
+    """
+    Durations counted in logarithmic buckets. Every bucket is `growth` times as
+    wide as the previous one, so percentiles are accurate to that ratio at any
+    scale while the memory stays bounded.
+
+    Attributes:
+    -----------
+    growth : float
+        The ratio between the bounds of a bucket.
+    minimum : float
+        The upper bound in seconds of the first bucket.
+    count : int
+        The amount of recorded durations.
+    total : float
+        The sum of the recorded durations in seconds.
+    max : float
+        The longest recorded duration in seconds.
+    """
+
+    def __init__(self, growth: float = 2**0.125, minimum: float = 1e-7):
+        self.growth = growth
+        self.minimum = minimum
+        self._log_growth = math.log(growth)
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds > self.minimum:
+            index = int(math.log(seconds / self.minimum) / self._log_growth) + 1
+        else:
+            index = 0
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper bound of the bucket holding the given fraction of the
+        recorded durations."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self.minimum * self.growth**index, self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Adds the durations of a histogram with the same buckets."""
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class TurnInstrumentation:
+    """
+    Times the stages of every turn of the engine. Enabling it hooks the engine's
+    stage methods and disabling it removes its hooks, see `src.hooks`, so a
+    disabled instrumentation costs nothing. Works for the interactive loop as
+    well as for engines driven through `Engine.execute`, e.g. by a
+    SessionManager.
+
+    Attributes:
+    -----------
+    engine : type[Engine]
+        The instrumented engine.
+    histograms : dict[str, LatencyHistogram]
+        The durations per stage.
+    """
+
+    def __init__(self, engine: type["Engine"]):
+        self.engine = engine
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self._hooks: dict[str, Hook] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._hooks)
+
+    def enable(self) -> "TurnInstrumentation":
+        if self.enabled:
+            return self
+        for stage, name in STAGES.items():
+            hook = partial(_timed, histogram=self.histograms[stage])
+            self._hooks[name] = hook
+            add_hook(self.engine, name, hook)
+        return self
+
+    def disable(self) -> None:
+        for name, hook in self._hooks.items():
+            remove_hook(self.engine, name, hook)
+        self._hooks = {}
+
+    def reset(self) -> None:
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        if self.enabled:
+            self.disable()
+            self.enable()
+
+    def report(self) -> dict[str, dict]:
+        """Returns count, mean, p50, p95, p99 and max in seconds per stage."""
+        return {stage: histogram.as_dict() for stage, histogram in self.histograms.items()}
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}  (us)"]
+        for stage, stats in self.report().items():
+            lines.append(
+                f"{stage:<16}{stats['count']:>8}"
+                f"{stats['p50'] * 1e6:>10.1f}"
+                f"{stats['p95'] * 1e6:>10.1f}"
+                f"{stats['p99'] * 1e6:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def __enter__(self) -> "TurnInstrumentation":
+        return self.enable()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+
+def _timed(function: Callable, histogram: LatencyHistogram) -> Callable:
+    perf_counter = time.perf_counter
+
+    @wraps(function)
+    def timed(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            histogram.record(perf_counter() - started)
+
+    return timed
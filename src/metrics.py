@@ -0,0 +1,260 @@
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    """
+    A monotonically increasing value per combination of label values. Every
+    thread increments a dict of its own, so an increment takes no lock; the
+    dicts are summed when the counter is collected.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the metric.
+    help : str
+        What is counted.
+    label_names : tuple[str, ...]
+        The names of the labels, in the order their values are passed to `inc`.
+    """
+
+    def __init__(self, name: str, help_: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_
+        self.label_names = label_names
+        self._local = threading.local()
+        self._shards: list[dict[tuple, float]] = []
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def collect(self) -> dict[tuple, float]:
+        """Returns the value per combination of label values, summed over all
+        threads."""
+        with self._lock:
+            shards = list(self._shards)
+        totals = {}
+        for shard in shards:
+            for label_values, value in shard.copy().items():
+                totals[label_values] = totals.get(label_values, 0) + value
+        return totals
+
+    def value(self, *label_values: str) -> float:
+        return self.collect().get(label_values, 0)
+
+    def _new_shard(self) -> dict[tuple, float]:
+        shard = self._local.shard = {}
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+
+class Gauge:
+    """
+    A value that is read from a function whenever the gauge is collected.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the metric.
+    help : str
+        What is measured.
+    """
+
+    def __init__(self, name: str, help_: str, function: Callable[[], float]):
+        self.name = name
+        self.help = help_
+        self.label_names = ()
+        self._function = function
+
+    def collect(self) -> dict[tuple, float]:
+        return {(): self._function()}
+
+
+class MetricsRegistry:
+    """Counters and gauges, exported in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge] = {}
+
+    def counter(
+        self, name: str, help_: str, label_names: tuple[str, ...] = ()
+    ) -> Counter:
+        """Returns the counter with the given name, creating it if necessary."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Counter(name, help_, label_names)
+        if not isinstance(metric, Counter):
+            raise ValueError(f"Not a counter: {name}")
+        return metric
+
+    def gauge(self, name: str, help_: str, function: Callable[[], float]) -> Gauge:
+        """Registers a gauge, replacing the one with the same name."""
+        if isinstance(self._metrics.get(name), Counter):
+            raise ValueError(f"Not a gauge: {name}")
+        gauge = self._metrics[name] = Gauge(name, help_, function)
+        return gauge
+
+    def exposition(self) -> str:
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            kind = "counter" if isinstance(metric, Counter) else "gauge"
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for label_values, value in sorted(metric.collect().items()):
+                labels = ",".join(
+                    f'{label}="{_escape(str(label_value))}"'
+                    for label, label_value in zip(metric.label_names, label_values)
+                )
+                labels = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class EngineMetrics:
+    """
+    The counters updated by the engine.
+
+    Attributes:
+    -----------
+    turns : Counter
+        Lines of user input executed.
+    commands : Counter
+        Commands executed per action.
+    validation_failures : Counter
+        Rejected commands per CommandError.
+    service_dispatches : Counter
+        Commands dispatched per service class.
+    game_overs : Counter
+        Finished games per GameOutcome.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.turns = registry.counter(
+            "textgame_turns_total", "Lines of user input executed."
+        )
+        self.commands = registry.counter(
+            "textgame_commands_total", "Commands executed per action.", ("action",)
+        )
+        self.validation_failures = registry.counter(
+            "textgame_validation_failures_total",
+            "Rejected commands per error.",
+            ("error",),
+        )
+        self.service_dispatches = registry.counter(
+            "textgame_service_dispatches_total",
+            "Commands dispatched per service.",
+            ("service",),
+        )
+        self.game_overs = registry.counter(
+            "textgame_game_overs_total", "Finished games per outcome.", ("outcome",)
+        )
+
+
+class MetricsServer:
+    """
+    Serves the exposition of a registry at /metrics from a background thread.
+
+    Attributes:
+    -----------
+    port : int
+        The port the server listens on. Pass 0 to pick a free one.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 0
+    ):
+        self._server = ThreadingHTTPServer((host, port), _handler(registry))
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class MetricsFileWriter:
+    """
+    Writes the exposition of a registry to a file at a fixed interval, for the
+    node exporter's textfile collector. The file is replaced atomically.
+
+    Attributes:
+    -----------
+    path : str
+        The file written to.
+    interval : float
+        Seconds between writes.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def write(self) -> None:
+        with open(f"{self.path}.tmp", "w") as file:
+            file.write(self.registry.exposition())
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def close(self) -> None:
+        self._closed.set()
+        self._thread.join()
+        self.write()
+
+    def _write_loop(self) -> None:
+        while not self._closed.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                logging.exception("Writing the metrics file failed")
+
+
+def _handler(registry: MetricsRegistry) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.exposition().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format_: str, *args) -> None:
+            logging.debug(format_, *args)
+
+    return MetricsHandler
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = MetricsRegistry()
+engine_metrics = EngineMetrics(registry)
@@ -1,13 +1,16 @@
 from typing import TYPE_CHECKING, Optional, Union
 
+from src.events import Publisher
+
 if TYPE_CHECKING:
     from src.enums import PlayerAction, EquipableSlot
     from src.effect import Effect
 
 
-class Interactable:
+class Interactable(Publisher):
     """
-    Anything in the game universe that can be interacted with.
+    Anything in the game universe that can be interacted with. Publishes the
+    changes of its state.
 
     Attributes:
     -----------
@@ -27,6 +30,8 @@ class Interactable:
     class States:
         pass
 
+    _published = ("state",)
+
     name: str
     description: str
     interactions: dict["PlayerAction", Union[str, dict]]
@@ -50,3 +50,19 @@ class FuelCan(Item):
         PlayerAction.EMPTY,
     ]
     _references = ["fuel can", "can", "fuel"]
+
+
+class Supply(Item):
+    """An item of a generated world. Many instances share this class."""
+
+    interactions = [
+        PlayerAction.INSPECT,
+        PlayerAction.PICKUP,
+    ]
+
+    def __init__(
+        self, name: str, description: str = None, references: list[str] = None
+    ):
+        self.name = name
+        self.description = description or f"A {name.rsplit(' ', 1)[0]}."
+        self._references = references or [name]
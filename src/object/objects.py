@@ -1,8 +1,12 @@
 import enum
+from typing import TYPE_CHECKING
 
 from src.object.base import Object
 from src.enums import PlayerAction
 
+if TYPE_CHECKING:
+    from src.object.base import Item
+
 
 class ControlPanelExtinguishButton(Object):
     name = "red button"
@@ -260,3 +264,58 @@ class Urinal(Object):
     _references = ["urinal"]
     state = None
     shown = True
+
+
+class Door(Object):
+    """
+    A door to a room of a generated world. Unlike the doors of the shipped ship,
+    every door is an instance of this class, and its destination is data.
+
+    Attributes:
+    -----------
+    destination : str
+        The key of the room in the environments container.
+    """
+
+    interactions = [
+        PlayerAction.INSPECT,
+        PlayerAction.ENTER,
+    ]
+    state = None
+    shown = True
+
+    def __init__(self, room_name: str, destination: str):
+        super().__init__()
+        self.name = f"{room_name} door"
+        self.description = f"A door to the {room_name}."
+        self._references = [room_name, self.name]
+        self.destination = destination
+
+
+class Locker(Object):
+    """A closed container of a generated world. Its items drop out when opened."""
+
+    class States:
+        CLOSED = enum.auto()
+        OPEN = enum.auto()
+
+    interactions = [
+        PlayerAction.INSPECT,
+        PlayerAction.OPEN,
+        PlayerAction.CLOSE,
+    ]
+    shown = True
+
+    def __init__(
+        self,
+        name: str,
+        items: list["Item"] = None,
+        description: str = None,
+        references: list[str] = None,
+        state: "Locker.States" = None,
+    ):
+        super().__init__(items or [])
+        self.name = name
+        self.description = description or f"A {name.rsplit(' ', 1)[0]}."
+        self._references = references or [name]
+        self.state = state or self.States.CLOSED
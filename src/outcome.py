@@ -0,0 +1,25 @@
+from src.enums import GameOutcome
+
+
+class GameOver:
+    """
+    Returned by a service instead of a response when the game has ended. The
+    engine finishes the player's game; the process keeps running.
+
+    Attributes:
+    -----------
+    outcome : GameOutcome
+        Whether the player won or died.
+    text : str
+        The text shown to the player.
+    """
+
+    def __init__(self, outcome: GameOutcome, text: str):
+        self.outcome = outcome
+        self.text = text
+
+    def __repr__(self):
+        return f"<GameOver {self.outcome}>"
+
+    def __str__(self):
+        return self.text
@@ -1,7 +1,8 @@
-import logging
 from typing import TYPE_CHECKING, Optional
 
 from src.enums import PlayerAction
+from src.events import Publisher
+from src.tracing import tracer
 
 if TYPE_CHECKING:
     from src.enums import EquipableSlot
@@ -10,9 +11,10 @@ if TYPE_CHECKING:
     from src.object.base import Equipable, Item
 
 
-class Player:
+class Player(Publisher):
     """
-    The player is the main character of the game.
+    The player is the main character of the game. Publishes the changes of its
+    environment, effects, inventory and equipment.
 
     Attributes:
     -----------
@@ -31,6 +33,8 @@ class Player:
     name: str = "player"
     environment: "Environment"
 
+    _published = ("environment", "effects", "inventory", "equipped")
+
     interactions = [
         PlayerAction.INSPECT,
     ]
@@ -60,7 +64,7 @@ class Player:
 
     def equip(self, item: "Equipable") -> str:
         """Equips the given item."""
-        logging.debug(f"Equipping item: {item}")
+        tracer.event("equip", item)
 
         if item in self.equipped:
             return f"Already equipped: {item}."
@@ -69,7 +73,7 @@ class Player:
             return f"You already have something equipped: {item.slot}"
 
         self.equipped.append(item)
-        logging.debug(f"Equipment: {self.equipped}")
+        tracer.event("equipment", *self.equipped)
 
         effects = self.add_effects(item.effects)
 
@@ -78,13 +82,13 @@ class Player:
     def add_effects(self, effects: list["Effect"]) -> str:
         """Adds the given effects to the player."""
         effects = sorted(set(effects), key=lambda x: x.name)
-        logging.debug(f"Adding effects: {effects}")
+        tracer.event("add effects", *effects)
 
         self.effects.extend(
             [effect for effect in effects if effect not in self.effects]
         )
 
-        logging.debug(f"Effects: {self.effects}")
+        tracer.event("effects", *self.effects)
 
         if effects:
             effects_str = ", ".join([effect.name.upper() for effect in effects])
@@ -94,13 +98,13 @@ class Player:
 
     def unequip(self, item: "Equipable") -> str:
         """Unequips the given item."""
-        logging.debug(f"Unequipping item: {item}")
+        tracer.event("unequip", item)
 
         if item not in self.equipped:
             return f"You don't have that equipped: {item}"
 
         self.equipped.remove(item)
-        logging.debug(f"Equipment: {self.equipped}")
+        tracer.event("equipment", *self.equipped)
 
         effects = self.remove_effects(item.effects)
 
@@ -109,10 +113,10 @@ class Player:
     def remove_effects(self, effects: list["Effect"]) -> str:
         """Removes the given effects from the player."""
         effects = sorted(set(effects), key=lambda x: x.name)
-        logging.debug(f"Removing effects: {effects}")
+        tracer.event("remove effects", *effects)
 
         self.effects = [effect for effect in self.effects if effect not in effects]
-        logging.debug(f"Effects: {self.effects}")
+        tracer.event("effects", *self.effects)
 
         if effects:
             effects_str = ", ".join([effect.name.upper() for effect in effects])
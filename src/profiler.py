@@ -0,0 +1,191 @@
+import logging
+import os
+import signal
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+from src.metrics import engine_metrics
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+HOT_SPOT_MODULES = ("command.py", "resolvers.py", "service.py", "utils.py")
+# Game code waiting for input. Stacks in which it is the innermost game code are
+# idle, and not sampled.
+IDLE_FUNCTIONS = frozenset({"core.py:_ask_input", "session_host.py:_serve"})
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads running game code at a fixed interval from
+    a background thread. The game itself is not instrumented, so the profiler can
+    be started and stopped on a live server, e.g. with `install_signal_handler`.
+    While sampling, the interpreter's switch interval is lowered to the sampling
+    interval so the sampler gets the GIL in time.
+
+    Threads waiting for input, such as the interactive loop blocked in
+    `Engine._ask_input`, are idle and not sampled, see `IDLE_FUNCTIONS`.
+
+    The samples are written as collapsed stacks, one "root;...;leaf count" line
+    per distinct stack, which flamegraph tools read.
+
+    Attributes:
+    -----------
+    interval : float
+        Seconds between samples.
+    samples : Counter[tuple[str, ...]]
+        The amount of samples per stack, root first. Frames are labelled
+        "file.py:function".
+    turns : int
+        The amount of turns the engine executed while sampling.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self.turns = 0
+        self._labels = {}
+        self._lock = threading.Lock()
+        # Held while starting or stopping, e.g. by two signals in quick
+        # succession.
+        self._running_lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._turns_at_start = 0
+        self._switch_interval = sys.getswitchinterval()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        with self._running_lock:
+            if self.running:
+                return
+            self._turns_at_start = engine_metrics.turns.value()
+            self._switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(self._switch_interval, self.interval))
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._running_lock:
+            if not self.running:
+                return
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+            sys.setswitchinterval(self._switch_interval)
+            self.turns += int(engine_metrics.turns.value() - self._turns_at_start)
+
+    def toggle(self) -> bool:
+        """Starts or stops the profiler. Returns whether it is running."""
+        with self._running_lock:
+            if self.running:
+                self.stop()
+            else:
+                self.start()
+            return self.running
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples = Counter()
+        self.turns = 0
+
+    def collapsed(self) -> str:
+        with self._lock:
+            samples = list(self.samples.items())
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in samples)
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as file:
+            file.write(self.collapsed())
+
+    def hot_spots(
+        self, modules: tuple[str, ...] = HOT_SPOT_MODULES, limit: int = 20
+    ) -> list[tuple[str, int]]:
+        """Returns the functions of the given modules on most sampled stacks, with
+        their amount of samples."""
+        with self._lock:
+            samples = list(self.samples.items())
+        functions = Counter()
+        for stack, count in samples:
+            for label in set(stack):
+                if label.split(":")[0] in modules:
+                    functions[label] += count
+        return functions.most_common(limit)
+
+    def report(self, limit: int = 20) -> str:
+        """Returns the hot spots with their estimated time per turn."""
+        turns = max(self.turns, 1)
+        lines = [f"{'function':<48}{'samples':>9}{'ms/turn':>10}"]
+        for label, count in self.hot_spots(limit=limit):
+            ms_per_turn = count * self.interval * 1000 / turns
+            lines.append(f"{label:<48}{count:>9}{ms_per_turn:>10.3f}")
+        lines.append(f"{self.turns} turns")
+        return "\n".join(lines)
+
+    def install_signal_handler(
+        self, path: str = "profile.collapsed", signum: Optional[int] = None
+    ) -> bool:
+        """Toggles the profiler when the process receives the signal, SIGUSR2 by
+        default. When it is stopped, the collapsed stacks are written to the path
+        and the hot spots are logged. Must be called from the main thread.
+        Returns whether the handler was installed: platforms without SIGUSR2,
+        such as Windows, have no default signal."""
+        if signum is None:
+            signum = getattr(signal, "SIGUSR2", None)
+        if signum is None:
+            logging.info("No SIGUSR2 on this platform, profiling by signal is off")
+            return False
+
+        def handler(_signum, _frame):
+            # Joining the sampler blocks, so the signal is handled off the main
+            # thread.
+            threading.Thread(target=self._toggle_and_write, args=(path,)).start()
+
+        signal.signal(signum, handler)
+        return True
+
+    def _toggle_and_write(self, path: str) -> None:
+        if self.toggle():
+            logging.info("Profiling started")
+            return
+        self.write_collapsed(path)
+        logging.info("Profile written to %s\n%s", path, self.report())
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if stack:
+                    with self._lock:
+                        self.samples[stack] += 1
+
+    def _stack(self, frame) -> Optional[tuple[str, ...]]:
+        """Returns the labels of the frames, root first. Returns None when no frame
+        is game code, or when the innermost game code is idle."""
+        labels = []
+        innermost = None
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = self._label(code)
+            labels.append(label[0])
+            if innermost is None and label[1]:
+                innermost = label[0]
+            frame = frame.f_back
+        if innermost is None or innermost in IDLE_FUNCTIONS:
+            return None
+        return tuple(reversed(labels))
+
+    @staticmethod
+    def _label(code) -> tuple[str, bool]:
+        filename = os.path.abspath(code.co_filename)
+        in_game = filename.startswith(PACKAGE_DIRECTORY + os.sep)
+        return f"{os.path.basename(filename)}:{code.co_name}", in_game
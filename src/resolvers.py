@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional, Union, Any
+from typing import TYPE_CHECKING, Mapping, Optional, Union, Any
 
 from src.enums import PlayerAction
 from src.player import Player
@@ -9,19 +9,49 @@ from src.object.base import Object, Item
 if TYPE_CHECKING:
     from src.containers import CustomContainer, Services, Objects, Items
     from src.command import Command
+    from src.content_pack import ContentPack
+    from src.fuzzy import FuzzyIndex
 
 
 class Resolver:
-    def __init__(self, container: type["CustomContainer"]):
+    """
+    Attributes:
+    -----------
+    container : type[CustomContainer]
+        The container of the instances to resolve.
+    pack : Optional[ContentPack]
+        When given, names are looked up in the pack's index instead of scanning
+        the container. The index assumes the references of the content never
+        change, which holds for compiled content.
+    """
+
+    # The table of the index in a content pack.
+    table: str
+
+    def __init__(
+        self,
+        container: type["CustomContainer"],
+        pack: Optional["ContentPack"] = None,
+    ):
         self.container = container
+        self.pack = pack
 
 
 class ObjectResolver(Resolver):
-    def __init__(self, container: Union[type["Objects"], type["Items"]]):
-        super().__init__(container)
+    table = "references.objects"
+
+    def __init__(
+        self,
+        container: Union[type["Objects"], type["Items"]],
+        pack: Optional["ContentPack"] = None,
+    ):
+        super().__init__(container, pack)
 
     def resolve(self, object_: Union[str, type["Object"]]) -> Optional["Object"]:
         """Returns the object with the given name."""
+        if self.pack and isinstance(object_, str):
+            keys = self.pack.table(self.table).get(object_.casefold())
+            return getattr(self.container, keys[0])() if keys else None
         for k, v in self.container.members().items():
             v = v()
             if isinstance(object_, str):
@@ -40,33 +70,77 @@ class ObjectResolver(Resolver):
         if hasattr(v, "_references") and casefold_in(object_, v._references):
             return v
 
+    def export(self) -> dict[str, Mapping]:
+        """Returns the index of the names for a content pack: the keys of the
+        instances per casefolded key, name and reference, in container order, so
+        the first key is the one a scan would find."""
+        index: dict[str, list[str]] = {}
+        for k, v in self.container.members().items():
+            v = v()
+            names = [k, getattr(v, "name", None)]
+            names += getattr(v, "_references", None) or []
+            for name in {name.casefold() for name in names if isinstance(name, str)}:
+                index.setdefault(name, []).append(k)
+        return {self.table: index}
+
 
 class ItemResolver(ObjectResolver):
-    def __init__(self, container: type["Items"]):
-        super().__init__(container)
+    table = "references.items"
+
+    def __init__(
+        self, container: type["Items"], pack: Optional["ContentPack"] = None
+    ):
+        super().__init__(container, pack)
 
 
 class ServiceResolver(Resolver):
-    def __init__(self, container: type["Services"], objects_r: ObjectResolver):
+    table = "dispatch"
+
+    def __init__(
+        self,
+        container: type["Services"],
+        objects_r: ObjectResolver,
+        pack: Optional["ContentPack"] = None,
+    ):
         self._objects_r = objects_r
-        super().__init__(container)
+        super().__init__(container, pack)
 
     def resolve(self, object_: Union["Object", "Item"]) -> Optional["Service"]:
         """Returns the service with related to an object with the given name or
         serving the passed object class"""
+        type_ = object_ if isinstance(object_, type) else type(object_)
+        if self.pack:
+            for k in self.pack.table(self.table).get(type_.__qualname__, []):
+                service = getattr(self.container, k)()
+                if service.object_type is type_:
+                    return service
         for k, v in self.container.members().items():
             v = v()
-            type_ = object_
-            if not isinstance(object_, type):
-                type_ = type(object_)
             if type_ is v.object_type:
                 return v
 
+    def export(self) -> dict[str, Mapping]:
+        """Returns the dispatch table for a content pack: the keys of the services
+        per name of the class they serve."""
+        dispatch: dict[str, list[str]] = {}
+        for k, v in self.container.members().items():
+            object_type = getattr(v(), "object_type", None)
+            if object_type is not None:
+                dispatch.setdefault(object_type.__qualname__, []).append(k)
+        return {self.table: dispatch}
+
 
 class CommandObjectResolver:
-    def __init__(self, player: Player, items_r: ItemResolver, objects_r: ObjectResolver):
+    def __init__(
+        self,
+        player: Player,
+        items_r: ItemResolver,
+        objects_r: ObjectResolver,
+        fuzzy_index: Optional["FuzzyIndex"] = None,
+    ):
         self._player = player
         self._resolvers = [items_r, objects_r]
+        self._fuzzy_index = fuzzy_index
 
     def resolve(
         self, object_: Union[str, "Item", "Object"]
@@ -91,3 +165,12 @@ class CommandObjectResolver:
             resolved_object = resolver.resolve(object_)
             if resolved_object:
                 return resolved_object
+        if object_ and self._fuzzy_index:
+            return self._fuzzy_index.lookup(object_, self._scope())
+
+    def _scope(self) -> list[Union["Item", "Object"]]:
+        """The items and objects the player could be referring to."""
+        scope = list(self._player.inventory)
+        if self._player.environment:
+            scope += self._player.environment.objects_and_items
+        return scope
@@ -0,0 +1,395 @@
+"""Declarative rules of the services: for an action on an object, ordered rules of
+conditions on the world and effects on it, compiled into decision tables.
+
+A table evaluates the conditions of its rules in order, each condition at most
+once per command, and applies the effects of the first matching rule. Rules that
+aren't final add their output and let the following rules match too. When no
+rule matches, the service's method for the action answers.
+
+Rules are plain data, so they can be analyzed without running the game: see
+`RuleTable.analyze`, and `Rule.reads` and `Rule.writes` for what a rule depends
+on and changes.
+"""
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union
+
+from src.enums import PlayerAction
+from src.outcome import GameOver
+from src.utils import die_in_void
+
+if TYPE_CHECKING:
+    from src.command import Command
+    from src.service import Service
+
+
+class Condition:
+    """A fact about the world. Equal conditions share a column of the decision
+    table."""
+
+    def _key(self) -> tuple:
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash((type(self), self._key()))
+
+    def __invert__(self) -> "Condition":
+        return Not(self)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self}>"
+
+    def reads(self) -> set[str]:
+        """The keys of what the condition looks at."""
+        raise NotImplementedError
+
+    def bind(self, service: "Service") -> Callable[[], bool]:
+        """Returns a function evaluating the condition in the world of the
+        service."""
+        raise NotImplementedError
+
+
+class ObjectState(Condition):
+    """An object is in a state, given by the keys of the object and the state."""
+
+    def __init__(self, key: str, state: str):
+        self.key = key
+        self.state = state
+
+    def __str__(self):
+        return f"{self.key} is {self.state}"
+
+    def _key(self) -> tuple:
+        return self.key, self.state
+
+    def reads(self) -> set[str]:
+        return {f"objects.{self.key}"}
+
+    def bind(self, service: "Service") -> Callable[[], bool]:
+        provider = getattr(service._objects_c, self.key)
+        state = getattr(provider().States, self.state)
+        return lambda: provider().state is state
+
+
+class Equipped(Condition):
+    """The player has an item equipped."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __str__(self):
+        return f"{self.key} is equipped"
+
+    def _key(self) -> tuple:
+        return (self.key,)
+
+    def reads(self) -> set[str]:
+        return {"player.equipped"}
+
+    def bind(self, service: "Service") -> Callable[[], bool]:
+        player = service._player
+        provider = getattr(service._items_c, self.key)
+        return lambda: provider() in player.equipped
+
+
+class HasEffect(Condition):
+    """The player is under an effect."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __str__(self):
+        return f"player has {self.key}"
+
+    def _key(self) -> tuple:
+        return (self.key,)
+
+    def reads(self) -> set[str]:
+        return {"player.effects"}
+
+    def bind(self, service: "Service") -> Callable[[], bool]:
+        player = service._player
+        provider = getattr(service._effects_c, self.key)
+        return lambda: provider() in player.effects
+
+
+class Not(Condition):
+    """The opposite of a condition. Tables test the condition itself for
+    false."""
+
+    def __init__(self, condition: Condition):
+        self.condition = condition
+
+    def __str__(self):
+        return f"not {self.condition}"
+
+    def __invert__(self) -> Condition:
+        return self.condition
+
+    def _key(self) -> tuple:
+        return (self.condition,)
+
+    def reads(self) -> set[str]:
+        return self.condition.reads()
+
+    def bind(self, service: "Service") -> Callable[[], bool]:
+        condition = self.condition.bind(service)
+        return lambda: not condition()
+
+
+class AnyOf(Condition):
+    """At least one of some conditions."""
+
+    def __init__(self, *conditions: Condition):
+        self.conditions = conditions
+
+    def __str__(self):
+        return " or ".join(str(condition) for condition in self.conditions)
+
+    def _key(self) -> tuple:
+        return self.conditions
+
+    def reads(self) -> set[str]:
+        return set().union(*(condition.reads() for condition in self.conditions))
+
+    def bind(self, service: "Service") -> Callable[[], bool]:
+        conditions = [condition.bind(service) for condition in self.conditions]
+        return lambda: any(condition() for condition in conditions)
+
+
+class Effect:
+    """A change to the world or a piece of the output of a rule."""
+
+    def writes(self) -> set[tuple[str, str]]:
+        """The keys of the objects the effect changes, with their new state."""
+        return set()
+
+    def bind(
+        self, service: "Service"
+    ) -> Callable[[], Optional[Union[str, GameOver]]]:
+        """Returns a function applying the effect in the world of the service,
+        and returning its output, if any."""
+        raise NotImplementedError
+
+
+class SetState(Effect):
+    def __init__(self, key: str, state: str):
+        self.key = key
+        self.state = state
+
+    def __repr__(self):
+        return f"<SetState {self.key} {self.state}>"
+
+    def writes(self) -> set[tuple[str, str]]:
+        return {(self.key, self.state)}
+
+    def bind(self, service: "Service") -> Callable[[], None]:
+        provider = getattr(service._objects_c, self.key)
+        state = getattr(provider().States, self.state)
+
+        def apply():
+            provider().state = state
+
+        return apply
+
+
+class Say(Effect):
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self):
+        return f"<Say {self.text!r}>"
+
+    def bind(self, service: "Service") -> Callable[[], str]:
+        return lambda: self.text
+
+
+class Describe(Effect):
+    """Outputs the description of an object."""
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __repr__(self):
+        return f"<Describe {self.key}>"
+
+    def bind(self, service: "Service") -> Callable[[], str]:
+        provider = getattr(service._objects_c, self.key)
+        return lambda: provider().description
+
+
+class DieInVoid(Effect):
+    """Ends the game, see `die_in_void`."""
+
+    def __init__(self, opening_door: bool = False, inside: bool = False):
+        self.opening_door = opening_door
+        self.inside = inside
+
+    def __repr__(self):
+        return f"<DieInVoid opening_door={self.opening_door} inside={self.inside}>"
+
+    def bind(self, service: "Service") -> Callable[[], GameOver]:
+        return lambda: die_in_void(opening_door=self.opening_door, inside=self.inside)
+
+
+class Rule:
+    """
+    Applies its effects when all of its conditions hold.
+
+    Attributes:
+    -----------
+    conditions : list[Condition]
+        What must hold for the rule to match.
+    effects : list[Effect]
+        What the rule does, in order. Their outputs are joined.
+    final : bool
+        Whether matching this rule ends the evaluation of the table.
+    """
+
+    def __init__(
+        self,
+        conditions: Iterable[Condition],
+        effects: Iterable[Effect],
+        final: bool = True,
+    ):
+        self.conditions = list(conditions)
+        self.effects = list(effects)
+        self.final = final
+
+    def __repr__(self):
+        conditions = " and ".join(str(c) for c in self.conditions) or "always"
+        return f"<Rule {conditions} -> {self.effects}>"
+
+    def reads(self) -> set[str]:
+        return set().union(*(condition.reads() for condition in self.conditions))
+
+    def writes(self) -> set[tuple[str, str]]:
+        return set().union(*(effect.writes() for effect in self.effects))
+
+
+class RuleTable:
+    """
+    The rules of an action on an object, compiled into a decision table: a
+    column per distinct condition, and a row per rule with the columns it tests
+    and the values it expects.
+
+    Attributes:
+    -----------
+    rules : list[Rule]
+        The rules in order.
+    columns : list[Condition]
+        The distinct conditions of the rules, negations excluded.
+    rows : list[tuple[tuple[int, bool], ...]]
+        The columns every rule tests, and the value it expects of them.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        self.columns: list[Condition] = []
+        indices: dict[Condition, int] = {}
+        self.rows: list[tuple[tuple[int, bool], ...]] = []
+        for rule in self.rules:
+            row = []
+            for condition in rule.conditions:
+                expected = True
+                while isinstance(condition, Not):
+                    condition, expected = condition.condition, not expected
+                if condition not in indices:
+                    indices[condition] = len(self.columns)
+                    self.columns.append(condition)
+                row.append((indices[condition], expected))
+            self.rows.append(tuple(row))
+
+    def __len__(self):
+        return len(self.rules)
+
+    def bind(
+        self,
+        service: "Service",
+        fallback: Callable[["Command"], Union[str, GameOver]],
+    ) -> Callable[["Command"], Union[str, GameOver]]:
+        """Returns a function evaluating the table in the world of the service,
+        which answers when no rule matches. The conditions and effects are bound
+        on the first call, once the world is complete."""
+        columns: list[Callable[[], bool]] = []
+        rows: list[tuple] = []
+
+        def apply(cmd: "Command") -> Union[str, GameOver]:
+            if not rows:
+                columns.extend(column.bind(service) for column in self.columns)
+                rows.extend(
+                    (row, [effect.bind(service) for effect in rule.effects], rule.final)
+                    for row, rule in zip(self.rows, self.rules)
+                )
+            values: list[Optional[bool]] = [None] * len(columns)
+            output = []
+            for row, effects, final in rows:
+                for column, expected in row:
+                    value = values[column]
+                    if value is None:
+                        value = values[column] = columns[column]()
+                    if value is not expected:
+                        break
+                else:
+                    for effect in effects:
+                        result = effect()
+                        if isinstance(result, GameOver):
+                            return result
+                        if result:
+                            output.append(result)
+                    if final:
+                        return "".join(output)
+            if output:
+                return "".join(output)
+            return fallback(cmd)
+
+        return apply
+
+    def analyze(self) -> list[str]:
+        """Returns the problems of the rules: rules that can never match, either
+        because their conditions contradict each other or because an earlier
+        final rule always matches first."""
+        problems = []
+        for i, (rule, row) in enumerate(zip(self.rules, self.rows)):
+            contradiction = self._contradiction(row)
+            if contradiction:
+                problems.append(f"rule {i} {contradiction}")
+                continue
+            tests = set(row)
+            for j in range(i):
+                if self.rules[j].final and set(self.rows[j]) <= tests:
+                    problems.append(f"rule {i} is shadowed by rule {j}")
+                    break
+        return problems
+
+    def _contradiction(self, row: tuple[tuple[int, bool], ...]) -> Optional[str]:
+        expected: dict[int, bool] = {}
+        states: dict[str, str] = {}
+        for column, value in row:
+            condition = self.columns[column]
+            if expected.setdefault(column, value) is not value:
+                return f"expects both {condition} and not {condition}"
+            if not isinstance(condition, ObjectState) or not value:
+                continue
+            state = states.setdefault(condition.key, condition.state)
+            if state != condition.state:
+                return f"expects both {condition.key} is {state} and {condition}"
+        return None
+
+
+def compile_rules(
+    rules: dict[PlayerAction, list[Rule]]
+) -> dict[PlayerAction, RuleTable]:
+    """Returns the decision tables of rules given by action."""
+    return {action: RuleTable(action_rules) for action, action_rules in rules.items()}
+
+
+def analyze_rules(services: Iterable[type["Service"]]) -> list[str]:
+    """Returns the problems of the rule tables of the given service classes."""
+    problems = []
+    for service in services:
+        for action, table in service.rule_tables.items():
+            prefix = f"{service.__name__}.{str(action).lower()}"
+            problems += [f"{prefix}: {problem}" for problem in table.analyze()]
+    return problems
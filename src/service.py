@@ -1,6 +1,6 @@
-from typing import TYPE_CHECKING, Generic, TypeVar
+from typing import TYPE_CHECKING, Generic, TypeVar, Union
 
-from src.enums import PlayerAction
+from src.enums import PlayerAction, GameOutcome
 from src.object.base import Object, Item, Equipable
 from src.object.items import SpaceSuit, RepairKit, FuelCan
 from src.object.objects import (
@@ -19,6 +19,21 @@ from src.object.objects import (
     CockpitDoor,
     GlassCase, Hull, Engine, Urinal,
 )
+from src.outcome import GameOver
+from src.rules import (
+    AnyOf,
+    Describe,
+    DieInVoid,
+    Equipped,
+    HasEffect,
+    ObjectState,
+    Rule,
+    RuleTable,
+    Say,
+    SetState,
+    compile_rules,
+)
+from src.status import ShipStatus, visible_objects
 from src.utils import die_in_void
 
 if TYPE_CHECKING:
@@ -50,9 +65,20 @@ class Service(Generic[T]):
         The environments container.
     _action_mapping : dict[PlayerAction, function]
         A mapping of actions to functions that perform the action.
+    rules : dict[PlayerAction, list[Rule]]
+        The rules of actions, tried before the methods performing them.
+    rule_tables : dict[PlayerAction, RuleTable]
+        The rules compiled into decision tables, per class.
     """
 
     object_type: T = type(None)
+    rules: dict[PlayerAction, list[Rule]] = {}
+    rule_tables: dict[PlayerAction, RuleTable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "rules" in vars(cls):
+            cls.rule_tables = compile_rules(cls.rules)
 
     def __init__(
             self,
@@ -84,8 +110,12 @@ class Service(Generic[T]):
             PlayerAction.CLOSE: self._close,
             PlayerAction.REPAIR: self._repair,
         }
+        for action, table in self.rule_tables.items():
+            self._action_mapping[action] = table.bind(
+                self, self._action_mapping[action]
+            )
 
-    def interact(self, cmd: "Command") -> str:
+    def interact(self, cmd: "Command") -> Union[str, GameOver]:
         """Interact with an object with dynamically using the action and preposition
         object."""
         action_method = self._action_mapping.get(cmd.action)
@@ -111,7 +141,7 @@ class Service(Generic[T]):
             return cmd.object.description
 
         description = self._player.environment.description
-        objects = self._player.environment.shown_objects_and_items_str
+        objects = visible_objects.listing(self._player.environment)
         return " ".join((description, objects)).strip()
 
     def _enter(self, cmd: "Command") -> str:
@@ -166,6 +196,9 @@ class ItemService(Service[Item]):
         if PlayerAction.PICKUP not in cmd.object.interactions:
             return "You can't pick that up."
 
+        if cmd.object in self._player.inventory:
+            return "You already have that."
+
         self._player.environment.items.remove(cmd.object)
         self._player.inventory.append(cmd.object)
 
@@ -195,52 +228,67 @@ class ItemService(Service[Item]):
 class SpaceSuitService(ItemService):
     object_type = SpaceSuit
 
-    def _unequip(self, cmd: "Command") -> str:
+    def _unequip(self, cmd: "Command") -> Union[str, GameOver]:
         player_in_vacuum = (
             self._player.environment is self._environments_c.outside()
             or self._player.environment is self._environments_c.cockpit()
             and self._objects_c.heavy_door().state is self._objects_c.heavy_door().States.OPEN
         )
         if player_in_vacuum:
-            die_in_void()
+            return die_in_void()
         return self._player.unequip(self._items_c.space_suit())
 
 
 class ControlPanelService(Service[ControlPanel]):
     object_type = ControlPanel
+    rules = {
+        PlayerAction.INSPECT: [
+            Rule(
+                [ObjectState("control_panel", "PROLOGUE")],
+                [
+                    Say(
+                        "A control panel with a lot of buttons. A symbol of a flame "
+                        "flashes on the screen. Next to it is a red button."
+                    )
+                ],
+            ),
+            Rule([], [Describe("control_panel")], final=False),
+            Rule(
+                [
+                    AnyOf(
+                        ~ObjectState("heavy_door", "CLOSED"),
+                        ~ObjectState("heavy_door_wheel", "CLOSED"),
+                        HasEffect("full_bladder"),
+                    )
+                ],
+                [Say(" You feel like you are forgetting something.")],
+                final=False,
+            ),
+            Rule(
+                [~ObjectState("engine", "WORKING")],
+                [Say(" The engine light is flashing.")],
+                final=False,
+            ),
+            Rule(
+                [~ObjectState("hull", "REPAIRED")],
+                [Say(" The hull light is flashing.")],
+                final=False,
+            ),
+        ],
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.status = ShipStatus(self, self.rules[PlayerAction.INSPECT])
+        # The status keeps the outcome of the inspect rules up to date.
+        self._action_mapping[PlayerAction.INSPECT] = self._inspect
 
     def _inspect(self, cmd: "Command") -> str:
-        panel = self._objects_c.control_panel()
-        if panel.state is panel.States.PROLOGUE:
-            return "A control panel with a lot of buttons. A symbol of a flame flashes on the screen. Next to it is a red button."
-
-        str_ = panel.description
-
-        heavy_door = self._objects_c.heavy_door()
-        heavy_door_wheel = self._objects_c.heavy_door_wheel()
-        hidden_conditions = [
-            heavy_door.state is heavy_door.States.CLOSED,
-            heavy_door_wheel.state is heavy_door_wheel.States.CLOSED,
-            self._effects_c.full_bladder() not in self._player.effects,
-        ]
-        if not all(hidden_conditions):
-            str_ += " You feel like you are forgetting something."
-
-        engine_fixed = self._objects_c.engine().state is self._objects_c.engine().States.WORKING
-        if not engine_fixed:
-            str_ += " The engine light is flashing."
-
-        hull_fixed = self._objects_c.hull().state is self._objects_c.hull().States.REPAIRED
-        if not hull_fixed:
-            str_ += " The hull light is flashing."
-
-        return str_
-
+        return self.status.text
 
     def _use(self, cmd: "Command"):
-        str_ = self._inspect(cmd)
-
-        if str_ != self._objects_c.control_panel().description:
+        str_ = self.status.text
+        if not self.status.ready:
             return str_
 
         str_ += (
@@ -250,8 +298,7 @@ class ControlPanelService(Service[ControlPanel]):
             " You press the ignition button and the ship starts to rumble. You feel the G-force "
             "increasing. You are going home."
         )
-        print(str_)
-        exit(0)
+        return GameOver(GameOutcome.WIN, str_)
 
 
 class ControlPanelExtinguishButtonService(Service[ControlPanelExtinguishButton]):
@@ -271,6 +318,25 @@ class ControlPanelExtinguishButtonService(Service[ControlPanelExtinguishButton])
 
 class HeavyDoorService(Service[HeavyDoor]):
     object_type = HeavyDoor
+    rules = {
+        PlayerAction.OPEN: [
+            Rule(
+                [ObjectState("heavy_door_wheel", "CLOSED")],
+                [Say("The door is locked.")],
+            ),
+            Rule(
+                [
+                    ObjectState("heavy_door_wheel", "OPEN"),
+                    ~HasEffect("vacuum_resistance"),
+                ],
+                [DieInVoid(opening_door=True, inside=True)],
+            ),
+            Rule(
+                [ObjectState("heavy_door_wheel", "OPEN")],
+                [SetState("heavy_door", "OPEN"), Say("You open the door.")],
+            ),
+        ],
+    }
 
     def _inspect(self, cmd: "Command"):
         wheel = self._objects_c.heavy_door_wheel()
@@ -291,18 +357,6 @@ class HeavyDoorService(Service[HeavyDoor]):
                 self._player.environment = self._environments_c.cockpit()
                 return "You enter the cockpit."
 
-    def _open(self, cmd: "Command"):
-        wheel = self._objects_c.heavy_door_wheel()
-        if wheel.state is wheel.States.CLOSED:
-            return "The door is locked."
-        if wheel.state is wheel.States.OPEN:
-            if self._effects_c.vacuum_resistance() not in self._player.effects:
-                die_in_void(inside=True, opening_door=True)
-            door = self._objects_c.heavy_door()
-            door.state = door.States.OPEN
-            return "You open the door."
-        return ""
-
     def _close(self, cmd: "Command"):
         door = self._objects_c.heavy_door()
         if door.state is door.States.OPEN:
@@ -369,7 +423,7 @@ class CockpitDoorService(Service[CockpitDoor]):
     def _enter(self, cmd: "Command"):
         door = self._objects_c.heavy_door()
         if door.state is door.States.OPEN and self._effects_c.vacuum_resistance() not in self._player.effects:
-            die_in_void(inside=True)
+            return die_in_void(inside=True)
         self._player.environment = self._environments_c.cockpit()
         return "You enter the cockpit."
 
@@ -466,6 +520,21 @@ class RepairKitService(ItemService):
 
 class EngineService(Service[Engine]):
     object_type = Engine
+    rules = {
+        PlayerAction.HIT: [
+            Rule(
+                [Equipped("fire_axe")],
+                [
+                    SetState("engine", "BROKEN"),
+                    Say("You hit the engine with the axe. It breaks into pieces."),
+                ],
+            ),
+            Rule(
+                [ObjectState("engine", "FUELED")],
+                [SetState("engine", "WORKING"), Say("The engine start roaring.")],
+            ),
+        ],
+    }
 
     def _fill(self, cmd: "Command"):
         if cmd.preposition_object is not self._items_c.fuel_can():
@@ -477,16 +546,6 @@ class EngineService(Service[Engine]):
             return "You fill the engine."
         return "The engine is already fueled."
 
-    def _hit(self, cmd: "Command"):
-        engine = self._objects_c.engine()
-        if self._items_c.fire_axe() in self._player.equipped:
-            engine.state = engine.States.BROKEN
-            return "You hit the engine with the axe. It breaks into pieces."
-        if engine.state is engine.States.FUELED:
-            engine.state = engine.States.WORKING
-            return "The engine start roaring."
-        return super()._hit(cmd)
-
 
 class FuelCanService(ItemService):
     object_type = FuelCan
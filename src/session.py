@@ -0,0 +1,449 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Optional
+
+from src.metrics import Counter, MetricsRegistry
+from src.state import content_id, migrate_snapshot
+from src.tracing import tracer
+
+if TYPE_CHECKING:
+    from src.core import Engine
+    from src.state import WorldState
+    from src.worldgen import GeneratedWorld
+
+
+class Session:
+    """
+    A single player's game.
+
+    Attributes:
+    -----------
+    session_id : str
+        The id of the session.
+    snapshot : dict
+        The state of the world as this player left it.
+    turns : int
+        The amount of commands the player has sent.
+    last_active : float
+        Monotonic timestamp of the last command.
+    content : Optional[str]
+        The identity of the content the snapshot was taken on, see `content_id`.
+        None when it is unknown.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        snapshot: dict,
+        turns: int = 0,
+        content: Optional[str] = None,
+    ):
+        self.session_id = session_id
+        self.snapshot = snapshot
+        self.turns = turns
+        self.content = content
+        self.last_active = time.monotonic()
+
+    def __repr__(self):
+        return f"<Session {self.session_id} turns={self.turns}>"
+
+    def dump(self) -> dict:
+        return {
+            "snapshot": self.snapshot,
+            "turns": self.turns,
+            "content": self.content,
+        }
+
+    @classmethod
+    def load(cls, session_id: str, data: dict) -> "Session":
+        return cls(session_id, data["snapshot"], data["turns"], data.get("content"))
+
+
+class DiskSessionStore:
+    """Keeps evicted sessions, and the snapshots new games of content start from,
+    as JSON files in a local directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, session_id: str, data: dict) -> None:
+        path = self._path(session_id)
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+    def load(self, session_id: str) -> Optional[dict]:
+        try:
+            with open(self._path(session_id)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def save_content(self, content: str, initial_snapshot: dict) -> None:
+        """Keeps the snapshot new games of some content start from, so sessions
+        taken on it can be migrated by later processes."""
+        path = self._content_path(content)
+        if os.path.exists(path):
+            return
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(initial_snapshot, file, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+    def load_content(self, content: str) -> Optional[dict]:
+        try:
+            with open(self._content_path(content)) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def _path(self, session_id: str) -> str:
+        digest = hashlib.sha1(session_id.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _content_path(self, content: str) -> str:
+        return os.path.join(self.directory, f"content-{content}.json")
+
+
+class SessionMetrics:
+    """
+    Counters of the session manager.
+
+    Attributes:
+    -----------
+    hits : int
+        Commands for sessions that were resident.
+    misses : int
+        Commands for sessions that had to be rehydrated or created.
+    evictions : int
+        Sessions moved from memory to the store.
+    rehydration_latencies : deque[float]
+        Seconds spent loading the most recent rehydrated sessions.
+    """
+
+    def __init__(self, latency_window: int = 1024):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rehydrations = 0
+        self.rehydration_latencies = deque(maxlen=latency_window)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.rehydration_latencies)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "rehydrations": self.rehydrations,
+            "rehydration_latency_p50": _percentile(latencies, 0.50),
+            "rehydration_latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+class SessionManager:
+    """
+    Runs many games on a single engine. Only the least recently active sessions
+    are kept in memory; the others are evicted to the store and rehydrated
+    transparently on their next command.
+
+    The content can be replaced while sessions are running. Every replacement
+    starts a new generation, and the snapshot of a session taken on other
+    content is migrated the next time the session is loaded. The snapshots new
+    games of every content start from are kept in the store, so this works
+    across processes and restarts too.
+
+    Attributes:
+    -----------
+    engine : Engine
+        The engine executing the commands.
+    world_state : WorldState
+        Swaps the state of the sessions in and out of the world.
+    store : DiskSessionStore
+        Where evicted sessions and the initial snapshots of content are kept.
+    initial_snapshot : dict
+        The state new sessions start from.
+    max_sessions : int
+        The amount of sessions kept in memory.
+    max_bytes : Optional[int]
+        The approximate amount of memory the resident snapshots may take.
+    generation : int
+        The amount of times the content was replaced.
+    content : str
+        The identity of the current content, see `content_id`.
+    """
+
+    def __init__(
+        self,
+        engine: "Engine",
+        world_state: "WorldState",
+        store: DiskSessionStore,
+        initial_snapshot: dict,
+        max_sessions: int = 1000,
+        max_bytes: Optional[int] = None,
+    ):
+        self.engine = engine
+        self.world_state = world_state
+        self.store = store
+        self.initial_snapshot = initial_snapshot
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.metrics = SessionMetrics()
+        self._evictions: Optional[Counter] = None
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._loaded: Optional[Session] = None
+        self.generation = 0
+        self.content = content_id(initial_snapshot)
+        self._initial_snapshots = {self.content: initial_snapshot}
+        store.save_content(self.content, initial_snapshot)
+        # Held by commands, so content is only replaced in between them.
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def execute(self, session_id: str, user_input: str) -> str:
+        """Executes a line of user input in the given session and returns the
+        output."""
+        with self._lock:
+            session = self._load(session_id)
+            try:
+                finished = self.engine.execute(user_input)
+            except Exception:
+                # The world may be half-changed: the session is restored from its
+                # last snapshot on its next command.
+                self._loaded = None
+                self.engine.drain_output()
+                raise
+            output = self.engine.drain_output()
+
+            session.turns += 1
+            session.last_active = time.monotonic()
+            session.snapshot = self.world_state.capture()
+
+            if finished:
+                self.close(session_id)
+            else:
+                self._account(session)
+                self._evict()
+            return output
+
+    def complete(self, session_id: str, partial_input: str) -> list[str]:
+        """Returns the completions of a partial line of user input in the given
+        session."""
+        with self._lock:
+            self._load(session_id)
+            completions = self.engine.complete(partial_input)
+            self._evict()
+            return completions
+
+    def swap(
+        self, engine: "Engine", world_state: "WorldState", initial_snapshot: dict
+    ) -> int:
+        """Runs the sessions on new content from the next command on. Returns the
+        new generation."""
+        with self._lock:
+            self.engine = engine
+            self.world_state = world_state
+            self.initial_snapshot = initial_snapshot
+            self.generation += 1
+            self.content = content_id(initial_snapshot)
+            self._initial_snapshots[self.content] = initial_snapshot
+            self.store.save_content(self.content, initial_snapshot)
+            self._loaded = None
+            return self.generation
+
+    def reload(self, build: Callable[[], "GeneratedWorld"]) -> Future:
+        """Builds new content on a background thread, including the indexes of its
+        resolvers, while commands keep running on the current content. Then swaps
+        it in between two commands. The future's result is the new generation."""
+        future = Future()
+
+        def run():
+            try:
+                world = build()
+                world.warm_up()
+                world_state = world.create_world_state()
+                initial_snapshot = world_state.capture()
+                with self._lock:
+                    # A new engine replaces the configuration of the running one.
+                    engine = world.create_engine()
+                    generation = self.swap(engine, world_state, initial_snapshot)
+                future.set_result(generation)
+                logging.info("Swapped in content generation %d", generation)
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def close(self, session_id: str) -> None:
+        """Ends a session and forgets about it."""
+        session = self._sessions.pop(session_id, None)
+        self._sizes.pop(session_id, None)
+        if session is not None and session is self._loaded:
+            self._loaded = None
+        tracer.discard(session_id)
+        self.store.delete(session_id)
+
+    def detach(self, session_id: str) -> Optional[dict]:
+        """Removes a session, resident or stored, and returns its data so another
+        manager can attach it. Returns None for unknown sessions."""
+        session = self._sessions.get(session_id)
+        if session is None:
+            data = self.store.load(session_id)
+            session = Session.load(session_id, data) if data is not None else None
+        if session is None:
+            return None
+        self._migrate(session)
+        self.close(session_id)
+        return session.dump()
+
+    def attach(self, session_id: str, data: dict) -> None:
+        """Adds a session detached from another manager. It is migrated when it
+        was taken on other content."""
+        session = Session.load(session_id, data)
+        if self._loaded is not None and self._loaded.session_id == session_id:
+            self._loaded = None
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        self._account(session)
+        self._evict()
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """Exports the amount of resident sessions, the hit rate and the amount of
+        evictions."""
+        registry.gauge(
+            "textgame_active_sessions", "Sessions resident in memory.", self.__len__
+        )
+        registry.gauge(
+            "textgame_session_hit_rate",
+            "Fraction of commands for resident sessions.",
+            lambda: self.metrics.hit_rate,
+        )
+        self._evictions = registry.counter(
+            "textgame_session_evictions_total",
+            "Sessions moved from memory to the store.",
+        )
+        self._evictions.inc(amount=self.metrics.evictions)
+
+    def trace(self, session_id: str) -> str:
+        """Returns the recent trace events of a resident session."""
+        return tracer.dump(session_id)
+
+    def flush(self) -> None:
+        """Writes all resident sessions to the store."""
+        for session_id, session in self._sessions.items():
+            self.store.save(session_id, session.dump())
+
+    def _load(self, session_id: str) -> Session:
+        """Puts the session's state into the world."""
+        session = self._checkout(session_id)
+        tracer.set_session(session_id)
+        self._migrate(session)
+        if self._loaded is not session:
+            self.world_state.restore(session.snapshot)
+            self._loaded = session
+        return session
+
+    def _migrate(self, session: Session) -> None:
+        """Moves the snapshot of a session to the current content."""
+        if session.content == self.content:
+            return
+        old_initial = self._initial_snapshot(session.content)
+        if old_initial is None:
+            logging.warning(
+                "Migrating session %s from unknown content %s by key",
+                session.session_id,
+                session.content,
+            )
+        session.snapshot = migrate_snapshot(
+            session.snapshot, old_initial, self.initial_snapshot
+        )
+        session.content = self.content
+
+    def _initial_snapshot(self, content: Optional[str]) -> Optional[dict]:
+        """Returns the snapshot new games of some content start from, if known."""
+        if content is None:
+            return None
+        if content not in self._initial_snapshots:
+            initial_snapshot = self.store.load_content(content)
+            if initial_snapshot is None:
+                return None
+            self._initial_snapshots[content] = initial_snapshot
+        return self._initial_snapshots[content]
+
+    def _checkout(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self.metrics.hits += 1
+            self._sessions.move_to_end(session_id)
+            return session
+
+        self.metrics.misses += 1
+        started = time.perf_counter()
+        data = self.store.load(session_id)
+        if data is None:
+            session = Session(session_id, self.initial_snapshot, content=self.content)
+        else:
+            session = Session.load(session_id, data)
+            self.metrics.rehydrations += 1
+            self.metrics.rehydration_latencies.append(time.perf_counter() - started)
+            logging.debug("Rehydrated session %s", session_id)
+
+        self._sessions[session_id] = session
+        return session
+
+    def _account(self, session: Session) -> None:
+        if self.max_bytes is not None:
+            size = len(json.dumps(session.snapshot, separators=(",", ":")))
+            self._sizes[session.session_id] = size
+
+    def _over_budget(self) -> bool:
+        if len(self._sessions) > self.max_sessions:
+            return True
+        if self.max_bytes is not None and self.resident_bytes > self.max_bytes:
+            return len(self._sessions) > 1
+        return False
+
+    def _evict(self) -> None:
+        while self._over_budget():
+            session_id, session = self._sessions.popitem(last=False)
+            self._sizes.pop(session_id, None)
+            if session is self._loaded:
+                self._loaded = None
+            self.store.save(session_id, session.dump())
+            tracer.discard(session_id)
+            self.metrics.evictions += 1
+            if self._evictions is not None:
+                self._evictions.inc()
+            logging.debug("Evicted session %s", session_id)
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
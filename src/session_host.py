@@ -0,0 +1,377 @@
+"""Runs sessions on several worker processes, so turns use all cores.
+
+Usage: python -m src.session_host [--workers 1,2,4] [--sessions N] [--turns N]
+"""
+import argparse
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from src.session import SessionManager
+    from src.worldgen import GeneratedWorld
+
+
+class HashRing:
+    """
+    Consistent hashing of keys onto nodes. Every node is placed on the ring many
+    times, so keys spread evenly and adding or removing a node only moves the
+    keys of that node.
+
+    Attributes:
+    -----------
+    replicas : int
+        The amount of places of every node on the ring.
+    """
+
+    def __init__(self, nodes: list[int] = None, replicas: int = 64):
+        self.replicas = replicas
+        self._hashes: list[int] = []
+        self._nodes: list[int] = []
+        for node in nodes or []:
+            self.add(node)
+
+    def __len__(self):
+        return len(set(self._nodes))
+
+    def __contains__(self, node: int):
+        return node in self._nodes
+
+    def add(self, node: int) -> None:
+        for replica in range(self.replicas):
+            hash_ = _hash(f"{node}:{replica}")
+            index = bisect.bisect(self._hashes, hash_)
+            self._hashes.insert(index, hash_)
+            self._nodes.insert(index, node)
+
+    def remove(self, node: int) -> None:
+        kept = [(h, n) for h, n in zip(self._hashes, self._nodes) if n != node]
+        self._hashes = [h for h, _ in kept]
+        self._nodes = [n for _, n in kept]
+
+    def node(self, key: str) -> int:
+        """Returns the node owning the key: the first one clockwise of its hash."""
+        if not self._hashes:
+            raise ValueError("The ring has no nodes")
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+class SessionHost:
+    """
+    Routes sessions to worker processes, each running its own SessionManager, by
+    consistent hashing of the session id. Commands are sent over a pipe per
+    worker and answered in order, so a worker is never idle while commands are
+    queued for it, and throughput grows with the amount of workers.
+
+    When a worker is added or removed, the sessions that change owner are
+    detached from their old worker and attached to the new one as snapshots.
+    Commands sent in the meantime wait for the migration, and never see a
+    session in two places.
+
+    New content is built by every worker in the background and swapped in
+    between two commands, see `SessionManager.reload`. Workers added later
+    build it before they take over sessions.
+
+    Attributes:
+    -----------
+    manager_factory : Callable[[str], SessionManager]
+        Builds the session manager of a worker, given a directory for the
+        sessions it evicts. Must be picklable.
+    """
+
+    def __init__(
+        self,
+        manager_factory: Callable[[str], "SessionManager"],
+        workers: int = None,
+        replicas: int = 64,
+    ):
+        self.manager_factory = manager_factory
+        self._ring = HashRing(replicas=replicas)
+        self._workers: dict[int, _Worker] = {}
+        self._sessions: set[str] = set()
+        self._routing = threading.Lock()
+        self._directory = TemporaryDirectory()
+        self._next_id = 0
+        self._build: Optional[Callable[[], "GeneratedWorld"]] = None
+        for _ in range(workers or os.cpu_count() or 1):
+            self.add_worker()
+
+    @property
+    def workers(self) -> list[int]:
+        return list(self._workers)
+
+    @property
+    def pids(self) -> list[int]:
+        """The process ids of the workers."""
+        return [worker.pid for worker in self._workers.values()]
+
+    def submit(self, session_id: str, user_input: str) -> Future:
+        """Sends a line of user input to the session's worker. The future's result
+        is the output."""
+        with self._routing:
+            self._sessions.add(session_id)
+            worker = self._workers[self._ring.node(session_id)]
+            return worker.send("execute", session_id, user_input)
+
+    def execute(self, session_id: str, user_input: str) -> str:
+        return self.submit(session_id, user_input).result()
+
+    def complete(self, session_id: str, partial_input: str) -> list[str]:
+        with self._routing:
+            worker = self._workers[self._ring.node(session_id)]
+            future = worker.send("complete", session_id, partial_input)
+        return future.result()
+
+    def close(self, session_id: str) -> None:
+        with self._routing:
+            self._sessions.discard(session_id)
+            worker = self._workers[self._ring.node(session_id)]
+            future = worker.send("close", session_id)
+        future.result()
+
+    def add_worker(self) -> int:
+        """Starts a worker and moves the sessions it now owns to it. Returns its
+        id."""
+        with self._routing:
+            worker_id = self._next_id
+            self._next_id += 1
+            directory = os.path.join(self._directory.name, str(worker_id))
+            worker = _Worker(self.manager_factory, directory)
+            self._workers[worker_id] = worker
+            if self._build is not None:
+                worker.send("reload", self._build).result()
+                _wait_reloaded([worker])
+            owners = self._owners()
+            self._ring.add(worker_id)
+            self._migrate(owners)
+        return worker_id
+
+    def remove_worker(self, worker_id: int) -> None:
+        """Moves the sessions of a worker to the others and stops it."""
+        with self._routing:
+            if len(self._workers) == 1:
+                raise ValueError("Can't remove the last worker")
+            owners = self._owners()
+            self._ring.remove(worker_id)
+            self._migrate(owners)
+            self._workers.pop(worker_id).stop()
+
+    def reload(
+        self, build: Callable[[], "GeneratedWorld"], timeout: float = 60.0
+    ) -> None:
+        """Makes every worker build new content in the background and swap it in.
+        Commands keep being answered meanwhile. Returns once all workers run on
+        the new content. `build` must be picklable."""
+        with self._routing:
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.send("reload", build).result()
+            self._build = build
+        _wait_reloaded(workers, timeout)
+
+    def shutdown(self) -> None:
+        with self._routing:
+            for worker in self._workers.values():
+                worker.stop()
+            self._workers = {}
+        self._directory.cleanup()
+
+    def _owners(self) -> dict[str, int]:
+        if not len(self._ring):
+            return {}
+        return {
+            session_id: self._ring.node(session_id) for session_id in self._sessions
+        }
+
+    def _migrate(self, owners: dict[str, int]) -> None:
+        """Moves the sessions whose owner changed since `owners` was taken."""
+        moves: dict[tuple[int, int], list[str]] = {}
+        for session_id, old in owners.items():
+            new = self._ring.node(session_id)
+            if new != old:
+                moves.setdefault((old, new), []).append(session_id)
+
+        for (old, new), session_ids in moves.items():
+            # Pipes are ordered: the old worker detaches after finishing the
+            # commands already sent, and the new worker attaches before any
+            # command sent after the migration.
+            detached = self._workers[old].send("detach_many", session_ids).result()
+            self._workers[new].send("attach_many", detached).result()
+            gone = set(session_ids) - set(detached)
+            self._sessions -= gone
+            logging.debug(
+                "Moved %d sessions from worker %d to %d", len(detached), old, new
+            )
+
+    def __enter__(self) -> "SessionHost":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+class _Worker:
+    """A worker process, and the futures of the requests it hasn't answered."""
+
+    def __init__(
+        self, manager_factory: Callable[[str], "SessionManager"], directory: str
+    ):
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(child, manager_factory, directory), daemon=True
+        )
+        self._process.start()
+        child.close()
+        self._pending: deque[Future] = deque()
+        self._lock = threading.Lock()
+        self._receiver = threading.Thread(target=self._receive, daemon=True)
+        self._receiver.start()
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+    def send(self, *request: Any) -> Future:
+        future = Future()
+        with self._lock:
+            self._pending.append(future)
+            self._connection.send(request)
+        return future
+
+    def stop(self) -> None:
+        self.send("stop").result()
+        self._receiver.join()
+        self._process.join()
+        self._connection.close()
+
+    def _receive(self) -> None:
+        while True:
+            try:
+                status, value = self._connection.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.popleft()
+            if status == "error":
+                future.set_exception(value)
+                continue
+            future.set_result(value)
+            if status == "stopped":
+                break
+        while self._pending:
+            self._pending.popleft().set_exception(
+                RuntimeError("The worker process exited")
+            )
+
+
+def _serve(
+    connection: "Connection",
+    manager_factory: Callable[[str], "SessionManager"],
+    directory: str,
+) -> None:
+    """The loop of a worker process: answers requests in order."""
+    manager = manager_factory(directory)
+
+    def detach_many(session_ids: list[str]) -> dict[str, dict]:
+        detached = {}
+        for session_id in session_ids:
+            data = manager.detach(session_id)
+            if data is not None:
+                detached[session_id] = data
+        return detached
+
+    def attach_many(sessions: dict[str, dict]) -> None:
+        for session_id, data in sessions.items():
+            manager.attach(session_id, data)
+
+    reloads: list[Future] = []
+
+    def reload(build: Callable[[], "GeneratedWorld"]) -> None:
+        reloads.append(manager.reload(build))
+
+    def reloaded() -> bool:
+        """Whether the last reload is done. Raises its error if it failed."""
+        if not reloads[-1].done():
+            return False
+        reloads[-1].result()
+        return True
+
+    handlers = {
+        "execute": manager.execute,
+        "complete": manager.complete,
+        "close": manager.close,
+        "detach_many": detach_many,
+        "attach_many": attach_many,
+        "reload": reload,
+        "reloaded": reloaded,
+    }
+    while True:
+        name, *args = connection.recv()
+        if name == "stop":
+            connection.send(("stopped", None))
+            return
+        try:
+            connection.send(("ok", handlers[name](*args)))
+        except Exception as e:
+            connection.send(("error", e))
+
+
+def _wait_reloaded(workers: list[_Worker], timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    waiting = list(workers)
+    while True:
+        waiting = [w for w in waiting if not w.send("reloaded").result()]
+        if not waiting:
+            return
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{len(waiting)} workers didn't reload in time")
+        time.sleep(0.01)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+def measure(workers: int, sessions: int, turns: int) -> float:
+    """Returns the turns per second of scripted players, all sending their next
+    command before waiting for the answers."""
+    from src.bench.load_generator import create_target
+    from src.bench.playthroughs import WINNING_PLAYTHROUGH
+
+    factory = partial(create_target, max_sessions=sessions)
+    with SessionHost(factory, workers) as host:
+        session_ids = [f"player-{i}" for i in range(sessions)]
+        started = time.perf_counter()
+        for turn in range(turns):
+            line = WINNING_PLAYTHROUGH[turn % len(WINNING_PLAYTHROUGH)]
+            futures = [host.submit(session_id, line) for session_id in session_ids]
+            for future in futures:
+                future.result()
+        return sessions * turns / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=31)
+    args = parser.parse_args()
+
+    for workers in sorted({int(n) for n in args.workers.split(",")}):
+        turns_per_sec = measure(workers, args.sessions, args.turns)
+        print(f"{workers:>3} workers: {turns_per_sec:>8.0f} turns/s")
+
+
+if __name__ == "__main__":
+    main()
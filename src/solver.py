@@ -0,0 +1,284 @@
+"""Finds the shortest winning command sequence with a breadth-first search over
+the reachable states of the game.
+
+Usage: python -m src.solver [--max-states N]
+"""
+import argparse
+import copy
+import hashlib
+import json
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from src.enums import GameOutcome, PlayerAction
+from src.outcome import GameOver
+
+if TYPE_CHECKING:
+    from src.command import Command
+    from src.core import Engine
+    from src.state import WorldState
+
+DIGEST_SIZE = 16
+
+# Lists of the snapshot whose order doesn't matter to the game.
+_UNORDERED = ("inventory", "equipped", "effects")
+
+
+class SearchResult:
+    """
+    The outcome of a search.
+
+    Attributes:
+    -----------
+    commands : Optional[list[str]]
+        The shortest winning command sequence, or None if none was found.
+    states : int
+        The amount of distinct states that were reached.
+    complete : bool
+        Whether every reachable state was searched. When no win was found, the
+        game is unwinnable only if the search was complete.
+    seconds : float
+        How long the search took.
+    """
+
+    def __init__(
+        self,
+        commands: Optional[list[str]],
+        states: int,
+        complete: bool,
+        seconds: float,
+    ):
+        self.commands = commands
+        self.states = states
+        self.complete = complete
+        self.seconds = seconds
+
+    def __repr__(self):
+        commands = len(self.commands or [])
+        return f"<SearchResult {commands} commands, {self.states} states>"
+
+    @property
+    def winnable(self) -> Optional[bool]:
+        if self.commands is not None:
+            return True
+        return False if self.complete else None
+
+
+class Solver:
+    """
+    Searches the states reachable from the current state of the world. Every
+    candidate command runs through the engine's parser, validator and services, so
+    the search follows the rules of the game exactly.
+
+    A state is a snapshot of the world, in which the order of the player's
+    inventory, equipment and effects is ignored. The visited set only keeps a
+    16-byte digest per state, and the frontier keeps states serialized, so
+    millions of states fit in memory. The candidate commands only depend on the
+    objects in scope, so they are listed and parsed once per scope and then
+    only validated in every state.
+
+    Attributes:
+    -----------
+    engine : Engine
+        The engine of the world.
+    world_state : WorldState
+        Captures and restores the states of the world.
+    max_states : Optional[int]
+        Stops the search after reaching this amount of states.
+    """
+
+    def __init__(
+        self,
+        engine: "Engine",
+        world_state: "WorldState",
+        max_states: Optional[int] = None,
+    ):
+        self.engine = engine
+        self.world_state = world_state
+        self.max_states = max_states
+        # The parsed candidate commands per scope, by the ids of its objects.
+        self._prepared: dict[tuple[int, ...], list[tuple[str, "Command"]]] = {}
+
+    def solve(self) -> SearchResult:
+        """Returns the shortest winning command sequence from the current state.
+        The world is put back into the current state afterwards."""
+        started = time.perf_counter()
+        start = self.world_state.capture()
+        serialized = encode(start)
+        visited = {digest(serialized)}
+        # (serialized state, digest, path) where the path is (parent path, command)
+        frontier = deque([(serialized, digest(serialized), None)])
+        limited = False
+        try:
+            while frontier and not limited:
+                serialized, state_digest, path = frontier.popleft()
+                for command, result in self.expand(serialized, state_digest):
+                    if isinstance(result, GameOver):
+                        if result.outcome is GameOutcome.WIN:
+                            return SearchResult(
+                                _commands((path, command)),
+                                len(visited),
+                                False,
+                                time.perf_counter() - started,
+                            )
+                        continue
+                    child, child_digest = result
+                    if child_digest in visited:
+                        continue
+                    if self.max_states and len(visited) >= self.max_states:
+                        limited = True
+                        break
+                    visited.add(child_digest)
+                    frontier.append((child, child_digest, (path, command)))
+        finally:
+            self.world_state.restore(start)
+            self.engine.drain_output()
+        elapsed = time.perf_counter() - started
+        return SearchResult(None, len(visited), not limited, elapsed)
+
+    def commands(self) -> Iterator[str]:
+        """Yields the commands worth trying in the current state: every usage of
+        every action with the objects in scope that support it."""
+        scope = self._scope()
+        for action, usages in self.engine.config.action_usage_mapping.items():
+            if action in (PlayerAction.QUIT, PlayerAction.HELP):
+                continue
+            action_str = str(action).lower()
+            for usage in usages:
+                if not usage.object_types:
+                    yield action_str
+                    continue
+                for object_ in scope:
+                    if action not in object_.interactions:
+                        continue
+                    if not isinstance(object_, tuple(usage.object_types)):
+                        continue
+                    if not usage.preposition:
+                        yield f"{action_str} {object_.name}"
+                        continue
+                    preposition = str(usage.preposition).lower()
+                    for preposition_object in scope:
+                        if preposition_object is object_ or not isinstance(
+                            preposition_object, tuple(usage.preposition_object_types)
+                        ):
+                            continue
+                        yield (
+                            f"{action_str} {object_.name} "
+                            f"{preposition} {preposition_object.name}"
+                        )
+
+    def _scope(self) -> list:
+        player = self.engine.player
+        scope = list(player.inventory)
+        scope += [o for o in player.environment.objects_and_items if o not in scope]
+        return scope
+
+    def _prepared_commands(self) -> list[tuple[str, "Command"]]:
+        """Returns the commands worth trying in the current state with their parsed
+        commands, see `commands`."""
+        key = tuple(map(id, self._scope()))
+        prepared = self._prepared.get(key)
+        if prepared is None:
+            prepared = self._prepared[key] = [
+                (user_input, command)
+                for user_input in self.commands()
+                if (command := self.engine.prepare_command(user_input))
+            ]
+            self.engine.drain_output()
+        return prepared
+
+    def expand(self, serialized: str, state_digest: bytes) -> Iterator[tuple]:
+        """Yields (command, GameOver) for the commands ending the game and
+        (command, (serialized state, digest)) for the others."""
+        snapshot = json.loads(serialized)
+        self.world_state.restore(snapshot)
+        changed = False
+        for command, prepared in self._prepared_commands():
+            if changed:
+                self.world_state.restore(snapshot)
+            response = self.engine.try_command(copy.copy(prepared))
+            if response is None:
+                # Rejected commands don't change the world.
+                continue
+            if isinstance(response, GameOver):
+                changed = True
+                yield command, response
+                continue
+            child = encode(self.world_state.capture())
+            child_digest = digest(child)
+            changed = child_digest != state_digest
+            yield command, (child, child_digest)
+        self.engine.drain_output()
+
+
+def encode(snapshot: dict) -> str:
+    """Returns the state of a snapshot as compact JSON, ignoring the order of the
+    player's inventory, equipment and effects."""
+    player = dict(snapshot["player"])
+    for key in _UNORDERED:
+        player[key] = sorted(player[key])
+    return json.dumps({**snapshot, "player": player}, separators=(",", ":"))
+
+
+def digest(encoded: str) -> bytes:
+    return hashlib.blake2b(encoded.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+def _commands(path: Optional[tuple]) -> list[str]:
+    commands = []
+    while path is not None:
+        path, command = path
+        commands.append(command)
+    return commands[::-1]
+
+
+def main():
+    from src.bench.playthroughs import new_game
+    from src.command import CommandValidator
+    from src.config import Config
+    from src.containers import (
+        Effects,
+        Environments,
+        Globals,
+        Items,
+        Objects,
+        Resolvers,
+        Services,
+    )
+    from src.core import Engine
+    from src.state import WorldState
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-states", type=int)
+    args = parser.parse_args()
+
+    player = Globals.player()
+    new_game(player)
+    engine = Engine(
+        player=player,
+        items_c=Items,
+        objects_c=Objects,
+        services_c=Services,
+        resolvers_c=Resolvers,
+        command_validator=CommandValidator(
+            player=player,
+            command_object_r=Resolvers.command_object(),
+            config=Config,
+        ),
+        config=Config,
+    )
+    world_state = WorldState(player, Effects, Items, Objects, Environments)
+
+    result = Solver(engine, world_state, args.max_states).solve()
+    for command in result.commands or []:
+        print(command)
+    status = {True: "winnable", False: "unwinnable", None: "unknown"}
+    print(
+        f"{status[result.winnable]}: {len(result.commands or [])} commands, "
+        f"{result.states} states in {result.seconds:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
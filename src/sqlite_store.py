@@ -0,0 +1,273 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS profiles (
+        session_id TEXT PRIMARY KEY,
+        profile TEXT NOT NULL,
+        updated REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS saves (
+        session_id TEXT PRIMARY KEY,
+        save TEXT NOT NULL,
+        updated REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS journal_offsets (
+        session_id TEXT PRIMARY KEY,
+        journal_offset INTEGER NOT NULL,
+        updated REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS contents (
+        content_id TEXT PRIMARY KEY,
+        initial_snapshot TEXT NOT NULL
+    )
+    """,
+)
+
+UPSERT_PROFILE = (
+    "INSERT INTO profiles (session_id, profile, updated) VALUES (?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET profile=excluded.profile, updated=excluded.updated"
+)
+UPSERT_SAVE = (
+    "INSERT INTO saves (session_id, save, updated) VALUES (?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET save=excluded.save, updated=excluded.updated"
+)
+UPSERT_JOURNAL_OFFSET = (
+    "INSERT INTO journal_offsets (session_id, journal_offset, updated) VALUES (?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET "
+    "journal_offset=excluded.journal_offset, updated=excluded.updated"
+)
+SELECT_PROFILE = "SELECT profile FROM profiles WHERE session_id = ?"
+SELECT_SAVE = "SELECT save FROM saves WHERE session_id = ?"
+SELECT_JOURNAL_OFFSET = "SELECT journal_offset FROM journal_offsets WHERE session_id = ?"
+INSERT_CONTENT = (
+    "INSERT OR IGNORE INTO contents (content_id, initial_snapshot) VALUES (?, ?)"
+)
+SELECT_CONTENT = "SELECT initial_snapshot FROM contents WHERE content_id = ?"
+DELETE_STATEMENTS = (
+    "DELETE FROM profiles WHERE session_id = ?",
+    "DELETE FROM saves WHERE session_id = ?",
+    "DELETE FROM journal_offsets WHERE session_id = ?",
+)
+
+
+class ConnectionPool:
+    """
+    A fixed amount of SQLite connections in WAL mode, shared between threads.
+
+    Attributes:
+    -----------
+    path : str
+        The path of the database file.
+    size : int
+        The amount of connections.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self.size = size
+        self._connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=64,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        for _ in range(self.size):
+            self._connections.get().close()
+
+
+class SQLiteSessionStore:
+    """
+    Persists player profiles, saved games and journal offsets in a local SQLite
+    database. Writes are queued and coalesced per session, so a session that
+    changes many times within a flush interval costs a single upsert.
+
+    Can be used as the store of a SessionManager.
+
+    Attributes:
+    -----------
+    pool : ConnectionPool
+        The connections to the database.
+    flush_interval : Optional[float]
+        Seconds between background flushes. Writes are only flushed on demand
+        when this is None.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        flush_interval: Optional[float] = 0.5,
+    ):
+        self.pool = ConnectionPool(path, pool_size)
+        self.flush_interval = flush_interval
+        self.flushed_rows = 0
+        self._pending: dict[str, dict] = {}
+        # The changes being written, readable until they are committed.
+        self._flushing: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._create_schema()
+
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def _create_schema(self) -> None:
+        with self.pool.connection() as connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+    def save(self, session_id: str, data: dict) -> None:
+        """Queues a saved game. The turn count is stored as the journal offset."""
+        self._queue(
+            session_id,
+            save=json.dumps(data, separators=(",", ":")),
+            journal_offset=data.get("turns", 0),
+        )
+
+    def save_profile(self, session_id: str, profile: dict) -> None:
+        self._queue(session_id, profile=json.dumps(profile, separators=(",", ":")))
+
+    def save_journal_offset(self, session_id: str, journal_offset: int) -> None:
+        self._queue(session_id, journal_offset=journal_offset)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._pending[session_id] = {"deleted": True}
+
+    def load(self, session_id: str) -> Optional[dict]:
+        """Returns the saved game of a session, including writes not yet flushed."""
+        save = self._read(session_id, "save", SELECT_SAVE)
+        return json.loads(save) if save is not None else None
+
+    def load_profile(self, session_id: str) -> Optional[dict]:
+        profile = self._read(session_id, "profile", SELECT_PROFILE)
+        return json.loads(profile) if profile is not None else None
+
+    def load_journal_offset(self, session_id: str) -> Optional[int]:
+        return self._read(session_id, "journal_offset", SELECT_JOURNAL_OFFSET)
+
+    def save_content(self, content: str, initial_snapshot: dict) -> None:
+        """Keeps the snapshot new games of some content start from. Written right
+        away, as it only changes when content is reloaded."""
+        snapshot = json.dumps(initial_snapshot, separators=(",", ":"))
+        with self.pool.connection() as connection:
+            connection.execute(INSERT_CONTENT, (content, snapshot))
+
+    def load_content(self, content: str) -> Optional[dict]:
+        with self.pool.connection() as connection:
+            row = connection.execute(SELECT_CONTENT, (content,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def flush(self) -> int:
+        """Writes all queued changes. Returns the amount of upserted rows."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._flushing = pending
+            if not pending:
+                return 0
+
+            now = time.time()
+            deletes = [(k,) for k, v in pending.items() if v.get("deleted")]
+            profiles = [(k, v["profile"], now) for k, v in pending.items() if "profile" in v]
+            saves = [(k, v["save"], now) for k, v in pending.items() if "save" in v]
+            offsets = [
+                (k, v["journal_offset"], now)
+                for k, v in pending.items()
+                if "journal_offset" in v
+            ]
+
+            with self.pool.connection() as connection:
+                connection.execute("BEGIN")
+                try:
+                    for statement in DELETE_STATEMENTS:
+                        connection.executemany(statement, deletes)
+                    connection.executemany(UPSERT_PROFILE, profiles)
+                    connection.executemany(UPSERT_SAVE, saves)
+                    connection.executemany(UPSERT_JOURNAL_OFFSET, offsets)
+                    connection.execute("COMMIT")
+                except Exception:
+                    connection.execute("ROLLBACK")
+                    with self._lock:
+                        for session_id, changes in pending.items():
+                            newer = self._pending.get(session_id, {})
+                            if not newer.get("deleted"):
+                                # A newer delete drops the older changes.
+                                self._pending[session_id] = {**changes, **newer}
+                        self._flushing = {}
+                    raise
+                with self._lock:
+                    self._flushing = {}
+
+            rows = len(profiles) + len(saves) + len(offsets)
+            self.flushed_rows += rows
+            return rows
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self.pool.close()
+
+    def _queue(self, session_id: str, **changes) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(session_id, {})
+            pending.update(changes)
+
+    def _read(self, session_id: str, field: str, query: str):
+        with self._lock:
+            for changes in [self._pending, self._flushing]:
+                pending = changes.get(session_id)
+                if pending is not None:
+                    if field in pending:
+                        return pending[field]
+                    if pending.get("deleted"):
+                        return None
+
+        with self.pool.connection() as connection:
+            row = connection.execute(query, (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                logging.exception("Flushing the session store failed")
@@ -0,0 +1,255 @@
+import copy
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from src.containers import CustomContainer, Effects, Items, Objects, Environments
+    from src.object.base import Interactable
+    from src.player import Player
+
+
+class WorldState:
+    """
+    Captures and restores the mutable state of the game world. Everything in the
+    game universe is a singleton, so a snapshot is a plain, JSON-serializable dict
+    that refers to objects by their container key. It also lists the keys of the
+    effects, so the content a snapshot was taken on tells which effects exist.
+
+    Attributes:
+    -----------
+    _player : Player
+        The player.
+    _effects_c : Effects
+        The effects container.
+    _items_c : Items
+        The items container.
+    _objects_c : Objects
+        The objects container.
+    _environments_c : Environments
+        The environments container.
+    """
+
+    def __init__(
+        self,
+        player: "Player",
+        effects_c: type["Effects"],
+        items_c: type["Items"],
+        objects_c: type["Objects"],
+        environments_c: type["Environments"],
+    ):
+        self._player = player
+        self._effects_c = effects_c
+        self._items_c = items_c
+        self._objects_c = objects_c
+        self._environments_c = environments_c
+        self._members: dict[type, dict[str, Any]] = {}
+        self._keys_by_id: dict[type, dict[int, str]] = {}
+
+    def capture(self) -> dict:
+        """Returns a snapshot of the current state of the world."""
+        player = self._player
+        return {
+            "player": {
+                "environment": self._key(self._environments_c, player.environment),
+                "inventory": self._keys(self._items_c, player.inventory),
+                "equipped": self._keys(self._items_c, player.equipped),
+                "effects": self._keys(self._effects_c, player.effects),
+            },
+            "objects": {
+                key: self._capture_interactable(object_)
+                for key, object_ in self._instances(self._objects_c).items()
+            },
+            "items": {
+                key: self._capture_interactable(item)
+                for key, item in self._instances(self._items_c).items()
+            },
+            "environments": {
+                key: {
+                    "objects": self._keys(self._objects_c, environment.objects),
+                    "items": self._keys(self._items_c, environment.items),
+                }
+                for key, environment in self._instances(self._environments_c).items()
+            },
+            "effects": list(self._instances(self._effects_c)),
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """Puts the world back into the state described by the snapshot."""
+        player = self._player
+        player.environment = self._get(
+            self._environments_c, snapshot["player"]["environment"]
+        )
+        player.inventory = self._gets(self._items_c, snapshot["player"]["inventory"])
+        player.equipped = self._gets(self._items_c, snapshot["player"]["equipped"])
+        player.effects = self._gets(self._effects_c, snapshot["player"]["effects"])
+
+        for key, state in snapshot["objects"].items():
+            self._restore_interactable(self._get(self._objects_c, key), state)
+        for key, state in snapshot["items"].items():
+            self._restore_interactable(self._get(self._items_c, key), state)
+
+        for key, contents in snapshot["environments"].items():
+            environment = self._get(self._environments_c, key)
+            environment.objects = self._gets(self._objects_c, contents["objects"])
+            environment.items = self._gets(self._items_c, contents["items"])
+
+    def _capture_interactable(self, interactable: "Interactable") -> dict:
+        captured = {"state": self._state_name(interactable)}
+        if getattr(interactable, "_references", None) is not None:
+            captured["references"] = list(interactable._references)
+        if getattr(interactable, "items", None) is not None:
+            captured["items"] = self._keys(self._items_c, interactable.items)
+        return captured
+
+    def _restore_interactable(self, interactable: "Interactable", captured: dict):
+        if captured["state"] is not None:
+            interactable.state = getattr(interactable.States, captured["state"])
+        elif getattr(interactable, "state", None) is not None:
+            interactable.state = None
+        if "references" in captured:
+            interactable._references = list(captured["references"])
+        if "items" in captured:
+            interactable.items = self._gets(self._items_c, captured["items"])
+
+    @staticmethod
+    def _state_name(interactable: "Interactable") -> Optional[str]:
+        state = getattr(interactable, "state", None)
+        if state is None:
+            return None
+        for name, value in vars(type(interactable).States).items():
+            if value is state:
+                return name
+        raise ValueError(f"Unknown state for {interactable}: {state}")
+
+    def _instances(self, container: type["CustomContainer"]) -> dict[str, Any]:
+        if container not in self._members:
+            self._members[container] = {
+                key: provider() for key, provider in container.members().items()
+            }
+        return self._members[container]
+
+    def _key(self, container: type["CustomContainer"], instance: Any) -> Optional[str]:
+        if instance is None:
+            return None
+        if container not in self._keys_by_id:
+            self._keys_by_id[container] = {
+                id(v): k for k, v in self._instances(container).items()
+            }
+        try:
+            return self._keys_by_id[container][id(instance)]
+        except KeyError:
+            raise ValueError(f"Not in {container.__name__}: {instance}")
+
+    def _keys(self, container: type["CustomContainer"], instances: list) -> list[str]:
+        return [self._key(container, instance) for instance in instances or []]
+
+    def _get(self, container: type["CustomContainer"], key: Optional[str]) -> Any:
+        if key is None:
+            return None
+        return self._instances(container)[key]
+
+    def _gets(self, container: type["CustomContainer"], keys: list[str]) -> list:
+        return [self._get(container, key) for key in keys]
+
+
+def content_id(initial_snapshot: dict) -> str:
+    """Returns the identity of content, given by the snapshot new games start
+    from. It is the same in every process running the same content."""
+    encoded = json.dumps(initial_snapshot, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def migrate_snapshot(
+    snapshot: dict, old_initial: Optional[dict], new_initial: dict
+) -> dict:
+    """
+    Returns a snapshot taken on old content moved to new content, both given by
+    the snapshots new games start from. Everything is matched by its container
+    key. What the player left as the old content started it takes the new
+    content's value; what the player changed is kept, without what the new
+    content removed. What the new content adds is placed where it puts it.
+
+    When the old content is unknown, everything in the snapshot is kept as the
+    player's, and only what the snapshot lacks is taken from the new content.
+    Effects are kept unless the new content lists its effects without them.
+    """
+    objects = new_initial["objects"]
+    items = new_initial["items"]
+    effects = new_initial.get("effects")
+    if old_initial is None:
+        old_initial = {"player": {}, "objects": {}, "items": {}, "environments": {}}
+        known = set(snapshot["objects"]) | set(snapshot["items"])
+    else:
+        known = set(old_initial["objects"]) | set(old_initial["items"])
+
+    def merge(current: Any, old: Any, new: Any, keys: Optional[dict] = None) -> Any:
+        if current == old:
+            return copy.deepcopy(new)
+        if keys is None:
+            return copy.deepcopy(current)
+        kept = [key for key in current if key in keys]
+        return kept + [key for key in new if key not in known and key not in kept]
+
+    def migrate(section: str, key: str, fields: dict[str, Optional[dict]]) -> dict:
+        new = new_initial[section][key]
+        if key not in snapshot[section]:
+            return copy.deepcopy(new)
+        current = snapshot[section][key]
+        old = old_initial[section].get(key, {})
+        return {
+            name: merge(current.get(name), old.get(name), value, fields.get(name))
+            if name in current
+            else copy.deepcopy(value)
+            for name, value in new.items()
+        }
+
+    player = snapshot["player"]
+    old_player = old_initial["player"]
+    new_player = new_initial["player"]
+    environment = player["environment"]
+    if (
+        environment == old_player.get("environment")
+        or environment not in new_initial["environments"]
+    ):
+        environment = new_player["environment"]
+    migrated = {
+        "player": {
+            "environment": environment,
+            "inventory": merge(
+                player["inventory"],
+                old_player.get("inventory"),
+                new_player["inventory"],
+                items,
+            ),
+            "equipped": merge(
+                player["equipped"],
+                old_player.get("equipped"),
+                new_player["equipped"],
+                items,
+            ),
+            "effects": [
+                key for key in player["effects"] if effects is None or key in effects
+            ],
+        },
+        "objects": {
+            key: migrate("objects", key, {"items": items}) for key in objects
+        },
+        "items": {key: migrate("items", key, {"items": items}) for key in items},
+        "environments": {
+            key: migrate("environments", key, {"objects": objects, "items": items})
+            for key in new_initial["environments"]
+        },
+    }
+    if effects is not None:
+        migrated["effects"] = list(effects)
+
+    # An item the player moved may also be where the new content puts it.
+    seen = set(migrated["player"]["inventory"])
+    for section, field in [("environments", "items"), ("objects", "items")]:
+        for contents in migrated[section].values():
+            if field not in contents:
+                continue
+            contents[field] = [key for key in contents[field] if key not in seen]
+            seen.update(contents[field])
+    return migrated
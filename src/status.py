@@ -0,0 +1,132 @@
+"""Facts derived from the world, kept up to date by change events rather than
+recomputed on every query."""
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+from weakref import WeakKeyDictionary
+
+from src.events import EventBus, events
+
+if TYPE_CHECKING:
+    from src.environment import Environment
+    from src.rules import Rule
+    from src.service import Service
+
+
+class ShipStatus:
+    """
+    Whether the ship is ready for takeoff, and what inspecting the control panel
+    shows, derived from the rules of inspecting it. Every rule with conditions
+    is a fact, and the ship is ready when none holds. A change to something
+    the conditions of a fact read only marks the fact stale, and stale facts
+    are re-evaluated when the status is next read, so changing the world
+    doesn't evaluate any condition.
+    """
+
+    def __init__(
+        self, service: "Service", rules: Iterable["Rule"], bus: EventBus = events
+    ):
+        # (the fact, or None for a rule without conditions, its output, final)
+        self._rules: list[tuple[Optional[int], Callable[[], str], bool]] = []
+        self._facts: list[Callable[[], bool]] = []
+        self._dependents: dict[tuple[int, str], list[int]] = {}
+        for rule in rules:
+            output = self._output(rule, service)
+            if not rule.conditions:
+                self._rules.append((None, output, rule.final))
+                continue
+            fact = len(self._facts)
+            self._rules.append((fact, output, rule.final))
+            self._facts.append(self._holds(rule, service))
+            for key in rule.reads():
+                subject, attribute = self._subject(key, service)
+                self._dependents.setdefault((id(subject), attribute), []).append(fact)
+                if self._changed not in subject._subscribers:
+                    bus.subscribe(self._changed, subject)
+
+        self._holding = [holds() for holds in self._facts]
+        self._stale: set[int] = set()
+        self._derive()
+
+    @property
+    def ready(self) -> bool:
+        """Whether no rule with conditions matches, so the control panel only shows
+        its description."""
+        if self._stale:
+            self._refresh()
+        return self._ready
+
+    @property
+    def text(self) -> str:
+        """What inspecting the control panel shows."""
+        if self._stale:
+            self._refresh()
+        return "".join(output() for output in self._outputs)
+
+    @staticmethod
+    def _holds(rule: "Rule", service: "Service") -> Callable[[], bool]:
+        conditions = [condition.bind(service) for condition in rule.conditions]
+        return lambda: all(condition() for condition in conditions)
+
+    @staticmethod
+    def _output(rule: "Rule", service: "Service") -> Callable[[], str]:
+        effects = [effect.bind(service) for effect in rule.effects]
+        return lambda: "".join(effect() or "" for effect in effects)
+
+    @staticmethod
+    def _subject(key: str, service: "Service") -> tuple[Any, str]:
+        """Returns the publisher and attribute behind a key read by a condition,
+        see `Condition.reads`."""
+        section, name = key.split(".")
+        if section == "player":
+            return service._player, name
+        return getattr(service._objects_c, name)(), "state"
+
+    def _changed(self, subject, name: str) -> None:
+        facts = self._dependents.get((id(subject), name))
+        if facts:
+            self._stale.update(facts)
+
+    def _refresh(self) -> None:
+        changed = False
+        for fact in self._stale:
+            holds = self._facts[fact]()
+            if holds is not self._holding[fact]:
+                self._holding[fact] = holds
+                changed = True
+        self._stale.clear()
+        if changed:
+            self._derive()
+
+    def _derive(self) -> None:
+        self._outputs: list[Callable[[], str]] = []
+        for fact, output, final in self._rules:
+            if fact is not None and not self._holding[fact]:
+                continue
+            self._outputs.append(output)
+            if final:
+                break
+        self._ready = not any(self._holding)
+
+
+class VisibleObjects:
+    """The listings of the shown objects and items of environments, kept until
+    their contents change."""
+
+    def __init__(self, bus: EventBus = events):
+        self._bus = bus
+        self._listings: WeakKeyDictionary["Environment", str] = WeakKeyDictionary()
+
+    def listing(self, environment: "Environment") -> str:
+        try:
+            return self._listings[environment]
+        except KeyError:
+            pass
+        if self._changed not in environment._subscribers:
+            self._bus.subscribe(self._changed, environment)
+        listing = self._listings[environment] = environment.shown_objects_and_items_str
+        return listing
+
+    def _changed(self, environment: "Environment", name: str) -> None:
+        self._listings.pop(environment, None)
+
+
+visible_objects = VisibleObjects()
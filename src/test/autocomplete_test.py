@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from src.autocomplete import Autocomplete, Trie
+from src.config import Config
+from src.containers import Environments, Items
+from src.player import Player
+
+
+class TrieTest(TestCase):
+    def test_complete(self):
+        trie = Trie()
+        for word in ["engine room", "engine", "hull"]:
+            trie.insert(word, word)
+
+        result = [word for word, _ in trie.complete("eng")]
+        self.assertEqual(["engine", "engine room"], result)
+
+    def test_remove(self):
+        trie = Trie()
+        trie.insert("engine", 1)
+        trie.insert("engine room", 2)
+        trie.remove("engine room", 2)
+
+        self.assertEqual([("engine", [1])], list(trie.complete("")))
+        trie.remove("engine", 1)
+        self.assertEqual({}, trie.root)
+
+
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        self.player = Player(
+            environment=Environments.engine_room(), inventory=[Items.fuel_can()]
+        )
+        self.autocomplete = Autocomplete(self.player, Config)
+
+    def test_action(self):
+        self.assertEqual(["empty", "enter", "equip"], self.autocomplete.complete("e"))
+
+    def test_unknown_action(self):
+        self.assertEqual([], self.autocomplete.complete("dance "))
+
+    def test_object_accepts_action(self):
+        self.assertEqual(["fill engine"], self.autocomplete.complete("fill "))
+
+    def test_preposition(self):
+        self.assertEqual(["fill engine with"], self.autocomplete.complete("fill engine w"))
+
+    def test_preposition_object(self):
+        self.assertEqual(
+            ["fill engine with fuel", "fill engine with fuel can"],
+            self.autocomplete.complete("fill engine with fu"),
+        )
+
+    def test_scope_changes(self):
+        self.assertEqual([], self.autocomplete.complete("pickup rep"))
+
+        self.player.environment = Environments.workshop()
+        self.assertEqual(["pickup repair kit"], self.autocomplete.complete("pickup rep"))
+        self.assertEqual([], self.autocomplete.complete("fill eng"))
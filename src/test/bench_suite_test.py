@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from src.bench.suite import Benchmark, compare, mann_whitney_u, measure
+
+
+class MannWhitneyUTest(TestCase):
+    def test_identical(self):
+        self.assertEqual(1.0, mann_whitney_u([1.0] * 10, [1.0] * 10))
+
+    def test_separated(self):
+        self.assertLess(mann_whitney_u(list(range(15)), list(range(100, 115))), 0.001)
+
+    def test_overlapping(self):
+        a = [1.0, 3.0, 5.0, 7.0, 9.0, 11.0]
+        b = [2.0, 4.0, 6.0, 8.0, 10.0, 12.0]
+        self.assertGreater(mann_whitney_u(a, b), 0.5)
+
+
+class CompareTest(TestCase):
+    @staticmethod
+    def _results(**samples: list[float]) -> dict:
+        return {
+            "benchmarks": {
+                name: {"median": sorted(values)[len(values) // 2], "samples": values}
+                for name, values in samples.items()
+            }
+        }
+
+    def test_statuses(self):
+        base = [1.0 + i / 100 for i in range(15)]
+        baseline = self._results(slower=base, faster=base, noisy=base, gone=base)
+        current = self._results(
+            slower=[t * 1.5 for t in base],
+            faster=[t * 0.5 for t in base],
+            noisy=[t * 1.02 for t in base],
+            added=base,
+        )
+
+        statuses = {row["name"]: row["status"] for row in compare(baseline, current)}
+        self.assertEqual(
+            {
+                "slower": "regression",
+                "faster": "improvement",
+                "noisy": "unchanged",
+                "gone": "missing",
+                "added": "new",
+            },
+            statuses,
+        )
+
+
+class MeasureTest(TestCase):
+    def test_setup_is_not_timed(self):
+        calls = []
+        samples = measure(
+            Benchmark(lambda: calls.append(1), setup=lambda: sum(range(10_000))),
+            samples=3,
+            min_time=0.001,
+        )
+        self.assertEqual(3, len(samples))
+        self.assertLess(max(samples), 1e-4)
@@ -0,0 +1,99 @@
+import io
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.chrome_trace import ChromeTraceRecorder, SPANS
+from src.containers import Globals, Environments, Objects
+from src.object.base import Interactable
+from src.session import DiskSessionStore, SessionManager
+from src.test.fixtures import create_engine, create_world_state
+from src.tracing import tracer
+
+
+class ChromeTraceRecorderTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        self.player.environment = Environments.cockpit()
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace.json")
+        tracer.set_session(tracer.default_session_id)
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+        self.directory.cleanup()
+
+    def _events(self) -> list[dict]:
+        with open(self.path) as file:
+            return json.load(file)
+
+    def test_nested_spans(self):
+        with ChromeTraceRecorder.open(self.path):
+            self.engine.execute("turn wheel")
+
+        events = self._events()
+        names = [event["name"] for event in events]
+        for name in [
+            "turn",
+            "tokenize",
+            "validate action",
+            "validate usage",
+            "resolve object",
+            "service lookup",
+            "interact",
+        ]:
+            self.assertIn(name, names)
+
+        turn = next(event for event in events if event["name"] == "turn")
+        self.assertEqual("turn wheel", turn["args"]["input"])
+        for event in events:
+            if event["ph"] == "X":
+                self.assertGreaterEqual(event["ts"], turn["ts"])
+                self.assertLessEqual(
+                    event["ts"] + event["dur"], turn["ts"] + turn["dur"] + 1
+                )
+
+    def test_state_changes(self):
+        wheel = Objects.heavy_door_wheel()
+        with ChromeTraceRecorder.open(self.path):
+            self.engine.execute("turn wheel")
+
+        changes = [event for event in self._events() if event["ph"] == "i"]
+        self.assertIn(
+            {"object": str(wheel), "state": "OPEN", "session": "local"},
+            [change["args"] for change in changes],
+        )
+
+    def test_disable_restores_methods(self):
+        originals = [owner.__dict__[name] for owner, name, *_ in SPANS]
+        ChromeTraceRecorder(io.StringIO()).enable().close()
+
+        self.assertEqual(
+            originals, [owner.__dict__[name] for owner, name, *_ in SPANS]
+        )
+        self.assertNotIn("__setattr__", Interactable.__dict__)
+
+    def test_sessions_filter(self):
+        manager = SessionManager(
+            engine=self.engine,
+            world_state=self.world_state,
+            store=DiskSessionStore(self.directory.name),
+            initial_snapshot=self.world_state.capture(),
+        )
+        with ChromeTraceRecorder.open(self.path, session_ids=["slow"]):
+            manager.execute("fast", "inspect")
+            manager.execute("slow", "turn wheel")
+            manager.execute("fast", "inspect wheel")
+
+        events = self._events()
+        self.assertTrue(events)
+        self.assertEqual({"slow"}, {event["args"]["session"] for event in events})
+        self.assertEqual(
+            ["turn wheel"],
+            [event["args"]["input"] for event in events if event["name"] == "turn"],
+        )
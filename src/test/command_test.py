@@ -1,9 +1,10 @@
 from unittest import TestCase
+from unittest.mock import MagicMock
 
 from src.config import Config
 from src.containers import Objects, Resolvers, Items
-from src.enums import PlayerActionPreposition
-from src.command import Command, CommandValidator
+from src.enums import PlayerAction, PlayerActionPreposition, CommandError
+from src.command import Command, CommandChain, CommandValidator, Lexicon
 from src.environment import Environment
 from src.player import Player
 from src.test.fixtures import create_command
@@ -14,8 +15,13 @@ class CommandTest(TestCase):
 
     @classmethod
     def setUpClass(cls) -> None:
+        cls._init = cls.command.__init__
         cls.command.__init__ = lambda self, command: None
 
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.command.__init__ = cls._init
+
     def test_dissect_command_single(self):
         command = "test"
         self.assertEqual(Command._dissect_cmd(command), ["TEST"])
@@ -138,6 +144,69 @@ class CommandTest(TestCase):
         )
 
 
+class CommandChainTest(TestCase):
+    def test_single(self):
+        self.assertEqual(["inspect panel"], CommandChain("inspect  panel").commands)
+
+    def test_separators(self):
+        chain = CommandChain("pickup fuel can and use it;inspect ; ;enter hallway then inspect")
+        self.assertEqual(
+            ["pickup fuel can", "use it", "inspect", "enter hallway", "inspect"],
+            chain.commands,
+        )
+
+    def test_max_commands(self):
+        self.assertEqual(2, len(CommandChain("inspect; inspect; inspect", 2)))
+
+    def test_resolve_pronouns(self):
+        chain = CommandChain("")
+        chain.previous_object_str = "FUEL CAN"
+        self.assertEqual("fill engine with FUEL CAN", chain.resolve_pronouns("fill engine with it"))
+
+    def test_resolve_pronouns_without_previous_object(self):
+        self.assertEqual("use it", CommandChain("").resolve_pronouns("use it"))
+
+
+class LexiconTest(TestCase):
+    lexicon = Lexicon(
+        {
+            "TAKE": PlayerAction.PICKUP,
+            "TAKE OFF": PlayerAction.UNEQUIP,
+            "look at": PlayerAction.INSPECT,
+        },
+        ["the", "A"],
+    )
+
+    def test_synonym(self):
+        self.assertEqual(["PICKUP", "FUEL", "CAN"], self.lexicon.normalize(["TAKE", "FUEL", "CAN"]))
+
+    def test_longest_synonym(self):
+        self.assertEqual(["UNEQUIP", "AXE"], self.lexicon.normalize(["TAKE", "OFF", "AXE"]))
+
+    def test_multiple_word_synonym_and_stop_words(self):
+        self.assertEqual(
+            ["INSPECT", "PANEL"],
+            self.lexicon.normalize(["LOOK", "AT", "THE", "PANEL"]),
+        )
+
+    def test_synonym_only_at_start(self):
+        self.assertEqual(["USE", "TAKE"], self.lexicon.normalize(["USE", "TAKE"]))
+
+    def test_only_stop_words(self):
+        self.assertEqual(["THE"], self.lexicon.normalize(["THE", "A"]))
+
+    def test_command(self):
+        command = Command("grab the fuel can and a spoon", Config.lexicon)
+        self.assertEqual("PICKUP", command.action_str)
+        self.assertEqual("FUEL CAN AND SPOON", command.object_str)
+
+    def test_command_preposition(self):
+        command = Command("pour the fuel can into the engine", Config.lexicon)
+        self.assertEqual("EMPTY", command.action_str)
+        self.assertEqual("FUEL CAN", command.object_str)
+        self.assertEqual("ENGINE", command.preposition_object_str)
+
+
 class CommandValidatorTest(TestCase):
     config = Config
     validator = CommandValidator(
@@ -317,6 +386,48 @@ class CommandValidatorTest(TestCase):
         except ValueError as e:
             self.assertEqual("Object not found: SPACE SUIT", str(e))
 
+    def test_check_invalid(self):
+        result = self.validator.check(create_command(action_str="invalid"))
+
+        self.assertFalse(result.ok)
+        self.assertIs(CommandError.ACTION_NOT_RECOGNIZED, result.error)
+        self.assertEqual("Action not recognized: INVALID", result.message)
+
+    def test_check_object_not_found(self):
+        result = self.validator.check(
+            create_command(action_str="inspect", object_str="invalid")
+        )
+
+        self.assertIs(CommandError.OBJECT_NOT_FOUND, result.error)
+        self.assertEqual("Object not found: INVALID", result.message)
+
+    def test_check_valid(self):
+        command = create_command(action_str="inspect")
+        result = self.validator.check(command)
+
+        self.assertTrue(result.ok)
+        self.assertIs(command, result.command)
+        self.assertIsNone(result.message)
+
+    def test_check_resolves_objects_once(self):
+        resolver = MagicMock(wraps=Resolvers.command_object())
+        validator = CommandValidator(
+            player=Player(environment=Environment([Objects.control_panel()])),
+            command_object_r=resolver,
+            config=self.config,
+        )
+        command = create_command(action_str="inspect", object_str="control panel")
+        resolved = (("control panel",),)
+
+        self.assertTrue(validator.check(command).ok)
+        self.assertEqual(1, resolver.resolve.call_args_list.count(resolved))
+        validator.check(command)
+        self.assertEqual(2, resolver.resolve.call_args_list.count(resolved))
+
+    def test_validate_raises(self):
+        with self.assertRaisesRegex(ValueError, "Action requires object: FILL"):
+            self.validator.validate(create_command(action_str="fill"))
+
     # TODO: test helper methods and properties
 
 
@@ -0,0 +1,136 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.containers import Globals
+from src.content_pack import (
+    ContentPack,
+    PackTable,
+    export_content,
+    share_content,
+    write_pack,
+)
+from src.object.objects import Door
+from src.test.fixtures import create_engine
+from src.worldgen import generate_world
+
+
+class ContentPackTest(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.pack")
+        write_pack(
+            self.path,
+            {
+                "rooms": {"hallway": ["A long hallway."], "café": ["Crème brûlée."]},
+                "nouns": {"door": [], "hull": [], "axe": []},
+                "words": {"hull": ["0:hull", "1:hull"]},
+            },
+        )
+        self.pack = ContentPack(self.path)
+
+    def tearDown(self):
+        self.pack.close()
+        self.directory.cleanup()
+
+    def test_tables(self):
+        self.assertEqual(["rooms", "nouns", "words"], self.pack.tables)
+        self.assertIsInstance(self.pack.table("rooms"), PackTable)
+        with self.assertRaises(ValueError):
+            self.pack.table("doors")
+
+    def test_lookup(self):
+        rooms = self.pack.table("rooms")
+
+        self.assertEqual(["A long hallway."], rooms["hallway"])
+        self.assertEqual("Crème brûlée.", rooms.text("café"))
+        self.assertEqual(b"A long hallway.", bytes(rooms.view("hallway")))
+        self.assertIsNone(rooms.text("cockpit"))
+        with self.assertRaises(KeyError):
+            rooms["cockpit"]
+
+    def test_mapping(self):
+        nouns = self.pack.table("nouns")
+
+        self.assertEqual(3, len(nouns))
+        self.assertEqual(["axe", "door", "hull"], list(nouns))
+        self.assertIn("hull", nouns)
+        self.assertNotIn("engine", nouns)
+        self.assertEqual([], nouns["door"])
+        self.assertEqual(["0:hull", "1:hull"], self.pack.table("words")["hull"])
+
+    def test_not_a_pack(self):
+        with open(self.path, "wb") as file:
+            file.write(b"{}" * 8)
+
+        with self.assertRaises(ValueError):
+            ContentPack(self.path)
+
+
+class SharedContentTest(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        path = os.path.join(self.directory.name, "world.pack")
+        world = generate_world(rooms=50, seed=3)
+        write_pack(path, export_content(world.resolvers_c, world.containers))
+        self.pack = ContentPack(path)
+        self.world = world
+        self.shared = generate_world(rooms=50, seed=3, pack=self.pack)
+
+    def tearDown(self):
+        # The engine keeps its configuration on the class.
+        create_engine(Globals.player())
+        self.pack.close()
+        self.directory.cleanup()
+
+    def _door(self, world) -> Door:
+        return next(o for o in world.player.environment.objects if isinstance(o, Door))
+
+    def test_descriptions_are_read_from_the_pack(self):
+        door = self._door(self.shared)
+
+        self.assertNotIn("description", vars(door))
+        self.assertEqual(self._door(self.world).description, door.description)
+        self.assertEqual(
+            self.world.player.environment.description,
+            self.shared.player.environment.description,
+        )
+
+    def test_assigned_description_is_kept(self):
+        door = self._door(self.shared)
+
+        door.description = "A broken door."
+
+        self.assertEqual("A broken door.", door.description)
+
+    def test_differing_description_is_not_shared(self):
+        world = generate_world(rooms=50, seed=4)
+
+        share_content(self.pack, world.containers)
+
+        door = self._door(world)
+        self.assertIn("description", vars(door))
+
+    def test_same_output(self):
+        door = self._door(self.world)
+        commands = ["inspect", f"inspect {door.name}", f"enter {door.name}", "inspect"]
+        outputs = []
+        for world in [self.world, self.shared]:
+            engine = world.create_engine()
+            for command in commands:
+                engine.execute(command)
+            outputs.append(engine.drain_output())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_resolvers_read_the_pack(self):
+        vocabulary = self.shared.resolvers_c.vocabulary()
+        fuzzy_index = self.shared.resolvers_c.fuzzy_index()
+        door = self._door(self.shared)
+        typo = door.name.replace("door", "dorr")
+
+        self.assertIsInstance(vocabulary.nouns, PackTable)
+        self.assertEqual(
+            set(self.world.resolvers_c.vocabulary().nouns), set(vocabulary.nouns)
+        )
+        self.assertIs(door, fuzzy_index.lookup(typo, [door]))
@@ -0,0 +1,148 @@
+import copy
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.containers import Globals
+from src.content import (
+    compile_content,
+    export_source,
+    load_world,
+    validate_content,
+)
+from src.content_pack import ContentPack, write_pack
+from src.object.objects import Door, Locker
+from src.test.fixtures import create_engine
+from src.worldgen import LockerService, generate_world
+
+SOURCE = {
+    "start": "cabin",
+    "rooms": {
+        "cabin": {"name": "cabin", "exits": ["lab"], "objects": ["crate"]},
+        "lab": {
+            "name": "lab",
+            "description": "A dusty lab.",
+            "exits": ["cabin"],
+            "items": ["fuse"],
+        },
+    },
+    "objects": {
+        "crate": {"kind": "locker", "name": "crate", "items": ["wrench"]},
+        "cabinet": {"kind": "locker", "name": "cabinet", "state": "open"},
+    },
+    "items": {
+        "wrench": {"kind": "supply", "name": "wrench"},
+        "fuse": {"kind": "supply", "name": "fuse", "references": ["spare fuse"]},
+    },
+}
+
+
+class ContentTest(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "ship.pack")
+
+    def tearDown(self):
+        # The engine keeps its configuration on the class.
+        create_engine(Globals.player())
+        self.directory.cleanup()
+
+    def _load(self, source: dict):
+        write_pack(self.path, compile_content(source))
+        pack = ContentPack(self.path)
+        self.addCleanup(pack.close)
+        return load_world(pack)
+
+    def test_load(self):
+        world = self._load(SOURCE)
+
+        self.assertEqual("cabin", world.player.environment.name)
+        self.assertEqual(
+            ["lab door", "crate"], [o.name for o in world.player.environment.objects]
+        )
+        self.assertIs(Locker.States.OPEN, world.objects_c.cabinet().state)
+        self.assertEqual("A dusty lab.", world.environments_c.lab().description)
+        self.assertEqual("A crate.", world.objects_c.crate().description)
+
+    def test_play(self):
+        world = self._load(SOURCE)
+        engine = world.create_engine()
+
+        engine.execute("open crate")
+        engine.execute("pickup wrench")
+        engine.execute("enter lab door")
+        engine.execute("pickup spare fuse")
+
+        self.assertEqual(
+            ["wrench", "fuse"], [item.name for item in world.player.inventory]
+        )
+        self.assertIn("You enter the lab.", engine.drain_output())
+
+    def test_resolvers_use_the_pack(self):
+        world = self._load(SOURCE)
+        resolvers = world.resolvers_c
+
+        self.assertIs(world.items_c.fuse(), resolvers.items().resolve("Spare Fuse"))
+        self.assertIs(world.objects_c.lab_door(), resolvers.objects().resolve("lab"))
+        self.assertIsNone(resolvers.objects().resolve("engine"))
+        self.assertIsInstance(
+            resolvers.services().resolve(world.objects_c.crate()), LockerService
+        )
+
+    def test_generated_world_round_trip(self):
+        generated = generate_world(rooms=50, seed=5)
+        door = next(
+            o for o in generated.player.environment.objects if isinstance(o, Door)
+        )
+        loaded = self._load(export_source(generated))
+
+        outputs = []
+        for world in [generated, loaded]:
+            engine = world.create_engine()
+            for command in ["inspect", f"enter {door.name}", "inspect"]:
+                engine.execute(command)
+            outputs.append(engine.drain_output())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(50, len(loaded.environments_c.members()))
+
+    def test_valid(self):
+        self.assertEqual([], validate_content(SOURCE))
+
+    def test_invalid(self):
+        source = copy.deepcopy(SOURCE)
+        source["start"] = "bridge"
+        source["rooms"]["lab"]["exits"].append("bridge")
+        source["rooms"]["lab"]["objects"] = ["crate"]
+        source["objects"]["cabinet"]["state"] = "locked"
+        source["items"]["fuse"]["kind"] = "weapon"
+        source["items"]["fuse"]["name"] = "Crate"
+
+        problems = validate_content(source)
+
+        self.assertEqual(
+            [
+                "start: unknown room 'bridge'",
+                "objects.cabinet: unknown state 'locked'",
+                "items.fuse: unknown kind 'weapon', expected one of supply",
+                "rooms.lab: unknown exit 'bridge'",
+                "rooms.lab: 'crate' is already in rooms.cabin",
+                "items.fuse: the name 'Crate' is taken by objects.crate",
+            ],
+            problems,
+        )
+        with self.assertRaises(ValueError):
+            compile_content(source)
+
+    def test_malformed(self):
+        source = copy.deepcopy(SOURCE)
+        source["rooms"]["lab"]["exits"] = "cabin"
+        source["items"]["fuse"]["colour"] = "red"
+
+        self.assertEqual(
+            [
+                "rooms.lab: exits must be a list of strings",
+                "items.fuse: unknown fields colour",
+            ],
+            validate_content(source),
+        )
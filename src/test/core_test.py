@@ -0,0 +1,86 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.containers import Globals, Environments, Items, Effects, Objects
+from src.core import Engine
+from src.test.fixtures import create_engine, create_world_state
+
+
+class EngineGameOverTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+
+    def test_death_finishes_game(self):
+        self.player.environment = Environments.cockpit()
+        Objects.heavy_door_wheel().state = Objects.heavy_door_wheel().States.OPEN
+
+        self.assertTrue(self.engine.execute("open heavy door"))
+        self.assertTrue(self.engine.drain_output().startswith("You open the door"))
+
+    def test_win_finishes_game(self):
+        self.player.environment = Environments.cockpit()
+        Objects.control_panel().state = Objects.control_panel().States.MAIN
+        Objects.engine().state = Objects.engine().States.WORKING
+        Objects.hull().state = Objects.hull().States.REPAIRED
+
+        self.assertTrue(self.engine.execute("use control panel"))
+        self.assertTrue(self.engine.drain_output().endswith("You are going home."))
+
+    def test_many_deaths_in_one_process(self):
+        self.player.environment = Environments.outside()
+        self.player.inventory = [Items.space_suit()]
+        self.player.equipped = [Items.space_suit()]
+        self.player.effects = [Effects.vacuum_resistance()]
+        about_to_die = self.world_state.capture()
+
+        for _ in range(10_000):
+            self.world_state.restore(about_to_die)
+            self.assertTrue(self.engine.execute("unequip space suit"))
+            self.assertIn("the void whispers", self.engine.drain_output())
+
+
+class EngineCommandChainTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        self.player.environment = Environments.workshop()
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+
+    def test_chain(self):
+        self.assertIsNone(self.engine.execute("pickup repair kit and inspect it"))
+        self.assertEqual(
+            "Picked up: REPAIR KIT\nA repair kit. You wonder what it's for.",
+            self.engine.drain_output(),
+        )
+
+    def test_chain_stops_at_invalid_command(self):
+        self.engine.execute("pickup repair kit; dance; pickup fuel can")
+        self.assertEqual(
+            "Picked up: REPAIR KIT\nAction not recognized: DANCE",
+            self.engine.drain_output(),
+        )
+        self.assertNotIn(Items.fuel_can(), self.player.inventory)
+
+    def test_chain_stops_when_game_is_finished(self):
+        self.assertTrue(self.engine.execute("quit; pickup repair kit"))
+        self.assertNotIn(Items.repair_kit(), self.player.inventory)
+
+    def test_failed_command_lookup_is_raised(self):
+        with patch.object(
+            Engine, "_resolve", side_effect=RuntimeError("broken")
+        ), self.assertLogs(level="ERROR"), self.assertRaises(RuntimeError):
+            self.engine.execute("pickup repair kit")
+
+        self.assertNotIn("broken", self.engine.drain_output())
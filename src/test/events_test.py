@@ -0,0 +1,89 @@
+import copy
+from unittest import TestCase
+
+from src.events import PublishedList, events
+from src.test.fixtures import create_environment, create_object
+
+
+class EventsTest(TestCase):
+    def setUp(self):
+        self.environment = create_environment()
+        self.received = []
+        events.subscribe(self._receive, self.environment)
+
+    def tearDown(self):
+        events.unsubscribe(self._receive, self.environment)
+
+    def _receive(self, subject, name: str) -> None:
+        self.received.append((subject, name))
+
+    def test_assignment(self):
+        self.environment.items = [create_object()]
+        self.environment.description = "Not published."
+
+        self.assertEqual([(self.environment, "items")], self.received)
+        self.assertIsInstance(self.environment.items, PublishedList)
+
+    def test_changes_in_place(self):
+        object_ = create_object()
+
+        self.environment.objects.append(object_)
+        self.environment.objects += [create_object()]
+        self.environment.objects.remove(object_)
+        del self.environment.objects[0]
+
+        self.assertEqual([(self.environment, "objects")] * 4, self.received)
+        self.assertEqual([], self.environment.objects)
+
+    def test_list_assignments(self):
+        object_ = create_object()
+        objects = [object_]
+
+        self.environment.objects = objects
+        self.environment.objects = [object_]
+        self.environment.objects = self.environment.objects
+        objects.clear()
+
+        self.assertEqual([(self.environment, "objects")] * 2, self.received)
+        self.assertEqual([object_], self.environment.objects)
+
+    def test_states(self):
+        object_ = create_object()
+        events.subscribe(self._receive, object_)
+
+        object_.state = "OPEN"
+        object_.state = "OPEN"
+        object_.name = "crate"
+
+        self.assertEqual([(object_, "state")], self.received)
+
+    def test_all_subjects(self):
+        object_ = create_object()
+        events.subscribe(self._receive)
+        try:
+            object_.state = "OPEN"
+            self.environment.items = [object_]
+        finally:
+            events.unsubscribe(self._receive)
+
+        items = (self.environment, "items")
+        self.assertEqual([(object_, "state"), items, items], self.received)
+
+    def test_unsubscribed_subjects_keep_their_lists(self):
+        environment = create_environment()
+        items = [create_object()]
+
+        environment.items = items
+        self.assertIs(items, environment.items)
+
+        events.subscribe(self._receive, environment)
+        self.addCleanup(events.unsubscribe, self._receive, environment)
+        environment.items.append(create_object())
+
+        self.assertIsInstance(environment.items, PublishedList)
+        self.assertEqual([(environment, "items")], self.received)
+
+    def test_copies_are_plain_lists(self):
+        self.environment.items = [create_object()]
+
+        self.assertIs(list, type(copy.deepcopy(self.environment.items)))
@@ -0,0 +1,80 @@
+from functools import partial
+from unittest import TestCase
+
+from src.bench.playthroughs import WINNING_PLAYTHROUGH
+from src.containers import Globals
+from src.exploration import Explorer, generated_world, shipped_world
+from src.test.fixtures import create_engine, create_world_state
+
+# The world the workers explore from. They are forked, so they see it.
+_START = None
+
+
+def _late_game() -> tuple:
+    engine, world_state = shipped_world()
+    world_state.restore(_START)
+    return engine, world_state
+
+
+class ExplorerTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        global _START
+        engine, world_state = shipped_world()
+        before = world_state.capture()
+        for line in WINNING_PLAYTHROUGH[:-1]:
+            engine.execute(line)
+        engine.drain_output()
+        _START = world_state.capture()
+        world_state.restore(before)
+
+    def setUp(self):
+        self.world_state = create_world_state(Globals.player())
+        self.snapshot = self.world_state.capture()
+
+    def tearDown(self):
+        # Exploring builds engines, which keep their configuration on the class.
+        self.world_state.restore(self.snapshot)
+        create_engine(Globals.player())
+
+    def test_late_game(self):
+        report = Explorer(_late_game, workers=2).explore()
+
+        self.assertTrue(report.complete)
+        self.assertTrue(report.winnable)
+        self.assertEqual(["use control panel"], report.shortest_win)
+        self.assertGreater(report.dead_ends, 0)
+        self.assertEqual(
+            ["hit engine"], [command for _, command in report.points_of_no_return]
+        )
+        self.assertIn("unequip space suit", report.deaths)
+        self.assertEqual(
+            ["objects.control_panel_extinguish_button"], report.unreachable
+        )
+
+    def test_unwinnable(self):
+        report = Explorer(partial(generated_world, 1), workers=1).explore()
+
+        self.assertTrue(report.complete)
+        self.assertFalse(report.winnable)
+        self.assertEqual(report.states, report.dead_ends)
+        # The door of the only room is only found in its neighbours.
+        self.assertEqual(["objects.door_0"], report.unreachable)
+
+    def test_max_states(self):
+        report = Explorer(_late_game, workers=1, max_states=10).explore()
+
+        self.assertFalse(report.complete)
+        self.assertEqual(10, report.states)
+        # The win found before the cut-off still counts.
+        self.assertTrue(report.winnable)
+        self.assertIsNone(report.dead_ends)
+        self.assertEqual([], report.points_of_no_return)
+
+    def test_max_states_without_a_win(self):
+        report = Explorer(shipped_world, workers=1, max_states=10).explore()
+
+        self.assertFalse(report.complete)
+        self.assertIsNone(report.winnable)
+        self.assertIsNone(report.dead_ends)
+        self.assertIn("winnable: unknown", report.format())
@@ -1,12 +1,16 @@
 from typing import Union
 from unittest.mock import MagicMock
 
-from src.command import Command
+from src.command import Command, CommandValidator
+from src.config import Config
+from src.containers import Effects, Environments, Items, Objects, Resolvers, Services
+from src.core import Engine
 from src.enums import PlayerAction, PlayerActionPreposition, EquipableSlot
 from src.environment import Environment
 from src.object.base import Object, Item, Equipable
 from src.player import Player
 from src.service import Service
+from src.state import WorldState
 
 
 def create_command(
@@ -87,3 +91,30 @@ def create_environment(
     environment.name = name or "some name"
     environment.description = description or "some description"
     return environment
+
+
+def create_engine(player: Player):
+    command_validator = CommandValidator(
+        player=player,
+        command_object_r=Resolvers.command_object(),
+        config=Config,
+    )
+    return Engine(
+        player=player,
+        items_c=Items,
+        objects_c=Objects,
+        services_c=Services,
+        resolvers_c=Resolvers,
+        command_validator=command_validator,
+        config=Config,
+    )
+
+
+def create_world_state(player: Player):
+    return WorldState(
+        player=player,
+        effects_c=Effects,
+        items_c=Items,
+        objects_c=Objects,
+        environments_c=Environments,
+    )
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from src.containers import Items, Objects
+from src.fuzzy import TrigramIndex, FuzzyIndex, edit_distance
+
+
+class EditDistanceTest(TestCase):
+    def test_equal(self):
+        self.assertEqual(0, edit_distance("engine", "engine", 2))
+
+    def test_substitution(self):
+        self.assertEqual(1, edit_distance("fule", "fuel", 2))
+
+    def test_transposition(self):
+        self.assertEqual(1, edit_distance("enigne", "engine", 2))
+
+    def test_insertion(self):
+        self.assertEqual(1, edit_distance("heavey door", "heavy door", 2))
+
+    def test_bounded(self):
+        self.assertEqual(3, edit_distance("control panel", "urinal", 2))
+
+
+class TrigramIndexTest(TestCase):
+    def setUp(self):
+        self.index = TrigramIndex()
+        for word in ["hull", "hall", "hello", "engine", "urinal"]:
+            self.index.add(word, word)
+
+    def test_search(self):
+        found = sorted((d, w) for d, w, _ in self.index.search("hxll", 1))
+        self.assertEqual([(1, "hall"), (1, "hull")], found)
+
+    def test_search_values(self):
+        self.index.add("hull", "other")
+        self.assertEqual([(0, "hull", ["hull", "other"])], self.index.search("hull", 0))
+
+    def test_search_transposition(self):
+        found = [(d, w) for d, w, _ in self.index.search("enigne", 1)]
+        self.assertEqual([(1, "engine")], found)
+
+    def test_search_budget(self):
+        self.assertEqual(1, len(self.index.search("hxll", 1, max_candidates=1)))
+
+
+class FuzzyIndexTest(TestCase):
+    index = FuzzyIndex(containers=[Items, Objects], time_budget=1.0)
+
+    def test_lookup_in_scope(self):
+        result = self.index.lookup("fule can", [Items.fuel_can(), Objects.engine()])
+        self.assertEqual(Items.fuel_can(), result)
+
+    def test_lookup_out_of_scope(self):
+        self.assertIsNone(self.index.lookup("fule can", [Objects.engine()]))
+
+    def test_lookup_transposition(self):
+        scope = [Objects.engine(), Items.fuel_can()]
+        self.assertEqual(Objects.engine(), self.index.lookup("enigne", scope))
+
+    def test_lookup_too_far(self):
+        self.assertIsNone(self.index.lookup("fudge", [Items.fuel_can()]))
+
+    def test_lookup_short_phrase(self):
+        self.assertIsNone(self.index.lookup("kat", [Items.repair_kit()]))
+
+    def test_lookup_ambiguous(self):
+        scope = [Objects.glass_case(), Items.fuel_can()]
+        self.assertIsNone(self.index.lookup("cane", scope))
+
+    def test_has_candidates(self):
+        self.assertTrue(self.index.has_candidates("HEAVEY DOOR"))
+        self.assertFalse(self.index.has_candidates("UNICORN"))
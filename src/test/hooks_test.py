@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from src.hooks import add_hook, remove_hook
+
+
+class Base:
+    def greet(self) -> str:
+        return "hello"
+
+
+class Greeter(Base):
+    @classmethod
+    def name(cls) -> str:
+        return "greeter"
+
+
+def suffix(text: str):
+    def hook(function):
+        return lambda *args: function(*args) + text
+
+    return hook
+
+
+class HooksTest(TestCase):
+    def test_hooks_wrap_in_order(self):
+        first, second = suffix(" 1"), suffix(" 2")
+        add_hook(Greeter, "name", first)
+        add_hook(Greeter, "name", second)
+        self.addCleanup(remove_hook, Greeter, "name", second)
+        self.addCleanup(remove_hook, Greeter, "name", first)
+
+        self.assertEqual("greeter 1 2", Greeter.name())
+
+    def test_removed_in_any_order(self):
+        original = Greeter.__dict__["name"]
+        first, second = suffix(" 1"), suffix(" 2")
+        add_hook(Greeter, "name", first)
+        add_hook(Greeter, "name", second)
+
+        remove_hook(Greeter, "name", first)
+        self.assertEqual("greeter 2", Greeter.name())
+        remove_hook(Greeter, "name", second)
+        self.assertIs(original, Greeter.__dict__["name"])
+
+    def test_inherited(self):
+        hook = suffix("!")
+        add_hook(Greeter, "greet", hook)
+
+        self.assertEqual("hello!", Greeter().greet())
+        self.assertEqual("hello", Base().greet())
+        remove_hook(Greeter, "greet", hook)
+        self.assertNotIn("greet", Greeter.__dict__)
+
+    def test_remove_unknown(self):
+        remove_hook(Greeter, "name", suffix("!"))
+
+        self.assertEqual("greeter", Greeter.name())
@@ -0,0 +1,92 @@
+import io
+from unittest import TestCase
+
+from src.chrome_trace import ChromeTraceRecorder
+from src.containers import Globals, Environments
+from src.core import Engine
+from src.instrumentation import LatencyHistogram, TurnInstrumentation, STAGES
+from src.test.fixtures import create_engine, create_world_state
+
+
+class LatencyHistogramTest(TestCase):
+    def test_empty(self):
+        self.assertEqual(0.0, LatencyHistogram().percentile(0.99))
+
+    def test_percentiles_within_growth(self):
+        histogram = LatencyHistogram()
+        for micros in range(1, 1001):
+            histogram.record(micros * 1e-6)
+
+        for fraction in [0.50, 0.95, 0.99]:
+            exact = fraction * 1e-3
+            self.assertGreaterEqual(histogram.percentile(fraction), exact)
+            self.assertLessEqual(histogram.percentile(fraction), exact * histogram.growth)
+        self.assertEqual(1e-3, histogram.percentile(1.0))
+        self.assertEqual(1000, histogram.count)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(1e-6)
+        second.record(1e-3)
+        first.merge(second)
+
+        self.assertEqual(2, first.count)
+        self.assertEqual(1e-3, first.percentile(0.99))
+
+
+class TurnInstrumentationTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        self.player.environment = Environments.workshop()
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+
+    def test_stages_recorded(self):
+        with TurnInstrumentation(Engine) as instrumentation:
+            self.engine.execute("inspect repair kit")
+            self.engine.drain_output()
+
+        report = instrumentation.report()
+        self.assertEqual(set(STAGES), set(report))
+        for stage in STAGES:
+            self.assertEqual(1, report[stage]["count"], stage)
+        self.assertGreaterEqual(report["turn"]["max"], report["interaction"]["max"])
+
+    def test_invalid_command_stops_after_validation(self):
+        with TurnInstrumentation(Engine) as instrumentation:
+            self.engine.execute("open repair kit")
+
+        report = instrumentation.report()
+        self.assertEqual(1, report["validate"]["count"])
+        self.assertEqual(0, report["resolve"]["count"])
+
+    def test_disable_restores_methods(self):
+        originals = {name: Engine.__dict__[name] for name in STAGES.values()}
+        instrumentation = TurnInstrumentation(Engine).enable()
+        self.assertIsNot(originals["_parse"], Engine.__dict__["_parse"])
+
+        instrumentation.disable()
+        self.engine.execute("inspect")
+
+        for name, original in originals.items():
+            self.assertIs(original, Engine.__dict__[name])
+        self.assertEqual(0, instrumentation.histograms["turn"].count)
+
+    def test_disable_out_of_order_with_a_trace_recorder(self):
+        originals = {name: Engine.__dict__[name] for name in STAGES.values()}
+        instrumentation = TurnInstrumentation(Engine).enable()
+        recorder = ChromeTraceRecorder(io.StringIO()).enable()
+
+        instrumentation.disable()
+        self.engine.execute("inspect")
+        recorder.close()
+
+        for name, original in originals.items():
+            self.assertIs(original, Engine.__dict__[name])
+        self.assertEqual(0, instrumentation.histograms["turn"].count)
+        self.assertGreater(recorder.events, 0)
@@ -0,0 +1,67 @@
+import random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.bench.load_generator import (
+    RandomWalkPlayer,
+    ScriptedPlayer,
+    create_players,
+    create_target,
+    run,
+)
+from src.bench.playthroughs import WINNING_PLAYTHROUGH
+from src.config import Config
+from src.containers import Globals
+from src.test.fixtures import create_world_state
+
+
+class LoadGeneratorTest(TestCase):
+    def setUp(self):
+        # The load generator plays on the global game.
+        self.world_state = create_world_state(Globals.player())
+        self.snapshot = self.world_state.capture()
+        self.directory = TemporaryDirectory()
+        self.target = create_target(self.directory.name, max_sessions=10)
+
+    def tearDown(self):
+        self.directory.cleanup()
+        self.world_state.restore(self.snapshot)
+
+    def test_scripted_player_wins(self):
+        player = ScriptedPlayer("scripted", WINNING_PLAYTHROUGH)
+
+        for _ in WINNING_PLAYTHROUGH:
+            output = self.target.execute("scripted", player.next_line(self.target))
+
+        self.assertIn("You are going home.", output)
+        self.assertEqual(0, len(self.target))
+        self.assertEqual(WINNING_PLAYTHROUGH[0], player.next_line(self.target))
+
+    def test_random_walk_starts_with_an_action(self):
+        player = RandomWalkPlayer("walker", random.Random(0))
+        actions = [str(action).lower() for action in Config.action_usage_mapping]
+
+        for _ in range(20):
+            line = player.next_line(self.target)
+            self.assertIn(line.split()[0], actions)
+            self.target.execute("walker", line)
+
+    def test_create_players(self):
+        players = create_players(20, {"walk": 1, "script": 1}, random.Random(0))
+
+        self.assertEqual(20, len({player.session_id for player in players}))
+        self.assertEqual(
+            {RandomWalkPlayer, ScriptedPlayer}, {type(player) for player in players}
+        )
+        with self.assertRaises(ValueError):
+            create_players(1, {"replay": 1}, random.Random(0))
+
+    def test_run(self):
+        results = run([1, 5], turns=2, mix={"walk": 1, "script": 1})
+
+        self.assertEqual([1, 5], [result["sessions"] for result in results])
+        self.assertEqual([2, 10], [result["turns"] for result in results])
+        for result in results:
+            self.assertLessEqual(result["p50"], result["p99"])
+            self.assertLessEqual(result["p99"], result["p999"])
+            self.assertGreater(result["turns_per_sec"], 0)
@@ -0,0 +1,114 @@
+import os
+import threading
+import urllib.request
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.containers import Globals, Environments, Objects
+from src.metrics import (
+    MetricsRegistry,
+    MetricsServer,
+    MetricsFileWriter,
+    engine_metrics,
+)
+from src.test.fixtures import create_engine, create_world_state
+
+
+class CounterTest(TestCase):
+    def test_threads_are_summed(self):
+        counter = MetricsRegistry().counter("test_total", "Test.", ("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc("b", amount=2)
+
+        self.assertEqual({("a",): 4000, ("b",): 2}, counter.collect())
+
+    def test_same_counter_by_name(self):
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter("a_total", "A."), registry.counter("a_total", "A."))
+
+    def test_gauge_name_taken_by_counter(self):
+        registry = MetricsRegistry()
+        registry.counter("a_total", "A.")
+        with self.assertRaises(ValueError):
+            registry.gauge("a_total", "A.", lambda: 1)
+
+
+class MetricsRegistryTest(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.registry.counter("test_total", "Test.", ("kind",)).inc('say "hi"')
+        self.registry.gauge("test_ratio", "Ratio.", lambda: 0.5)
+
+    def test_exposition(self):
+        self.assertEqual(
+            "# HELP test_ratio Ratio.\n"
+            "# TYPE test_ratio gauge\n"
+            "test_ratio 0.5\n"
+            "# HELP test_total Test.\n"
+            "# TYPE test_total counter\n"
+            'test_total{kind="say \\"hi\\""} 1\n',
+            self.registry.exposition(),
+        )
+
+    def test_http(self):
+        server = MetricsServer(self.registry)
+        try:
+            url = f"http://127.0.0.1:{server.port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+        finally:
+            server.close()
+        self.assertEqual(self.registry.exposition(), body)
+
+    def test_file(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "textgame.prom")
+            MetricsFileWriter(self.registry, path, interval=60).close()
+            with open(path) as file:
+                self.assertEqual(self.registry.exposition(), file.read())
+
+
+class EngineMetricsTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        self.player.environment = Environments.cockpit()
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+
+    def test_counters(self):
+        turns = engine_metrics.turns.value()
+        inspects = engine_metrics.commands.value("INSPECT")
+        not_found = engine_metrics.validation_failures.value("OBJECT_NOT_FOUND")
+        dispatches = engine_metrics.service_dispatches.value("ControlPanelService")
+        deaths = engine_metrics.game_overs.value("DEATH")
+
+        self.engine.execute("inspect control panel")
+        self.engine.execute("inspect unicorn")
+        Objects.heavy_door_wheel().state = Objects.heavy_door_wheel().States.OPEN
+        self.engine.execute("open heavy door")
+
+        self.assertEqual(turns + 3, engine_metrics.turns.value())
+        self.assertEqual(inspects + 1, engine_metrics.commands.value("INSPECT"))
+        self.assertEqual(
+            not_found + 1,
+            engine_metrics.validation_failures.value("OBJECT_NOT_FOUND"),
+        )
+        self.assertEqual(
+            dispatches + 1,
+            engine_metrics.service_dispatches.value("ControlPanelService"),
+        )
+        self.assertEqual(deaths + 1, engine_metrics.game_overs.value("DEATH"))
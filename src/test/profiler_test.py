@@ -0,0 +1,139 @@
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from src.containers import Globals, Environments
+from src.profiler import SamplingProfiler
+from src.test.fixtures import create_engine, create_world_state
+
+
+class SamplingProfilerTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        self.player.environment = Environments.engine_room()
+        self.profiler = SamplingProfiler(interval=0.001)
+
+    def tearDown(self):
+        self.profiler.stop()
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+
+    def _play(self, seconds: float = 0.3):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.engine.execute("inspect engine")
+            self.engine.drain_output()
+
+    def test_hot_spots(self):
+        self.profiler.start()
+        self._play()
+        self.profiler.stop()
+
+        functions = [label for label, _ in self.profiler.hot_spots()]
+        self.assertIn("command.py:check", functions)
+        modules = ("command.py", "resolvers.py", "service.py", "utils.py")
+        self.assertTrue(all(label.split(":")[0] in modules for label in functions))
+        self.assertGreater(self.profiler.turns, 0)
+
+    def test_collapsed(self):
+        self.profiler.start()
+        self._play()
+        self.profiler.stop()
+
+        playing = other = 0
+        for line in self.profiler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            if "profiler_test.py:_play" in stack.split(";"):
+                playing += int(count)
+            else:
+                other += int(count)
+        self.assertGreater(playing, other)
+
+    def test_stopped_profiler_samples_nothing(self):
+        self.profiler.start()
+        self.profiler.stop()
+        self._play(0.05)
+        samples = sum(self.profiler.samples.values())
+
+        self._play(0.05)
+        self.assertEqual(samples, sum(self.profiler.samples.values()))
+
+    def test_concurrent_toggles_start_one_sampler(self):
+        started = []
+        start_thread = threading.Thread.start
+        switch_interval = sys.getswitchinterval
+
+        def start(thread):
+            started.append(thread)
+            start_thread(thread)
+
+        def slow_switch_interval():
+            time.sleep(0.05)
+            return switch_interval()
+
+        with patch.object(threading.Thread, "start", start), patch.object(
+            sys, "getswitchinterval", slow_switch_interval
+        ):
+            toggles = [threading.Thread(target=self.profiler.toggle) for _ in range(2)]
+            for toggle in toggles:
+                start_thread(toggle)
+            for toggle in toggles:
+                toggle.join()
+
+        self.assertEqual(1, len(started))
+        self.assertFalse(self.profiler.running)
+        self.assertFalse(any(thread.is_alive() for thread in started))
+
+    def test_idle_input_is_not_sampled(self):
+        lines = queue.Queue()
+        with patch("builtins.input", side_effect=lines.get):
+            waiting = threading.Thread(target=self.engine._ask_input)
+            waiting.start()
+            self.profiler.start()
+            time.sleep(0.05)
+            self.profiler.stop()
+            lines.put("quit")
+            waiting.join()
+
+        for stack in self.profiler.samples:
+            self.assertNotIn("core.py:_ask_input", stack)
+
+    @skipUnless(hasattr(signal, "SIGUSR2"), "SIGUSR2 is not available")
+    def test_signal_toggles(self):
+        previous = signal.getsignal(signal.SIGUSR2)
+        self.addCleanup(signal.signal, signal.SIGUSR2, previous)
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.collapsed")
+            self.profiler.install_signal_handler(path)
+
+            os.kill(os.getpid(), signal.SIGUSR2)
+            self._wait_for(lambda: self.profiler.running)
+            self._play(0.1)
+            os.kill(os.getpid(), signal.SIGUSR2)
+            self._wait_for(lambda: os.path.exists(path))
+
+            self.assertFalse(self.profiler.running)
+
+    def test_no_signal(self):
+        with patch.object(signal, "SIGUSR2", None), patch.object(
+            signal, "signal"
+        ) as install:
+            self.assertFalse(self.profiler.install_signal_handler())
+
+        install.assert_not_called()
+
+    @staticmethod
+    def _wait_for(condition, timeout: float = 5.0):
+        deadline = time.perf_counter() + timeout
+        while not condition() and time.perf_counter() < deadline:
+            time.sleep(0.01)
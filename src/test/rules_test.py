@@ -0,0 +1,147 @@
+from unittest import TestCase
+
+from src.containers import Effects, Globals, Objects, Services
+from src.enums import PlayerAction
+from src.outcome import GameOver
+from src.rules import (
+    AnyOf,
+    Condition,
+    HasEffect,
+    ObjectState,
+    Rule,
+    RuleTable,
+    Say,
+    SetState,
+    analyze_rules,
+)
+from src.test.fixtures import create_command, create_world_state
+
+
+class Flag(Condition):
+    """A condition read from a dictionary, counting its evaluations."""
+
+    def __init__(self, flags: dict, key: str):
+        self.flags = flags
+        self.key = key
+
+    def __str__(self):
+        return self.key
+
+    def _key(self) -> tuple:
+        return (self.key,)
+
+    def reads(self) -> set[str]:
+        return {self.key}
+
+    def bind(self, service):
+        def evaluate():
+            self.flags["evaluations"] += 1
+            return self.flags[self.key]
+
+        return evaluate
+
+
+class RuleTableTest(TestCase):
+    def setUp(self):
+        self.flags = {"a": True, "b": False, "evaluations": 0}
+        self.a = Flag(self.flags, "a")
+        self.b = Flag(self.flags, "b")
+
+    def _apply(self, rules: list[Rule]) -> str:
+        apply = RuleTable(rules).bind(None, lambda cmd: "fallback")
+        return apply(create_command())
+
+    def test_first_matching_rule(self):
+        rules = [
+            Rule([self.b], [Say("b")]),
+            Rule([self.a, ~self.b], [Say("a")]),
+            Rule([self.a], [Say("never")]),
+        ]
+
+        self.assertEqual("a", self._apply(rules))
+        self.assertEqual(2, self.flags["evaluations"])
+
+    def test_rules_that_are_not_final(self):
+        rules = [
+            Rule([], [Say("panel.")], final=False),
+            Rule([self.b], [Say(" b")], final=False),
+            Rule([self.a], [Say(" a")], final=False),
+        ]
+
+        self.assertEqual("panel. a", self._apply(rules))
+
+    def test_fallback(self):
+        self.assertEqual("fallback", self._apply([Rule([self.b], [Say("b")])]))
+
+    def test_columns(self):
+        table = RuleTable([Rule([self.a, ~self.b], []), Rule([~~self.b], [])])
+
+        self.assertEqual([self.a, self.b], table.columns)
+        self.assertEqual([((0, True), (1, False)), ((1, True),)], table.rows)
+
+    def test_analyze(self):
+        table = RuleTable(
+            [
+                Rule([ObjectState("engine", "FUELED")], [Say("roar")]),
+                Rule([ObjectState("engine", "FUELED"), self.a], [Say("never")]),
+                Rule([self.a, ~self.a], []),
+                Rule(
+                    [ObjectState("engine", "EMPTY"), ObjectState("engine", "BROKEN")],
+                    [],
+                ),
+                Rule([ObjectState("engine", "EMPTY")], [Say("empty")]),
+            ]
+        )
+
+        self.assertEqual(
+            [
+                "rule 1 is shadowed by rule 0",
+                "rule 2 expects both a and not a",
+                "rule 3 expects both engine is EMPTY and engine is BROKEN",
+            ],
+            table.analyze(),
+        )
+
+    def test_reads_and_writes(self):
+        rule = Rule(
+            [AnyOf(HasEffect("full_bladder"), ~ObjectState("hull", "REPAIRED"))],
+            [SetState("engine", "WORKING"), Say("Vroom.")],
+        )
+
+        self.assertEqual({"player.effects", "objects.hull"}, rule.reads())
+        self.assertEqual({("engine", "WORKING")}, rule.writes())
+
+
+class ShippedRulesTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+
+    def test_no_problems(self):
+        services = [type(provider()) for provider in Services.members().values()]
+
+        self.assertEqual([], analyze_rules(services))
+
+    def test_open_heavy_door(self):
+        service = Services.heavy_door_service()
+        command = create_command(action=PlayerAction.OPEN, object_=Objects.heavy_door())
+        wheel = Objects.heavy_door_wheel()
+
+        self.assertEqual("The door is locked.", service.interact(command))
+        wheel.state = wheel.States.OPEN
+        self.assertIsInstance(service.interact(command), GameOver)
+        self.player.effects = [Effects.vacuum_resistance()]
+        self.assertEqual("You open the door.", service.interact(command))
+        self.assertIs(Objects.heavy_door().States.OPEN, Objects.heavy_door().state)
+
+    def test_hit_engine_falls_back(self):
+        service = Services.engine_service()
+        engine = Objects.engine()
+        engine.state = engine.States.EMPTY
+        command = create_command(action=PlayerAction.HIT, object_=engine)
+
+        self.assertEqual(f"You hit {engine}. Nothing happens.", service.interact(command))
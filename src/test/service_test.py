@@ -68,6 +68,15 @@ class ItemServiceTest(TestCase):
         player_mock.environment.items.remove.assert_called_once_with(item)
         player_mock.inventory.append.assert_called_once_with(item)
 
+    @patch.object(item_service, "_player", new_callable=MagicMock)
+    def test_pickup_item_already_in_inventory(self, player_mock):
+        item = create_item(interactions=[PlayerAction.PICKUP])
+        command = create_command(object_=item)
+        player_mock.inventory = [item]
+
+        self.assertEqual("You already have that.", self.item_service._pickup(command))
+        player_mock.environment.items.remove.assert_not_called()
+
     def test_equip_item_not_in_inventory(self):
         command = create_command(object_=create_item())
 
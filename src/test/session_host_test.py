@@ -0,0 +1,120 @@
+import copy
+import os
+from collections import Counter
+from functools import partial
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.bench.load_generator import create_target
+from src.bench.playthroughs import WINNING_PLAYTHROUGH
+from src.content import compile_content, open_world
+from src.content_pack import write_pack
+from src.session_host import HashRing, SessionHost
+from src.test.content_test import SOURCE
+
+KEYS = [f"session-{i}" for i in range(2000)]
+
+
+class HashRingTest(TestCase):
+    def test_spreads_keys(self):
+        ring = HashRing([0, 1, 2, 3])
+
+        counts = Counter(ring.node(key) for key in KEYS)
+
+        self.assertEqual({0, 1, 2, 3}, set(counts))
+        self.assertGreater(min(counts.values()), len(KEYS) / 4 / 2)
+
+    def test_adding_a_node_only_moves_keys_to_it(self):
+        ring = HashRing([0, 1, 2])
+        before = {key: ring.node(key) for key in KEYS}
+
+        ring.add(3)
+
+        moved = {key for key in KEYS if ring.node(key) != before[key]}
+        self.assertTrue(moved)
+        self.assertEqual({3}, {ring.node(key) for key in moved})
+
+    def test_removing_a_node_only_moves_its_keys(self):
+        ring = HashRing([0, 1, 2])
+        before = {key: ring.node(key) for key in KEYS}
+
+        ring.remove(1)
+
+        for key in KEYS:
+            if before[key] != 1:
+                self.assertEqual(before[key], ring.node(key))
+        self.assertNotIn(1, ring)
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            HashRing().node("session")
+
+
+class SessionHostTest(TestCase):
+    def setUp(self):
+        self.host = SessionHost(partial(create_target, max_sessions=10), workers=2)
+        self.session_ids = [f"player-{i}" for i in range(6)]
+
+    def tearDown(self):
+        self.host.shutdown()
+
+    def _play(self, lines: list[str]) -> dict[str, str]:
+        outputs = {}
+        for line in lines:
+            futures = {s: self.host.submit(s, line) for s in self.session_ids}
+            outputs = {s: future.result() for s, future in futures.items()}
+        return outputs
+
+    def test_sessions_survive_migration(self):
+        self._play(WINNING_PLAYTHROUGH[:10])
+        worker = self.host.add_worker()
+        self._play(WINNING_PLAYTHROUGH[10:20])
+        self.host.remove_worker(worker)
+        self.host.remove_worker(0)
+
+        outputs = self._play(WINNING_PLAYTHROUGH[20:])
+
+        self.assertEqual([1], self.host.workers)
+        for output in outputs.values():
+            self.assertIn("You are going home.", output)
+
+    def test_complete(self):
+        self.host.execute("player-0", "press red button")
+
+        self.assertIn("turn heavy door wheel", self.host.complete("player-0", "turn "))
+
+    def test_remove_last_worker(self):
+        self.host.remove_worker(0)
+
+        with self.assertRaises(ValueError):
+            self.host.remove_worker(1)
+
+
+class SessionHostReloadTest(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.paths = [os.path.join(self.directory.name, f"v{i}.pack") for i in (1, 2)]
+        write_pack(self.paths[0], compile_content(SOURCE))
+        source = copy.deepcopy(SOURCE)
+        source["rooms"]["lab"]["description"] = "A clean lab."
+        write_pack(self.paths[1], compile_content(source))
+        factory = partial(create_target, max_sessions=10, pack=self.paths[0])
+        self.host = SessionHost(factory, workers=2)
+        self.session_ids = [f"player-{i}" for i in range(6)]
+
+    def tearDown(self):
+        self.host.shutdown()
+        self.directory.cleanup()
+
+    def test_reload(self):
+        for session_id in self.session_ids:
+            self.host.execute(session_id, "open crate")
+            self.host.execute(session_id, "enter lab door")
+
+        self.host.reload(partial(open_world, self.paths[1]))
+        worker = self.host.add_worker()
+        self.host.remove_worker(0)
+
+        for session_id in self.session_ids:
+            self.assertIn("A clean lab.", self.host.execute(session_id, "inspect"))
+        self.assertIn(worker, self.host.workers)
@@ -0,0 +1,347 @@
+import copy
+import os
+from functools import partial
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.config import Config
+from src.containers import Globals, Environments, Items
+from src.content import compile_content, open_world
+from src.content_pack import write_pack
+from src.core import Engine
+from src.enums import PlayerAction
+from src.metrics import MetricsRegistry
+from src.session import DiskSessionStore, SessionManager
+from src.state import migrate_snapshot
+from src.test.content_test import SOURCE
+from src.test.fixtures import create_engine, create_world_state
+
+
+class SessionManagerTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+
+        self.player.environment = Environments.workshop()
+        self.directory = TemporaryDirectory()
+        self.manager = SessionManager(
+            engine=create_engine(self.player),
+            world_state=self.world_state,
+            store=DiskSessionStore(self.directory.name),
+            initial_snapshot=self.world_state.capture(),
+            max_sessions=2,
+        )
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.directory.cleanup()
+
+    def test_sessions_are_isolated(self):
+        self.assertEqual("Picked up: REPAIR KIT", self.manager.execute("a", "pickup kit"))
+        self.assertEqual("Picked up: REPAIR KIT", self.manager.execute("b", "pickup kit"))
+        self.assertNotIn("repair kit", self.manager.execute("a", "inspect"))
+        self.assertIn("repair kit", self.manager.execute("c", "inspect"))
+
+    def test_least_recently_active_session_is_evicted(self):
+        self.manager.execute("a", "pickup kit")
+        self.manager.execute("b", "inspect")
+        self.manager.execute("c", "inspect")
+
+        self.assertEqual(2, len(self.manager))
+        self.assertEqual(1, self.manager.metrics.evictions)
+        self.assertIsNotNone(self.manager.store.load("a"))
+
+    def test_evicted_session_is_rehydrated(self):
+        self.manager.execute("a", "pickup kit")
+        self.manager.execute("b", "inspect")
+        self.manager.execute("c", "inspect")
+
+        self.assertNotIn("repair kit", self.manager.execute("a", "inspect"))
+        self.assertIn(Items.repair_kit(), self.player.inventory)
+        self.assertEqual(1, self.manager.metrics.rehydrations)
+        self.assertEqual(4, self.manager.metrics.misses)
+        self.assertEqual(0, self.manager.metrics.hits)
+
+    def test_detach_and_attach(self):
+        self.manager.execute("a", "pickup kit")
+        self.manager.execute("b", "inspect")
+        self.manager.execute("c", "inspect")
+
+        resident = self.manager.detach("c")
+        evicted = self.manager.detach("a")
+
+        self.assertIsNone(self.manager.detach("unknown"))
+        self.assertEqual(1, len(self.manager))
+        self.assertIsNone(self.manager.store.load("a"))
+        self.manager.attach("a", evicted)
+        self.manager.attach("c", resident)
+        self.assertNotIn("repair kit", self.manager.execute("a", "inspect"))
+        self.assertIn("repair kit", self.manager.execute("c", "inspect"))
+
+    def test_traces_are_per_session(self):
+        self.manager.execute("a", "pickup kit")
+        self.manager.execute("b", "inspect")
+
+        self.assertIn("PICKUP", self.manager.trace("a"))
+        self.assertNotIn("PICKUP", self.manager.trace("b"))
+
+        self.manager.execute("c", "inspect")
+        self.assertEqual("", self.manager.trace("a"))
+
+    def test_register_metrics(self):
+        registry = MetricsRegistry()
+        self.manager.register_metrics(registry)
+        self.manager.execute("a", "inspect")
+        self.manager.execute("a", "inspect")
+
+        self.manager.execute("b", "inspect")
+        self.manager.execute("c", "inspect")
+
+        exposition = registry.exposition()
+        self.assertIn("textgame_active_sessions 2\n", exposition)
+        self.assertIn("textgame_session_hit_rate 0.25\n", exposition)
+        self.assertIn("# TYPE textgame_session_evictions_total counter\n", exposition)
+        self.assertIn("textgame_session_evictions_total 1\n", exposition)
+
+    def test_quit_closes_session(self):
+        self.manager.execute("a", "pickup kit")
+        self.manager.execute("a", "quit")
+
+        self.assertEqual(0, len(self.manager))
+        self.assertEqual("Picked up: REPAIR KIT", self.manager.execute("a", "pickup kit"))
+
+    def test_failed_command_restores_the_session(self):
+        get_service = Engine._get_service
+        calls = []
+
+        def fail_second(command):
+            calls.append(command)
+            if len(calls) > 1:
+                raise RuntimeError("broken")
+            return get_service(command)
+
+        with patch.object(
+            Engine, "_get_service", side_effect=fail_second
+        ), self.assertLogs(level="ERROR"), self.assertRaises(RuntimeError):
+            self.manager.execute("a", "pickup kit and inspect")
+
+        self.assertIn("repair kit", self.manager.execute("a", "inspect"))
+        self.assertNotIn(Items.repair_kit(), self.player.inventory)
+
+    def test_byte_budget(self):
+        self.manager.max_sessions = 100
+        self.manager.max_bytes = 1
+
+        self.manager.execute("a", "inspect")
+        self.manager.execute("b", "inspect")
+
+        self.assertEqual(1, len(self.manager))
+        self.assertEqual(1, self.manager.metrics.evictions)
+
+
+class ReloadTest(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.paths = [os.path.join(self.directory.name, f"v{i}.pack") for i in (1, 2)]
+        write_pack(self.paths[0], compile_content(SOURCE))
+        source = copy.deepcopy(SOURCE)
+        source["rooms"]["lab"]["description"] = "A clean lab."
+        source["rooms"]["lab"]["exits"].append("bay")
+        source["rooms"]["lab"]["items"] = []
+        source["rooms"]["bay"] = {"name": "bay", "exits": ["lab"]}
+        source["rooms"]["cabin"]["items"] = ["cable"]
+        source["items"]["cable"] = source["items"].pop("fuse")
+        source["items"]["cable"]["name"] = "cable"
+        write_pack(self.paths[1], compile_content(source))
+
+        self.manager = self._create_manager(self.paths[0])
+
+    def _create_manager(self, path: str) -> SessionManager:
+        world = open_world(path)
+        world_state = world.create_world_state()
+        return SessionManager(
+            engine=world.create_engine(),
+            world_state=world_state,
+            store=DiskSessionStore(os.path.join(self.directory.name, "sessions")),
+            initial_snapshot=world_state.capture(),
+            max_sessions=1,
+        )
+
+    def tearDown(self):
+        # The engine keeps its configuration on the class.
+        create_engine(Globals.player())
+        self.directory.cleanup()
+
+    def _reload(self, config: type[Config] = Config) -> int:
+        build = partial(open_world, self.paths[1], config)
+        return self.manager.reload(build).result(timeout=10)
+
+    def test_sessions_keep_their_progress(self):
+        for command in ["open crate", "pickup wrench", "enter lab door"]:
+            self.manager.execute("a", command)
+        self.manager.execute("b", "inspect")
+
+        self.assertEqual(1, self._reload())
+
+        output = self.manager.execute("a", "inspect")
+        self.assertIn("A clean lab.", output)
+        self.assertNotIn("fuse", output)
+        self.assertEqual(
+            ["wrench"], self.manager.world_state.capture()["player"]["inventory"]
+        )
+        self.assertIn("You enter the bay.", self.manager.execute("a", "enter bay door"))
+        self.assertIn("cable", self.manager.execute("b", "inspect"))
+        self.assertIn("cable", self.manager.execute("c", "inspect"))
+        self.assertEqual(1, self.manager.generation)
+
+    def test_detached_sessions_are_migrated(self):
+        self.manager.execute("a", "open crate")
+        self._reload()
+
+        data = self.manager.detach("a")
+
+        self.assertEqual(self.manager.content, data["content"])
+        self.assertIn("cable", data["snapshot"]["environments"]["cabin"]["items"])
+        self.assertEqual("OPEN", data["snapshot"]["objects"]["crate"]["state"])
+
+    def test_sessions_are_migrated_after_a_restart(self):
+        self.manager.execute("a", "open crate")
+        self.manager.execute("b", "open crate")
+        self._reload()
+        self.manager.execute("a", "enter lab door")
+        self.manager.execute("c", "inspect")
+
+        # Evicted on the second content and on the first one, by a process that
+        # started on the first one.
+        self.manager = self._create_manager(self.paths[1])
+
+        self.assertIn("A clean lab.", self.manager.execute("a", "inspect"))
+        self.assertIn("bay", self.manager.execute("a", "enter bay door"))
+        self.assertIn("cable", self.manager.execute("b", "inspect"))
+        self.assertEqual(
+            "OPEN", self.manager.world_state.capture()["objects"]["crate"]["state"]
+        )
+
+    def test_sessions_of_unknown_content_are_migrated_by_key(self):
+        self.manager.execute("a", "open crate")
+        self.manager.execute("b", "inspect")
+        store = self.manager.store
+        os.remove(store._content_path(self.manager.content))
+
+        self.manager = self._create_manager(self.paths[1])
+        self.manager.execute("a", "inspect")
+
+        snapshot = self.manager.world_state.capture()
+        self.assertEqual("OPEN", snapshot["objects"]["crate"]["state"])
+        self.assertIn("bay", snapshot["environments"])
+        self.assertEqual(self.manager.content, self.manager._sessions["a"].content)
+
+    def test_usages_are_reloaded(self):
+        usages = dict(Config.action_usage_mapping)
+        del usages[PlayerAction.PICKUP]
+
+        self._reload(Config.with_usages(usages))
+
+        self.assertEqual(
+            "Action not recognized: PICKUP", self.manager.execute("a", "pickup cable")
+        )
+        self.assertIn("crate", self.manager.execute("a", "inspect"))
+        self.assertIn(PlayerAction.PICKUP, Config.action_usage_mapping)
+
+
+class MigrateSnapshotTest(TestCase):
+    def setUp(self):
+        self.old = {
+            "player": {
+                "environment": "cabin",
+                "inventory": [],
+                "equipped": [],
+                "effects": [],
+            },
+            "objects": {"crate": {"state": "CLOSED", "items": ["wrench"]}},
+            "items": {"wrench": {"state": None}, "fuse": {"state": None}},
+            "environments": {
+                "cabin": {"state": None, "objects": ["crate"], "items": ["fuse"]}
+            },
+        }
+        self.new = copy.deepcopy(self.old)
+
+    def test_unchanged_values_take_the_new_content(self):
+        self.new["objects"]["crate"]["state"] = "OPEN"
+
+        migrated = migrate_snapshot(self.old, self.old, self.new)
+
+        self.assertEqual(self.new, migrated)
+        self.assertIsNot(self.new["objects"], migrated["objects"])
+
+    def test_changes_are_kept(self):
+        snapshot = copy.deepcopy(self.old)
+        snapshot["player"]["inventory"] = ["wrench"]
+        snapshot["objects"]["crate"] = {"state": "OPEN", "items": []}
+        self.new["objects"]["crate"]["state"] = "LOCKED"
+
+        migrated = migrate_snapshot(snapshot, self.old, self.new)
+
+        self.assertEqual(["wrench"], migrated["player"]["inventory"])
+        self.assertEqual({"state": "OPEN", "items": []}, migrated["objects"]["crate"])
+
+    def test_removed_content_is_dropped(self):
+        snapshot = copy.deepcopy(self.old)
+        snapshot["player"]["inventory"] = ["fuse"]
+        snapshot["environments"]["cabin"]["items"] = []
+        del self.new["items"]["fuse"]
+        self.new["environments"]["cabin"]["items"] = []
+
+        migrated = migrate_snapshot(snapshot, self.old, self.new)
+
+        self.assertEqual([], migrated["player"]["inventory"])
+        self.assertNotIn("fuse", migrated["items"])
+
+    def test_unknown_old_content(self):
+        snapshot = copy.deepcopy(self.old)
+        snapshot["objects"]["crate"]["state"] = "OPEN"
+        snapshot["player"]["environment"] = "cabin"
+        self.new["objects"]["crate"]["state"] = "LOCKED"
+        self.new["items"]["cable"] = {"state": None}
+        self.new["environments"]["cabin"]["items"] = ["fuse", "cable"]
+
+        migrated = migrate_snapshot(snapshot, None, self.new)
+
+        self.assertEqual("OPEN", migrated["objects"]["crate"]["state"])
+        self.assertEqual("cabin", migrated["player"]["environment"])
+        self.assertEqual(["fuse", "cable"], migrated["environments"]["cabin"]["items"])
+
+    def test_removed_effects_are_dropped(self):
+        self.old["effects"] = ["dizzy", "shielded"]
+        snapshot = copy.deepcopy(self.old)
+        snapshot["player"]["effects"] = ["dizzy", "shielded"]
+        snapshot["player"]["inventory"] = ["wrench", "fuse"]
+        snapshot["player"]["equipped"] = ["fuse"]
+        snapshot["objects"]["crate"]["items"] = []
+        snapshot["environments"]["cabin"]["items"] = []
+        self.new["effects"] = ["shielded"]
+        del self.new["items"]["fuse"]
+        self.new["environments"]["cabin"]["items"] = []
+
+        migrated = migrate_snapshot(snapshot, self.old, self.new)
+
+        self.assertEqual(["shielded"], migrated["player"]["effects"])
+        self.assertEqual(["wrench"], migrated["player"]["inventory"])
+        self.assertEqual([], migrated["player"]["equipped"])
+        self.assertEqual(["shielded"], migrated["effects"])
+
+    def test_new_content_is_added(self):
+        snapshot = copy.deepcopy(self.old)
+        snapshot["environments"]["cabin"]["items"] = []
+        snapshot["player"]["inventory"] = ["fuse"]
+        self.new["items"]["cable"] = {"state": None}
+        self.new["environments"]["cabin"]["items"] = ["fuse", "cable"]
+        self.new["environments"]["bay"] = {"state": None, "objects": [], "items": []}
+
+        migrated = migrate_snapshot(snapshot, self.old, self.new)
+
+        self.assertEqual(["cable"], migrated["environments"]["cabin"]["items"])
+        self.assertEqual(["fuse"], migrated["player"]["inventory"])
+        self.assertIn("bay", migrated["environments"])
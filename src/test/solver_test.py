@@ -0,0 +1,85 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.bench.playthroughs import WINNING_PLAYTHROUGH, new_game
+from src.containers import Globals, Items
+from src.core import Engine
+from src.solver import Solver, digest, encode
+from src.test.fixtures import create_engine, create_world_state
+
+
+class SolverTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.snapshot = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        new_game(self.player)
+        self.solver = Solver(self.engine, self.world_state)
+
+    def tearDown(self):
+        self.world_state.restore(self.snapshot)
+        self.engine.drain_output()
+
+    def _play(self, lines: list[str]) -> None:
+        for line in lines:
+            self.engine.execute(line)
+        self.engine.drain_output()
+
+    def test_finds_shortest_win(self):
+        self._play(WINNING_PLAYTHROUGH[:-4])
+        before = self.world_state.capture()
+
+        result = self.solver.solve()
+
+        self.assertTrue(result.winnable)
+        self.assertEqual(4, len(result.commands))
+        self.assertEqual("use control panel", result.commands[-1])
+        self.assertEqual(before, self.world_state.capture())
+
+        self._play(result.commands[:-1])
+        self.engine.execute(result.commands[-1])
+        self.assertIn("You are going home.", self.engine.drain_output())
+
+    def test_max_states(self):
+        result = Solver(self.engine, self.world_state, max_states=5).solve()
+
+        self.assertIsNone(result.winnable)
+        self.assertFalse(result.complete)
+        self.assertEqual(5, result.states)
+
+    def test_commands(self):
+        self._play(WINNING_PLAYTHROUGH[:12])
+
+        commands = list(self.solver.commands())
+
+        self.assertIn("inspect", commands)
+        self.assertIn("enter hallway door", commands)
+        self.assertIn("empty fuel can into hallway door", commands)
+        self.assertNotIn("quit", commands)
+        self.assertNotIn("pickup hallway door", commands)
+
+    def test_commands_are_parsed_once_per_scope(self):
+        serialized = encode(self.world_state.capture())
+        state_digest = digest(serialized)
+        first = list(self.solver.expand(serialized, state_digest))
+
+        with patch.object(Engine, "_parse", wraps=Engine._parse) as parse:
+            second = list(self.solver.expand(serialized, state_digest))
+
+        parse.assert_not_called()
+        self.assertEqual(
+            [command for command, _ in first], [command for command, _ in second]
+        )
+
+    def test_encoding_ignores_inventory_order(self):
+        self.player.inventory = [Items.fuel_can(), Items.repair_kit()]
+        first = encode(self.world_state.capture())
+        self.player.inventory = [Items.repair_kit(), Items.fuel_can()]
+        second = encode(self.world_state.capture())
+        self.player.inventory = [Items.repair_kit()]
+        third = encode(self.world_state.capture())
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+        self.assertEqual(16, len(digest(first)))
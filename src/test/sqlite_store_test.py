@@ -0,0 +1,121 @@
+import os
+import threading
+from contextlib import contextmanager
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.sqlite_store import SQLiteSessionStore
+
+
+class InterruptedCommit:
+    """A connection calling a function instead of committing."""
+
+    def __init__(self, connection, on_commit):
+        self.connection = connection
+        self.on_commit = on_commit
+
+    def execute(self, statement, *args):
+        if statement == "COMMIT":
+            self.on_commit()
+        return self.connection.execute(statement, *args)
+
+    def executemany(self, statement, rows):
+        return self.connection.executemany(statement, rows)
+
+
+class SQLiteSessionStoreTest(TestCase):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "sessions.db")
+        self.store = SQLiteSessionStore(self.path, pool_size=2, flush_interval=None)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_load_missing(self):
+        self.assertIsNone(self.store.load("a"))
+
+    def test_load_unflushed(self):
+        self.store.save("a", {"snapshot": {}, "turns": 1})
+        self.assertEqual({"snapshot": {}, "turns": 1}, self.store.load("a"))
+
+    def test_writes_are_coalesced(self):
+        for turns in range(10):
+            self.store.save("a", {"snapshot": {}, "turns": turns})
+        self.store.save_profile("a", {"name": "test"})
+
+        self.assertEqual(3, self.store.flush())
+        self.assertEqual({"snapshot": {}, "turns": 9}, self.store.load("a"))
+        self.assertEqual({"name": "test"}, self.store.load_profile("a"))
+        self.assertEqual(9, self.store.load_journal_offset("a"))
+
+    def test_delete(self):
+        self.store.save("a", {"snapshot": {}, "turns": 1})
+        self.store.flush()
+        self.store.delete("a")
+
+        self.assertIsNone(self.store.load("a"))
+        self.store.flush()
+        self.assertIsNone(self.store.load("a"))
+        self.assertIsNone(self.store.load_journal_offset("a"))
+
+    def test_persists_across_connections(self):
+        self.store.save("a", {"snapshot": {}, "turns": 1})
+        self.store.close()
+        self.store = SQLiteSessionStore(self.path, flush_interval=None)
+
+        self.assertEqual({"snapshot": {}, "turns": 1}, self.store.load("a"))
+
+    def test_content(self):
+        self.store.save_content("c1", {"objects": {}})
+        self.store.save_content("c1", {"objects": {"crate": {}}})
+
+        self.assertEqual({"objects": {}}, self.store.load_content("c1"))
+        self.assertIsNone(self.store.load_content("c2"))
+
+    def _interrupt_commits(self, on_commit):
+        connection = self.store.pool.connection
+
+        @contextmanager
+        def interrupted():
+            with connection() as original:
+                yield InterruptedCommit(original, on_commit)
+
+        self.store.pool.connection = interrupted
+        self.addCleanup(setattr, self.store.pool, "connection", connection)
+
+    def test_load_while_flushing(self):
+        self.store.save("a", {"snapshot": {}, "turns": 1})
+        committing, loaded = threading.Event(), threading.Event()
+
+        def wait_for_load():
+            committing.set()
+            loaded.wait(5)
+
+        self._interrupt_commits(wait_for_load)
+        flush = threading.Thread(target=self.store.flush)
+        flush.start()
+        committing.wait(5)
+        try:
+            self.assertEqual({"snapshot": {}, "turns": 1}, self.store.load("a"))
+        finally:
+            loaded.set()
+            flush.join()
+
+    def test_delete_during_a_failed_flush(self):
+        self.store.save("a", {"snapshot": {}, "turns": 1})
+        failures = [OSError("disk full")]
+
+        def delete_and_fail():
+            if failures:
+                self.store.delete("a")
+                raise failures.pop()
+
+        self._interrupt_commits(delete_and_fail)
+        with self.assertRaises(OSError):
+            self.store.flush()
+
+        self.assertIsNone(self.store.load("a"))
+        self.store.flush()
+        self.assertIsNone(self.store.load("a"))
@@ -0,0 +1,81 @@
+import copy
+from unittest import TestCase
+
+from src.containers import Effects, Globals, Objects, Services
+from src.enums import PlayerAction
+from src.status import ShipStatus, VisibleObjects
+from src.test.fixtures import create_environment, create_item, create_world_state
+
+
+class ShipStatusTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        for key, state in [
+            ("control_panel", "MAIN"),
+            ("heavy_door", "CLOSED"),
+            ("heavy_door_wheel", "CLOSED"),
+            ("engine", "WORKING"),
+            ("hull", "REPAIRED"),
+        ]:
+            object_ = getattr(Objects, key)()
+            object_.state = getattr(object_.States, state)
+        self.player.effects = []
+        service = Services.control_panel_service()
+        self.status = ShipStatus(service, service.rules[PlayerAction.INSPECT])
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+
+    def test_ready(self):
+        self.assertTrue(self.status.ready)
+        self.assertEqual("The control panel.", self.status.text)
+
+    def test_text_follows_changes(self):
+        hull = Objects.hull()
+
+        hull.state = hull.States.DAMAGED
+        self.player.effects.append(Effects.full_bladder())
+
+        self.assertFalse(self.status.ready)
+        self.assertEqual(
+            "The control panel. You feel like you are forgetting something."
+            " The hull light is flashing.",
+            self.status.text,
+        )
+
+        self.player.effects.remove(Effects.full_bladder())
+        hull.state = hull.States.REPAIRED
+        self.assertTrue(self.status.ready)
+
+    def test_prologue(self):
+        panel = Objects.control_panel()
+
+        panel.state = panel.States.PROLOGUE
+
+        self.assertFalse(self.status.ready)
+        self.assertTrue(self.status.text.startswith("A control panel with a lot"))
+
+    def test_restore(self):
+        snapshot = copy.deepcopy(self.original)
+        snapshot["objects"]["control_panel"]["state"] = "MAIN"
+
+        self.world_state.restore(snapshot)
+
+        self.assertFalse(self.status.ready)
+        self.assertIn(" The engine light is flashing.", self.status.text)
+
+
+class VisibleObjectsTest(TestCase):
+    def test_listing_follows_changes(self):
+        visible_objects = VisibleObjects()
+        environment = create_environment(items=[create_item(name="axe")])
+
+        self.assertEqual(
+            "You see these items: axe.", visible_objects.listing(environment)
+        )
+        environment.items.append(create_item(name="kit"))
+        self.assertEqual(
+            "You see these items: axe, kit.", visible_objects.listing(environment)
+        )
@@ -0,0 +1,93 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.containers import Globals, Environments, Items
+from src.core import Engine
+from src.tracing import RingBuffer, Tracer, tracer
+from src.test.fixtures import create_engine, create_world_state
+
+
+class RingBufferTest(TestCase):
+    def test_not_full(self):
+        buffer = RingBuffer(3)
+        buffer.append((1,))
+        buffer.append((2,))
+        self.assertEqual([(1,), (2,)], buffer.events())
+
+    def test_overwrites_oldest(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append((i,))
+        self.assertEqual([(2,), (3,), (4,)], buffer.events())
+        self.assertEqual(5, buffer.recorded)
+
+
+class TracerTest(TestCase):
+    def test_values_are_kept_unformatted(self):
+        tracer_ = Tracer()
+        item = Items.fuel_can()
+        tracer_.event("pickup", item, 1)
+
+        (_, stage, values), = tracer_.events()
+        self.assertEqual("pickup", stage)
+        self.assertIs(item, values[0])
+
+    def test_dump(self):
+        tracer_ = Tracer()
+        tracer_.event("validated action", "USE")
+        tracer_.event("validated object", None)
+
+        lines = tracer_.dump().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].endswith("ms validated action: USE"))
+        self.assertTrue(lines[1].endswith("ms validated object: None"))
+
+    def test_sessions(self):
+        tracer_ = Tracer()
+        tracer_.set_session("a")
+        tracer_.event("a")
+        tracer_.set_session("b")
+        tracer_.event("b")
+
+        self.assertEqual("a", tracer_.events("a")[0][1])
+        self.assertEqual("b", tracer_.events()[0][1])
+
+        tracer_.discard("b")
+        self.assertEqual(Tracer.default_session_id, tracer_.session_id)
+        self.assertEqual([], tracer_.events("b"))
+
+    def test_disabled(self):
+        tracer_ = Tracer()
+        tracer_.enabled = False
+        tracer_.event("ignored")
+        self.assertEqual("", tracer_.dump())
+
+
+class EngineTracingTest(TestCase):
+    def setUp(self):
+        self.player = Globals.player()
+        self.world_state = create_world_state(self.player)
+        self.original = self.world_state.capture()
+        self.engine = create_engine(self.player)
+        self.player.environment = Environments.workshop()
+        tracer.set_session("engine tracing test")
+
+    def tearDown(self):
+        self.world_state.restore(self.original)
+        self.engine.drain_output()
+        tracer.discard("engine tracing test")
+
+    def test_turn_is_traced(self):
+        self.engine.execute("pickup repair kit")
+
+        stages = [stage for _, stage, _ in tracer.events()]
+        self.assertEqual("validated action", stages[0])
+        self.assertIn("command", stages)
+        self.assertEqual("service", stages[-1])
+
+    def test_trace_logged_on_failure(self):
+        with patch.object(Engine, "_interact", side_effect=RuntimeError("boom")):
+            with self.assertLogs(level="ERROR") as logs:
+                with self.assertRaises(RuntimeError):
+                    self.engine.execute("pickup repair kit")
+        self.assertIn("service: RepairKitService", logs.output[0])
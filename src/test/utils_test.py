@@ -1,7 +1,8 @@
 from unittest import TestCase
 
-from src.enums import PlayerAction
+from src.enums import PlayerAction, GameOutcome
 from src.utils import (
+    die_in_void,
     overlap,
     casefold_index,
     casefold_equals,
@@ -156,3 +157,10 @@ class SubclassInListTest(TestCase):
         ls = [float, str]
         result = subclass_in_list(list, ls)
         self.assertFalse(result)
+
+
+class DieInVoidTest(TestCase):
+    def test_die_in_void(self):
+        result = die_in_void(opening_door=True)
+        self.assertIs(GameOutcome.DEATH, result.outcome)
+        self.assertTrue(result.text.startswith("You open the door and it flies open."))
@@ -0,0 +1,71 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.command import Command, CommandValidator
+from src.config import Config
+from src.containers import Items, Objects, Resolvers
+from src.enums import CommandError
+from src.environment import Environment
+from src.player import Player
+from src.vocabulary import Vocabulary
+
+
+class VocabularyTest(TestCase):
+    vocabulary = Vocabulary(containers=[Items, Objects], config=Config)
+
+    def test_unknown_action(self):
+        result = self.vocabulary.reject("dance with urinal")
+
+        self.assertIs(CommandError.ACTION_NOT_RECOGNIZED, result.error)
+        self.assertEqual("Action not recognized: DANCE", result.message)
+
+    def test_unknown_object(self):
+        result = self.vocabulary.reject("use  unicorn horn on urinal")
+
+        self.assertIs(CommandError.OBJECT_NOT_FOUND, result.error)
+        self.assertEqual("Object not found: UNICORN HORN", result.message)
+
+    def test_only_stop_words(self):
+        result = self.vocabulary.reject("a the")
+
+        self.assertIs(CommandError.ACTION_NOT_RECOGNIZED, result.error)
+        self.assertEqual("Action not recognized: A", result.message)
+
+    def test_known_reference(self):
+        self.assertIsNone(self.vocabulary.reject("fill ENGINE with fuel"))
+
+    def test_synonyms_and_stop_words(self):
+        self.assertIsNone(self.vocabulary.reject("look at the control panel"))
+        self.assertIsNone(self.vocabulary.reject("grab the fuel can"))
+
+    def test_known_key(self):
+        self.assertIsNone(self.vocabulary.reject("inspect control_panel"))
+
+    def test_player(self):
+        self.assertIsNone(self.vocabulary.reject("inspect self"))
+
+    def test_unknown_preposition_object_is_left_to_validator(self):
+        self.assertIsNone(self.vocabulary.reject("repair hull with spoon"))
+
+    def test_empty(self):
+        self.assertIsNone(self.vocabulary.reject("   "))
+
+    def test_same_message_as_validator(self):
+        validator = CommandValidator(
+            player=Player(environment=Environment([])),
+            command_object_r=Resolvers.command_object(),
+            config=Config,
+        )
+        inputs = ["xyzzy", "quit now", "inspect unicorn", "open the door", "the"]
+        for user_input in inputs:
+            expected = validator.check(Command(user_input, Config.lexicon))
+            result = self.vocabulary.reject(user_input)
+            self.assertEqual(expected.error, result.error)
+            self.assertEqual(expected.message, result.message)
+
+    def test_rebuild(self):
+        vocabulary = Vocabulary(containers=[Items, Objects], config=Config)
+        with patch.object(Objects.urinal(), "_references", ["urinal", "toilet"]):
+            self.assertIsNotNone(vocabulary.reject("use toilet"))
+            vocabulary.rebuild()
+            self.assertIsNone(vocabulary.reject("use toilet"))
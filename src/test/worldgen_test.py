@@ -0,0 +1,108 @@
+from unittest import TestCase
+
+from src.containers import Globals
+from src.object.objects import Door, Locker
+from src.test.fixtures import create_engine
+from src.worldgen import generate_world
+
+
+class GenerateWorldTest(TestCase):
+    def setUp(self):
+        self.world = generate_world(rooms=200, seed=1)
+        self.engine = self.world.create_engine()
+
+    def tearDown(self):
+        # The engine keeps its configuration on the class.
+        create_engine(Globals.player())
+
+    def _names(self, container) -> list[str]:
+        return [provider().name for provider in container.members().values()]
+
+    def test_same_seed_same_world(self):
+        other = generate_world(rooms=200, seed=1)
+        different = generate_world(rooms=200, seed=2)
+
+        self.assertEqual(self._names(self.world.items_c), self._names(other.items_c))
+        self.assertNotEqual(
+            self._names(self.world.items_c), self._names(different.items_c)
+        )
+
+    def test_size(self):
+        self.assertEqual(200, len(self.world.environments_c.members()))
+        self.assertEqual(400, len(self.world.items_c.members()))
+        self.assertEqual(300, len(self.world.objects_c.members()))
+
+    def test_names_are_unique(self):
+        for container in [self.world.items_c, self.world.objects_c]:
+            names = self._names(container)
+            self.assertEqual(len(names), len(set(names)))
+
+    def test_all_rooms_are_reachable(self):
+        start = self.world.player.environment
+        reached = {id(start)}
+        queue = [start]
+        while queue:
+            room = queue.pop()
+            for door in room.objects:
+                if not isinstance(door, Door):
+                    continue
+                destination = getattr(self.world.environments_c, door.destination)()
+                if id(destination) not in reached:
+                    reached.add(id(destination))
+                    queue.append(destination)
+
+        self.assertEqual(200, len(reached))
+
+    def test_enter_door(self):
+        objects = self.world.player.environment.objects
+        door = next(object_ for object_ in objects if isinstance(object_, Door))
+
+        self.engine.execute(f"enter {door.references[0]}")
+
+        self.assertEqual(
+            f"You enter the {door.references[0]}.", self.engine.drain_output()
+        )
+        self.assertEqual(door.references[0], self.world.player.environment.name)
+
+    def test_open_locker_and_pickup(self):
+        room = next(
+            provider()
+            for provider in self.world.environments_c.members().values()
+            if any(isinstance(o, Locker) and o.items for o in provider().objects)
+        )
+        locker = next(o for o in room.objects if isinstance(o, Locker) and o.items)
+        item = locker.items[0]
+        self.world.player.environment = room
+
+        self.engine.execute(f"open {locker.name}")
+        self.engine.execute(f"pickup {item.name}")
+
+        self.assertIn(
+            f"Inside you find: {item.name.upper()}", self.engine.drain_output()
+        )
+        self.assertIs(Locker.States.OPEN, locker.state)
+        self.assertEqual([item], self.world.player.inventory)
+
+    def test_world_state_round_trip(self):
+        world_state = self.world.create_world_state()
+        snapshot = world_state.capture()
+        locker = next(
+            provider()
+            for provider in self.world.objects_c.members().values()
+            if isinstance(provider(), Locker)
+        )
+        self.world.player.environment = next(
+            provider()
+            for provider in self.world.environments_c.members().values()
+            if locker in provider().objects
+        )
+
+        self.engine.execute(f"open {locker.name}")
+        world_state.restore(snapshot)
+
+        self.assertEqual(snapshot, world_state.capture())
+        self.assertIs(Locker.States.CLOSED, locker.state)
+
+    def test_needs_a_room(self):
+        with self.assertRaises(ValueError):
+            generate_world(rooms=0)
@@ -0,0 +1,108 @@
+import logging
+import time
+from typing import Any, Optional
+
+
+class RingBuffer:
+    """
+    The most recent events, in a list of fixed size that is overwritten in a
+    circle.
+
+    Attributes:
+    -----------
+    capacity : int
+        The amount of events kept.
+    recorded : int
+        The amount of events recorded in total.
+    """
+
+    __slots__ = ("capacity", "recorded", "_events")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.recorded = 0
+        self._events: list[Optional[tuple]] = [None] * capacity
+
+    def append(self, event: tuple) -> None:
+        self._events[self.recorded % self.capacity] = event
+        self.recorded += 1
+
+    def events(self) -> list[tuple]:
+        """Returns the kept events, oldest first."""
+        if self.recorded <= self.capacity:
+            return self._events[: self.recorded]
+        start = self.recorded % self.capacity
+        return self._events[start:] + self._events[:start]
+
+
+class Tracer:
+    """
+    Records what happens during turns as (timestamp, stage, values) tuples in a
+    ring buffer per session. Nothing is formatted until the trace is dumped, so
+    recording costs a tuple and a list assignment.
+
+    Attributes:
+    -----------
+    capacity : int
+        The amount of events kept per session.
+    session_id : str
+        The session events are currently recorded for.
+    enabled : bool
+        Whether events are recorded.
+    echo : bool
+        Whether events are also logged at DEBUG level as they are recorded.
+    """
+
+    default_session_id = "local"
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.enabled = True
+        self.echo = False
+        self._buffers: dict[str, RingBuffer] = {}
+        self.set_session(self.default_session_id)
+
+    def set_session(self, session_id: str) -> None:
+        """Records the following events for the given session."""
+        self.session_id = session_id
+        self._buffer = self._buffers.get(session_id)
+        if self._buffer is None:
+            self._buffer = self._buffers[session_id] = RingBuffer(self.capacity)
+
+    def discard(self, session_id: str) -> None:
+        """Forgets the events of a session."""
+        self._buffers.pop(session_id, None)
+        if session_id == self.session_id:
+            self.set_session(self.default_session_id)
+
+    def event(self, stage: str, *values: Any) -> None:
+        if not self.enabled:
+            return
+        event = (time.perf_counter_ns(), stage, values)
+        self._buffer.append(event)
+        if self.echo:
+            logging.debug(self._format(event))
+
+    def events(self, session_id: Optional[str] = None) -> list[tuple]:
+        buffer = self._buffers.get(session_id or self.session_id)
+        return buffer.events() if buffer else []
+
+    def dump(self, session_id: Optional[str] = None) -> str:
+        """Returns the recorded events of a session, one per line, with their
+        milliseconds since the oldest one."""
+        events = self.events(session_id)
+        if not events:
+            return ""
+        start = events[0][0]
+        return "\n".join(self._format(event, start) for event in events)
+
+    @staticmethod
+    def _format(event: tuple, start: Optional[int] = None) -> str:
+        timestamp, stage, values = event
+        line = f"{stage}: {' '.join(str(value) for value in values)}".rstrip()
+        if start is None:
+            return line
+        return f"{(timestamp - start) / 1e6:10.3f}ms {line}"
+
+
+tracer = Tracer()
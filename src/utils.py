@@ -1,6 +1,9 @@
 import enum
 from typing import Iterable, Optional, Union
 
+from src.enums import GameOutcome
+from src.outcome import GameOver
+
 
 def overlap(a: Iterable, b: Iterable) -> list:
     """Returns a list of elements that are in both iterables."""
@@ -46,7 +49,7 @@ def subclass_in_list(a: Union[object, type], b: list):
     return any(a is x or issubclass(a, x) for x in b)
 
 
-def die_in_void(opening_door=False, inside=False):
+def die_in_void(opening_door=False, inside=False) -> GameOver:
     str_ = ""
     if opening_door:
         str_ += "You open the door and it flies open. "
@@ -72,5 +75,4 @@ def die_in_void(opening_door=False, inside=False):
         '"Where is your God now?" the void whispers as you transcend. '
         "Turns out your only true God was the Flying Spaghetti Monster."
     )
-    print(str_)
-    exit(0)
+    return GameOver(GameOutcome.DEATH, str_)
@@ -0,0 +1,108 @@
+from typing import TYPE_CHECKING, Collection, Mapping, Optional
+
+from src.command import ValidationResult
+from src.content_pack import NOUNS
+from src.enums import PlayerActionPreposition, CommandError
+
+if TYPE_CHECKING:
+    from src.config import Config
+    from src.containers import CustomContainer
+    from src.content_pack import ContentPack
+    from src.fuzzy import FuzzyIndex
+
+
+class Vocabulary:
+    """
+    Every word and noun phrase the parser could possibly accept. Lines that can't
+    match are rejected from a set lookup per token, with the same messages as
+    the validator, before a command is built or any resolver is consulted.
+    Unknown noun phrases that are close to a known one are let through when a
+    fuzzy index is given. Synonyms and stop words are normalized by the
+    configured lexicon first, the same way commands are.
+
+    Attributes:
+    -----------
+    actions : set[str]
+        The casefolded actions that have a usage.
+    prepositions : set[str]
+        The casefolded prepositions.
+    nouns : Collection[str]
+        The casefolded keys, names and references of all items and objects.
+    pack : Optional[ContentPack]
+        When given, the nouns are read from the pack instead of collected.
+    """
+
+    actions: set[str]
+    prepositions: set[str]
+    nouns: Collection[str]
+
+    def __init__(
+        self,
+        containers: list[type["CustomContainer"]],
+        config: type["Config"],
+        fuzzy_index: Optional["FuzzyIndex"] = None,
+        pack: Optional["ContentPack"] = None,
+    ):
+        self._containers = containers
+        self._config = config
+        self._fuzzy_index = fuzzy_index
+        self.pack = pack
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompiles the vocabulary. Call after the content has been reloaded."""
+        self.actions = {
+            str(action).casefold()
+            for action, usages in self._config.action_usage_mapping.items()
+            if usages
+        }
+        self.prepositions = {
+            str(preposition).casefold() for preposition in PlayerActionPreposition
+        }
+        if self.pack:
+            self.nouns = self.pack.table(NOUNS)
+            return
+        nouns = {"self", "player"}
+        for container in self._containers:
+            for key, provider in container.members().items():
+                nouns.add(key.casefold())
+                nouns.update(
+                    reference.casefold() for reference in provider().references
+                )
+        self.nouns = nouns
+
+    def export(self) -> dict[str, Mapping]:
+        """Returns the nouns as a table for a content pack."""
+        return {NOUNS: {noun: [] for noun in self.nouns}}
+
+    def reject(self, user_input: str) -> Optional[ValidationResult]:
+        """Returns an invalid result if the input can't possibly be a valid
+        command."""
+        words = user_input.upper().split()
+        if not words:
+            return None
+        words = [word.casefold() for word in self._config.lexicon.normalize(words)]
+
+        action = words[0]
+        if action not in self.actions:
+            return ValidationResult(
+                None,
+                CommandError.ACTION_NOT_RECOGNIZED,
+                f"Action not recognized: {action.upper()}",
+            )
+
+        end = next(
+            (i for i, word in enumerate(words) if word in self.prepositions),
+            len(words),
+        )
+        object_str = " ".join(words[1:end])
+        if object_str and object_str not in self.nouns and not self._is_typo(object_str):
+            return ValidationResult(
+                None,
+                CommandError.OBJECT_NOT_FOUND,
+                f"Object not found: {object_str.upper()}",
+            )
+        return None
+
+    def _is_typo(self, object_str: str) -> bool:
+        return bool(self._fuzzy_index) and self._fuzzy_index.has_candidates(object_str)
@@ -0,0 +1,334 @@
+import random
+from typing import TYPE_CHECKING, Optional
+
+from dependency_injector.providers import Singleton
+
+from src.autocomplete import Autocomplete
+from src.command import CommandValidator
+from src.config import Config
+from src.containers import CustomContainer, Effects
+from src.content_pack import ContentPack, share_content
+from src.core import Engine
+from src.environment import Room
+from src.fuzzy import FuzzyIndex
+from src.object.items import Supply
+from src.object.objects import Door, Locker
+from src.player import Player
+from src.resolvers import (
+    CommandObjectResolver,
+    ItemResolver,
+    ObjectResolver,
+    ServiceResolver,
+)
+from src.service import ItemService, Service
+from src.state import WorldState
+from src.vocabulary import Vocabulary
+
+if TYPE_CHECKING:
+    from src.command import Command
+
+ROOM_KINDS = ["cabin", "corridor", "storage bay", "lab", "mess hall", "airlock"]
+LOCKER_KINDS = ["locker", "crate", "cabinet"]
+SUPPLY_KINDS = ["wrench", "ration", "flashlight", "cable", "fuse", "battery"]
+
+
+class DoorService(Service[Door]):
+    object_type = Door
+
+    def _enter(self, cmd: "Command"):
+        room = getattr(self._environments_c, cmd.object.destination)()
+        self._player.environment = room
+        return f"You enter the {room.name}."
+
+
+class LockerService(Service[Locker]):
+    object_type = Locker
+
+    def _inspect(self, cmd: "Command"):
+        locker = cmd.object
+        if locker.state is locker.States.CLOSED:
+            return f"{locker.description} It's closed."
+        return f"{locker.description} It's open."
+
+    def _open(self, cmd: "Command"):
+        locker = cmd.object
+        if locker.state is locker.States.OPEN:
+            return "It's already open."
+        locker.state = locker.States.OPEN
+        if not locker.items:
+            return f"You open the {locker.name}. It's empty."
+        names = ", ".join(item.name.upper() for item in locker.items)
+        self._player.environment.items += locker.items
+        locker.items = []
+        return f"You open the {locker.name}. Inside you find: {names}"
+
+    def _close(self, cmd: "Command"):
+        locker = cmd.object
+        if locker.state is locker.States.CLOSED:
+            return "It's already closed."
+        locker.state = locker.States.CLOSED
+        return f"You close the {locker.name}."
+
+
+class GeneratedWorld:
+    """
+    A ship generated by `generate_world` or loaded from a content pack, with
+    containers shaped like the shipped ones, so the engine, resolvers and world
+    state run on it unchanged.
+
+    Attributes:
+    -----------
+    player : Player
+        The player of the generated world. It starts in the first room.
+    items_c : type[CustomContainer]
+        The supplies, in lockers and lying around.
+    objects_c : type[CustomContainer]
+        The doors and lockers.
+    environments_c : type[CustomContainer]
+        The rooms.
+    services_c : type[CustomContainer]
+        The generic services and the door and locker services.
+    resolvers_c : type[CustomContainer]
+        The resolvers, vocabulary and autocomplete of the generated content.
+    pack : Optional[ContentPack]
+        The content pack the descriptions and lookup tables are read from.
+    config : type[Config]
+        The configuration of the parser and the resolvers.
+    """
+
+    def __init__(
+        self,
+        player: Player,
+        items_c: type[CustomContainer],
+        objects_c: type[CustomContainer],
+        environments_c: type[CustomContainer],
+        pack: Optional[ContentPack] = None,
+        config: type[Config] = Config,
+    ):
+        self.player = player
+        self.items_c = items_c
+        self.objects_c = objects_c
+        self.environments_c = environments_c
+        self.pack = pack
+        self.config = config
+        self.services_c = _services(player, items_c, objects_c, environments_c)
+        self.resolvers_c = _resolvers(
+            player, items_c, objects_c, self.services_c, pack, config
+        )
+        if pack is not None:
+            share_content(pack, self.containers)
+
+    @property
+    def containers(self) -> dict[str, type[CustomContainer]]:
+        """The containers of the content, by their name in a content pack."""
+        return {
+            "items": self.items_c,
+            "objects": self.objects_c,
+            "environments": self.environments_c,
+        }
+
+    def create_engine(self) -> Engine:
+        """Returns the engine running the generated world. The engine keeps its
+        configuration on the class, so this replaces the running world."""
+        return Engine(
+            player=self.player,
+            items_c=self.items_c,
+            objects_c=self.objects_c,
+            services_c=self.services_c,
+            resolvers_c=self.resolvers_c,
+            command_validator=CommandValidator(
+                player=self.player,
+                command_object_r=self.resolvers_c.command_object(),
+                config=self.config,
+            ),
+            config=self.config,
+        )
+
+    def warm_up(self) -> None:
+        """Builds the resolvers, the vocabulary and the autocomplete index, which
+        the first command would build otherwise."""
+        for provider in self.resolvers_c.members().values():
+            provider()
+
+    def create_world_state(self) -> WorldState:
+        return WorldState(
+            self.player, Effects, self.items_c, self.objects_c, self.environments_c
+        )
+
+
+def generate_world(
+    rooms: int = 1000,
+    seed: int = 0,
+    loops: float = 0.1,
+    lockers: float = 0.5,
+    supplies: float = 2.0,
+    player: Optional[Player] = None,
+    pack: Optional[ContentPack] = None,
+) -> GeneratedWorld:
+    """
+    Generates a ship of connected rooms. The rooms form a random tree with some
+    extra doors making loops. Every room has one door, found in the rooms next to
+    it, like the hallway door of the shipped ship.
+
+    Parameters:
+    -----------
+    rooms : int
+        The amount of rooms.
+    seed : int
+        The same seed generates the same world.
+    loops : float
+        Extra connections per room, on top of the tree.
+    lockers : float
+        Lockers per room.
+    supplies : float
+        Items per room, split between lockers and the floor.
+    player : Optional[Player]
+        The player, a new one by default.
+    pack : Optional[ContentPack]
+        A content pack exported from the same world, shared with other processes.
+    """
+    if rooms < 1:
+        raise ValueError("A world needs at least one room")
+    rng = random.Random(seed)
+    names = _Names()
+
+    room_names = [names.next(rng.choice(ROOM_KINDS)) for _ in range(rooms)]
+    neighbours: list[set[int]] = [set() for _ in range(rooms)]
+    for room in range(1, rooms):
+        _connect(neighbours, room, rng.randrange(room))
+    for _ in range(int(rooms * loops) if rooms > 1 else 0):
+        first, second = rng.sample(range(rooms), 2)
+        _connect(neighbours, first, second)
+
+    items = {}
+    floor_items: list[list[str]] = [[] for _ in range(rooms)]
+    locker_items: dict[str, list[str]] = {}
+    room_lockers: list[list[str]] = [[] for _ in range(rooms)]
+    for _ in range(int(rooms * lockers)):
+        key = f"locker_{len(locker_items)}"
+        locker_items[key] = []
+        room_lockers[rng.randrange(rooms)].append(key)
+    for index in range(int(rooms * supplies)):
+        key = f"supply_{index}"
+        items[key] = Singleton(Supply, name=names.next(rng.choice(SUPPLY_KINDS)))
+        if locker_items and rng.random() < 0.5:
+            locker_items[rng.choice(list(locker_items))].append(key)
+        else:
+            floor_items[rng.randrange(rooms)].append(key)
+    items_c = _container("GeneratedItems", items)
+
+    objects = {
+        f"door_{room}": Singleton(Door, room_name=name, destination=f"room_{room}")
+        for room, name in enumerate(room_names)
+    }
+    for key, keys in locker_items.items():
+        objects[key] = Singleton(
+            Locker,
+            name=names.next(rng.choice(LOCKER_KINDS)),
+            items=[getattr(items_c, item)() for item in keys],
+        )
+    objects_c = _container("GeneratedObjects", objects)
+
+    environments_c = _container(
+        "GeneratedEnvironments",
+        {
+            f"room_{room}": Singleton(
+                Room,
+                name=name,
+                objects=[
+                    getattr(objects_c, key)()
+                    for key in [f"door_{n}" for n in sorted(neighbours[room])]
+                    + room_lockers[room]
+                ],
+                items=[getattr(items_c, key)() for key in floor_items[room]],
+            )
+            for room, name in enumerate(room_names)
+        },
+    )
+
+    player = player or Player()
+    player.environment = environments_c.room_0()
+    return GeneratedWorld(player, items_c, objects_c, environments_c, pack)
+
+
+class _Names:
+    """Numbers the names of each kind, so all names are unique."""
+
+    def __init__(self):
+        self._counts: dict[str, int] = {}
+
+    def next(self, kind: str) -> str:
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        return f"{kind} {self._counts[kind]}"
+
+
+def _connect(neighbours: list[set[int]], first: int, second: int) -> None:
+    neighbours[first].add(second)
+    neighbours[second].add(first)
+
+
+def _container(name: str, providers: dict[str, Singleton]) -> type[CustomContainer]:
+    return type(CustomContainer)(name, (CustomContainer,), providers)
+
+
+def _services(
+    player: Player,
+    items_c: type[CustomContainer],
+    objects_c: type[CustomContainer],
+    environments_c: type[CustomContainer],
+) -> type[CustomContainer]:
+    dependencies = dict(
+        player=player,
+        effects_c=Effects,
+        items_c=items_c,
+        objects_c=objects_c,
+        environments_c=environments_c,
+    )
+    return _container(
+        "GeneratedServices",
+        {
+            "generic_service": Singleton(Service, **dependencies),
+            "item_service": Singleton(ItemService, **dependencies),
+            "door_service": Singleton(DoorService, **dependencies),
+            "locker_service": Singleton(LockerService, **dependencies),
+        },
+    )
+
+
+def _resolvers(
+    player: Player,
+    items_c: type[CustomContainer],
+    objects_c: type[CustomContainer],
+    services_c: type[CustomContainer],
+    pack: Optional[ContentPack],
+    config: type[Config],
+) -> type[CustomContainer]:
+    items = Singleton(ItemResolver, container=items_c, pack=pack)
+    objects = Singleton(ObjectResolver, container=objects_c, pack=pack)
+    fuzzy_index = Singleton(FuzzyIndex, containers=[items_c, objects_c], pack=pack)
+    return _container(
+        "GeneratedResolvers",
+        {
+            "items": items,
+            "objects": objects,
+            "services": Singleton(
+                ServiceResolver, container=services_c, objects_r=objects, pack=pack
+            ),
+            "fuzzy_index": fuzzy_index,
+            "command_object": Singleton(
+                CommandObjectResolver,
+                player=player,
+                items_r=items,
+                objects_r=objects,
+                fuzzy_index=fuzzy_index,
+            ),
+            "autocomplete": Singleton(Autocomplete, player=player, config=config),
+            "vocabulary": Singleton(
+                Vocabulary,
+                containers=[items_c, objects_c],
+                config=config,
+                fuzzy_index=fuzzy_index,
+                pack=pack,
+            ),
+        },
+    )